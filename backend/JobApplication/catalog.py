@@ -0,0 +1,44 @@
+"""
+Global version of the job catalog.
+
+Every write to JobApplication (save/delete signals, bulk ingest, index
+rebuilds) bumps one row inside the writing transaction. Readers use the
+version to validate anything derived from the catalog without looking at the
+jobs themselves: the API's ETags are built from it, and cached search results
+are stored under it, so entries from before a write are simply never looked
+up again.
+
+A bump writes a fresh random value rather than incrementing: a counter would
+hand out the same number again after a flush, a restored backup or a rolled
+back transaction, and a cache entry stored under that number would then be
+served for different data.
+"""
+import secrets
+
+from .models import CatalogVersion
+
+CATALOG_ID = 1
+
+
+def current_version():
+    """The current catalog version (0 before the first write)."""
+    version = (
+        CatalogVersion.objects.filter(pk=CATALOG_ID)
+        .values_list("version", flat=True)
+        .first()
+    )
+    return version or 0
+
+
+def bump():
+    """Mark the catalog as changed; call from inside the writing transaction."""
+    version = secrets.randbits(63)
+    updated = CatalogVersion.objects.filter(pk=CATALOG_ID).update(version=version)
+    if not updated:
+        # Row missing (e.g. the table was flushed)
+        CatalogVersion.objects.update_or_create(pk=CATALOG_ID, defaults={"version": version})
+
+
+def jobs_etag(version, *parts):
+    """Strong ETag for a catalog-derived representation, e.g. jobs_etag(version, "job", 42)."""
+    return '"{}"'.format("-".join(str(part) for part in (*parts, version)))
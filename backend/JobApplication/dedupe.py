@@ -0,0 +1,105 @@
+"""
+Merging of duplicate postings into a single canonical JobApplication.
+
+Rows are walked in id order and fingerprinted; a row whose fingerprint is
+already held by another job is merged with it after one unique-index probe,
+so the whole pass is linear instead of comparing every pair of postings.
+The oldest (lowest id) copy is always the one kept. Used by
+`manage.py dedupe_jobs`.
+"""
+from django.db import transaction
+
+from applications.models import Application
+from resumes.models import Resume, ResumeBuildTask
+from .models import JobApplication
+
+
+def merge_job(duplicate_id, canonical_id):
+    """
+    Repoint everything that references `duplicate_id` at `canonical_id`.
+
+    Applications and resume build tasks are moved over as-is. A job holds at
+    most one Resume, so when both jobs have one the most recently edited
+    resume is kept.
+    """
+    Application.objects.filter(job_id=duplicate_id).update(job_id=canonical_id)
+    # Deleting the duplicate would cascade to its queued and running builds
+    ResumeBuildTask.objects.filter(job_application_id=duplicate_id).update(job_application_id=canonical_id)
+
+    resumes = {
+        resume.job_application_id: resume
+        for resume in Resume.objects.filter(job_application_id__in=[duplicate_id, canonical_id])
+    }
+    duplicate_resume = resumes.get(duplicate_id)
+    canonical_resume = resumes.get(canonical_id)
+    if duplicate_resume is None:
+        return
+    if canonical_resume is not None:
+        if canonical_resume.updated_at >= duplicate_resume.updated_at:
+            return  # the duplicate's resume is dropped along with the duplicate
+        canonical_resume.delete()
+    # queryset update so the resume's updated_at is left alone
+    Resume.objects.filter(pk=duplicate_resume.pk).update(job_application_id=canonical_id)
+
+
+def dedupe(batch_size=1000, recompute_all=False):
+    """
+    Fingerprint unfingerprinted jobs (or every job with `recompute_all`) and
+    merge the duplicates found. Returns (fingerprinted, merged) counts.
+    """
+    fingerprinted = merged = 0
+    jobs = JobApplication.objects.order_by("id")
+    if not recompute_all:
+        jobs = jobs.filter(fingerprint__isnull=True)
+
+    last_id = 0
+    while True:
+        # Keyset chunks rather than iterator(): rows are deleted as we go
+        chunk = list(
+            jobs.filter(id__gt=last_id)
+            .only("id", "company", "title", "location", "description", "fingerprint")[:batch_size]
+        )
+        if not chunk:
+            break
+        last_id = chunk[-1].id
+
+        stale = {}
+        for job in chunk:
+            fingerprint = job.compute_fingerprint()
+            if fingerprint != job.fingerprint:
+                stale[job] = fingerprint
+
+        owners = dict(
+            JobApplication.objects
+            .filter(fingerprint__in=set(stale.values()))
+            .values_list("fingerprint", "id")
+        )
+        duplicates, to_update = [], []
+        merged_away = set()
+        for job, fingerprint in stale.items():
+            if job.id in merged_away:
+                continue
+            canonical_id = owners.get(fingerprint)
+            if canonical_id is not None and canonical_id < job.id:
+                duplicates.append((job.id, canonical_id))
+            else:
+                if canonical_id is not None and canonical_id != job.id:
+                    # A newer job holds the fingerprint (possible with
+                    # recompute_all): merge it into this older one instead
+                    duplicates.append((canonical_id, job.id))
+                    merged_away.add(canonical_id)
+                owners[fingerprint] = job.id
+                job.fingerprint = fingerprint
+                to_update.append(job)
+
+        with transaction.atomic():
+            for duplicate_id, canonical_id in duplicates:
+                merge_job(duplicate_id, canonical_id)
+            # Deleted first: a kept job may take over a duplicate's fingerprint
+            JobApplication.objects.filter(pk__in=[dup for dup, _ in duplicates]).delete()
+            JobApplication.objects.bulk_update(to_update, ["fingerprint"])
+
+        fingerprinted += len(to_update)
+        merged += len(duplicates)
+
+    return fingerprinted, merged
@@ -0,0 +1,133 @@
+"""
+Facet counts for the job search page.
+
+All facets are GROUP BY / conditional COUNT aggregates over the already
+filtered queryset, so they run in the database and never materialize job
+rows. Results are cached per normalized query because the same searches are
+repeated constantly; the catalog version in the cache key keeps them fresh
+and the short timeout rolls the "posted in the last N days" windows over.
+"""
+import datetime
+import hashlib
+
+from django.core.cache import cache
+from django.db.models import Count, ExpressionWrapper, IntegerField, Q, Value
+
+from .models import SALARY_FLOOR, JobTag
+
+# Number of values returned for the location / company / tag facets
+TOP_N = 10
+CACHE_TIMEOUT = 60  # seconds
+
+DEFAULT_HISTOGRAM_BUCKET = 10_000
+MIN_HISTOGRAM_BUCKET = 1_000
+
+# (key, lower bound inclusive, upper bound exclusive) on the posted salary
+SALARY_BUCKETS = [
+    ("<50k", None, 50_000),
+    ("50k-75k", 50_000, 75_000),
+    ("75k-100k", 75_000, 100_000),
+    ("100k-150k", 100_000, 150_000),
+    ("150k+", 150_000, None),
+]
+
+# (key, max age in days) - cumulative windows, like most job boards
+POSTED_WINDOWS = [
+    ("24h", 1),
+    ("7d", 7),
+    ("30d", 30),
+    ("90d", 90),
+]
+
+
+def _top_values(queryset, field):
+    rows = (
+        queryset.exclude(**{field: ""})
+        .values(field)
+        .annotate(count=Count("id"))
+        .order_by("-count", field)[:TOP_N]
+    )
+    return [{"value": row[field], "count": row["count"]} for row in rows]
+
+
+def _top_tags(queryset):
+    rows = (
+        JobTag.objects.filter(job_id__in=queryset.values("id"))
+        .values("tag__name")
+        .annotate(count=Count("id"))
+        .order_by("-count", "tag__name")[:TOP_N]
+    )
+    return [{"value": row["tag__name"], "count": row["count"]} for row in rows]
+
+
+def _bucket_counts(queryset, today):
+    """Salary and posted-date buckets in one conditional aggregate query."""
+    aggregates = {}
+    for key, low, high in SALARY_BUCKETS:
+        condition = Q(salary__isnull=False)
+        if low is not None:
+            condition &= Q(salary__gte=low)
+        if high is not None:
+            condition &= Q(salary__lt=high)
+        aggregates[f"salary:{key}"] = Count("id", filter=condition)
+    for key, days in POSTED_WINDOWS:
+        since = today - datetime.timedelta(days=days)
+        aggregates[f"posted:{key}"] = Count("id", filter=Q(date__gte=since))
+
+    # Bucket on the advertised minimum, falling back to the maximum
+    counts = queryset.annotate(salary=SALARY_FLOOR).aggregate(**aggregates)
+    return (
+        [{"value": key, "count": counts[f"salary:{key}"]} for key, _, _ in SALARY_BUCKETS],
+        [{"value": key, "count": counts[f"posted:{key}"]} for key, _ in POSTED_WINDOWS],
+    )
+
+
+def salary_histogram(queryset, bucket_size=DEFAULT_HISTOGRAM_BUCKET):
+    """
+    Counts of jobs per `bucket_size`-wide salary band, from one GROUP BY over
+    the indexed salary floor. Empty bands are omitted.
+    """
+    bucket = ExpressionWrapper(SALARY_FLOOR / Value(bucket_size), output_field=IntegerField())
+    rows = (
+        queryset.order_by()
+        .alias(salary_floor=SALARY_FLOOR)
+        .filter(salary_floor__isnull=False)
+        .annotate(bucket=bucket)
+        .values("bucket")
+        .annotate(count=Count("id"))
+        .order_by("bucket")
+    )
+    return [
+        {
+            "min": row["bucket"] * bucket_size,
+            "max": (row["bucket"] + 1) * bucket_size,
+            "count": row["count"],
+        }
+        for row in rows
+    ]
+
+
+def compute_facets(queryset, today=None):
+    queryset = queryset.order_by()
+    salary, posted = _bucket_counts(queryset, today or datetime.date.today())
+    return {
+        "location": _top_values(queryset, "location"),
+        "company": _top_values(queryset, "company"),
+        "tags": _top_tags(queryset),
+        "salary": salary,
+        "posted": posted,
+    }
+
+
+def get_facets(queryset, cache_key, version=None):
+    """
+    Facets for `queryset`, cached under `cache_key` (a normalized
+    description of the query that produced the queryset) and the catalog
+    `version`, so a write to the catalog is visible immediately.
+    """
+    key = "job-facets:" + hashlib.sha256(cache_key.encode()).hexdigest()
+    facets = cache.get(key, version=version)
+    if facets is None:
+        facets = compute_facets(queryset)
+        cache.set(key, facets, CACHE_TIMEOUT, version=version)
+    return facets
@@ -0,0 +1,13 @@
+"""Test data shared by the test modules of several apps."""
+from .models import JobApplication
+
+
+def make_job(**fields):
+    defaults = {
+        "company": "Acme",
+        "title": "Software Engineer",
+        "description": "",
+        "location": "Edmonton, AB",
+    }
+    defaults.update(fields)
+    return JobApplication.objects.create(**defaults)
@@ -0,0 +1,86 @@
+"""
+Query-string filters shared by the job list, export and facet code paths.
+"""
+import json
+
+from . import search, tags
+from .models import SALARY_CEILING, SALARY_FLOOR
+
+
+class InvalidFilter(ValueError):
+    pass
+
+
+def split_list(raw):
+    """'django, postgres,' -> ['django', 'postgres']"""
+    return [item.strip() for item in (raw or "").split(",") if item.strip()]
+
+
+def parse_flag(params, name):
+    """?name=1 / true / yes"""
+    return params.get(name, "").lower() in ("1", "true", "yes")
+
+
+def parse_int(params, name):
+    raw = params.get(name)
+    if raw in (None, ""):
+        return None
+    try:
+        value = int(raw)
+    except (TypeError, ValueError):
+        raise InvalidFilter(f"{name} must be an integer")
+    if value < 0:
+        raise InvalidFilter(f"{name} must not be negative")
+    return value
+
+
+def filter_by_salary(queryset, salary_min=None, salary_max=None):
+    """
+    Keep jobs whose advertised pay range overlaps [salary_min, salary_max].
+    Jobs without any salary are dropped once either bound is given.
+    """
+    if salary_min is not None:
+        queryset = queryset.alias(salary_ceiling=SALARY_CEILING).filter(salary_ceiling__gte=salary_min)
+    if salary_max is not None:
+        queryset = queryset.alias(salary_floor=SALARY_FLOOR).filter(salary_floor__lte=salary_max)
+    return queryset
+
+
+def filter_jobs(queryset, params):
+    """
+    Apply the structured filters from `params` (request.GET) to `queryset`.
+
+    Supported:
+      ?tags=django,postgres   jobs tagged with these tech_stack entries
+      ?tags_match=all|any     AND (default) or OR semantics for ?tags=
+      ?salary_min=&salary_max=  jobs whose pay range overlaps this range
+    """
+    salary_min = parse_int(params, "salary_min")
+    salary_max = parse_int(params, "salary_max")
+    if salary_min is not None and salary_max is not None and salary_min > salary_max:
+        raise InvalidFilter("salary_min must not be greater than salary_max")
+    queryset = filter_by_salary(queryset, salary_min, salary_max)
+
+    tag_names = split_list(params.get("tags"))
+    if tag_names:
+        match = params.get("tags_match", tags.MATCH_ALL)
+        if match not in (tags.MATCH_ALL, tags.MATCH_ANY):
+            raise InvalidFilter("tags_match must be 'all' or 'any'")
+        queryset = tags.filter_by_tags(queryset, tag_names, match)
+    return queryset
+
+
+def normalized_key(params):
+    """
+    Stable description of the search and filters in `params`, ignoring word
+    order, case and pagination, for use in cache keys.
+    """
+    tag_names = tags.normalize_tags(split_list(params.get("tags")))
+    return json.dumps({
+        "q": sorted(set(search.tokenize(params.get("q", "")))),
+        "fuzzy": parse_flag(params, "fuzzy"),
+        "tags": sorted(tag_names),
+        "tags_match": params.get("tags_match", tags.MATCH_ALL) if tag_names else None,
+        "salary_min": params.get("salary_min") or None,
+        "salary_max": params.get("salary_max") or None,
+    }, sort_keys=True)
@@ -0,0 +1,32 @@
+"""
+Content fingerprints for spotting the same posting arriving from several feeds.
+
+Two postings are considered the same when company, title and location match
+after case/whitespace/punctuation normalization and their descriptions are
+identical modulo whitespace. The fingerprint is stored in a unique indexed
+column, so "have we seen this posting?" is a single index probe.
+"""
+import hashlib
+import re
+
+_PUNCTUATION_RE = re.compile(r"[^\w\s]", re.UNICODE)
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_text(value):
+    """Lowercase, drop punctuation and collapse whitespace: 'Shopify, Inc.' -> 'shopify inc'."""
+    value = _PUNCTUATION_RE.sub(" ", (value or "").lower())
+    return _WHITESPACE_RE.sub(" ", value).strip()
+
+
+def compute_fingerprint(company, title, location, description):
+    """Return the 64-char hex fingerprint of a posting's identifying content."""
+    description = _WHITESPACE_RE.sub(" ", (description or "").lower()).strip()
+    description_hash = hashlib.sha256(description.encode()).hexdigest()
+    key = "\x1f".join((
+        normalize_text(company),
+        normalize_text(title),
+        normalize_text(location),
+        description_hash,
+    ))
+    return hashlib.sha256(key.encode()).hexdigest()
@@ -0,0 +1,160 @@
+"""
+Typo-tolerant job search (?q=...&fuzzy=1).
+
+The terms of the title, company and tags columns of the full-text index are
+read from its fts5vocab table and kept in memory as a character-trigram
+inverted index (trigram -> terms). Each query word is resolved to the
+vocabulary terms sharing enough trigrams with it ("kubernets" ->
+"kubernetes"). Only terms that share at least one trigram are ever compared,
+so there is no edit-distance scan over the vocabulary.
+
+The search itself still runs in FTS5: every word must match one of its
+variants in title, company or tags. A job scores the sum, over the query
+words, of the best similarity among the variants it contains. The score is
+computed in SQL, so results paginate like any other search.
+
+The vocabulary is reloaded when the catalog version has moved, at most every
+REFRESH_INTERVAL seconds, so words from brand-new postings may take that long
+to become fuzzy-searchable (exact search sees them immediately).
+"""
+import threading
+import time
+from collections import Counter
+
+from django.db import connection
+from django.db.models import Case, F, FloatField, Value, When
+from django.db.models.functions import Greatest
+
+from . import catalog, search
+from .models import JobSearchDocument
+
+VOCAB_TABLE = f"{search.FTS_TABLE}_vocab"
+FUZZY_COLUMNS = ("title", "company", "tags")
+
+SIMILARITY_THRESHOLD = 0.3  # same default as PostgreSQL's pg_trgm
+MAX_VARIANTS = 5  # vocabulary terms tried per query word
+REFRESH_INTERVAL = 60  # seconds
+
+
+def trigrams(word):
+    """pg_trgm-style trigrams: 'cat' -> {'  c', ' ca', 'cat', 'at '}"""
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Forget the vocabulary; the next lookup reloads it."""
+        self._terms = []  # term id -> (term, number of trigrams, document count)
+        self._postings = {}  # trigram -> [term id]
+        self.version = None
+        self.checked_at = 0.0
+
+    def _load(self):
+        terms, postings = [], {}
+        columns = ", ".join(f"'{column}'" for column in FUZZY_COLUMNS)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'SELECT term, SUM(doc) FROM "{VOCAB_TABLE}" '
+                f"WHERE col IN ({columns}) GROUP BY term"
+            )
+            for term, documents in cursor.fetchall():
+                grams = trigrams(term)
+                term_id = len(terms)
+                terms.append((term, len(grams), documents))
+                for gram in grams:
+                    postings.setdefault(gram, []).append(term_id)
+        self._terms, self._postings = terms, postings
+
+    def refresh(self, force=False):
+        now = time.monotonic()
+        if not force and now - self.checked_at < REFRESH_INTERVAL:
+            return
+        with self._lock:
+            if not force and now - self.checked_at < REFRESH_INTERVAL:
+                return
+            self.checked_at = now
+            version = catalog.current_version()
+            if force or version != self.version:
+                self._load()
+                self.version = version
+
+    def variants(self, word, limit=MAX_VARIANTS):
+        """
+        Up to `limit` (term, similarity) pairs for `word`, most similar first,
+        ties broken by how many jobs use the term. Similarity is the share of
+        trigrams the two words have in common (Jaccard), from 0.0 to 1.0.
+        """
+        self.refresh()
+        grams = trigrams(word)
+        terms, postings = self._terms, self._postings
+
+        shared = Counter()
+        for gram in grams:
+            shared.update(postings.get(gram, ()))
+
+        scored = []
+        for term_id, common in shared.items():
+            term, size, documents = terms[term_id]
+            score = common / (len(grams) + size - common)
+            if score >= SIMILARITY_THRESHOLD:
+                scored.append((score, documents, term))
+        scored.sort(key=lambda item: (-item[0], -item[1], item[2]))
+        return [(term, round(score, 4)) for score, _, term in scored[:limit]]
+
+
+# One index per process
+index = TrigramIndex()
+
+
+def _column_match(terms):
+    """FTS5 expression matching any of `terms` in the fuzzy columns."""
+    quoted = " OR ".join(f'"{term}"' for term in terms)
+    return f"{{{' '.join(FUZZY_COLUMNS)}}} : ({quoted})"
+
+
+def fuzzy_search(queryset, query):
+    """
+    Restrict `queryset` to jobs matching every word of `query` up to typos,
+    annotated with `fuzzy_score` (higher is better) and the BM25 `search_rank`.
+    """
+    if not search.is_enabled():
+        # No vocabulary without FTS5: plain search, every hit scores the same
+        return search.search(queryset, query).annotate(fuzzy_score=Value(1.0, output_field=FloatField()))
+
+    words = sorted(set(search.tokenize(query)))
+    resolved = [index.variants(word) for word in words]
+    if not words or not all(resolved):
+        return queryset.none().annotate(
+            fuzzy_score=Value(0.0, output_field=FloatField()),
+            search_rank=Value(0.0, output_field=FloatField()),
+        )
+
+    match = " AND ".join(_column_match([term for term, _ in variants]) for variants in resolved)
+
+    # Per word: the similarity of the best variant this job contains
+    word_scores = []
+    for variants in resolved:
+        cases = [_contains(term, score) for term, score in variants]
+        word_scores.append(cases[0] if len(cases) == 1 else Greatest(*cases))
+
+    fuzzy_score = word_scores[0]
+    for word_score in word_scores[1:]:
+        fuzzy_score = fuzzy_score + word_score
+
+    return queryset.filter(
+        search_document__document__match=match,
+    ).annotate(
+        search_rank=F("search_document__rank"),
+        fuzzy_score=fuzzy_score,
+    )
+
+
+def _contains(term, score):
+    """`score` for jobs whose title, company or tags contain `term`, else 0"""
+    jobs = JobSearchDocument.objects.filter(document__match=_column_match([term])).values("job_id")
+    return Case(When(id__in=jobs, then=Value(score)), default=Value(0.0), output_field=FloatField())
@@ -0,0 +1,303 @@
+"""
+Bulk loading of job postings from CSV / JSON Lines feeds.
+
+Rows are streamed from disk, normalized into JobApplication field values and
+written with one bulk_create per batch inside its own transaction, so memory
+stays bounded by the batch size and a bad row never rolls back earlier work.
+Writes are upserts on the content fingerprint: a posting we already have is
+refreshed in place instead of inserted again. Used by `manage.py ingest_jobs`.
+"""
+import csv
+import datetime
+import json
+import re
+import time
+from pathlib import Path
+
+from django.db import transaction
+from django.db.models import Max
+
+from . import catalog, recommend, search, similar, tags
+from .models import JobApplication
+
+DEFAULT_BATCH_SIZE = 1000
+# Only the first few bad rows are kept so a broken feed can't exhaust memory
+MAX_KEPT_ERRORS = 100
+
+# Feed column -> model field, for the frontend-style names some feeds use
+FIELD_ALIASES = {
+    "tags": "tech_stack",
+    "postedDate": "date",
+    "posted_date": "date",
+}
+
+# Fields refreshed when a feed re-delivers a posting we already have
+UPSERT_FIELDS = ["date", "tech_stack", "salary_min", "salary_max"]
+
+_MAX_LENGTHS = {
+    field: JobApplication._meta.get_field(field).max_length
+    for field in ("company", "title", "location")
+}
+_SALARY_JUNK_RE = re.compile(r"[\s$,_]")
+_TAG_SPLIT_RE = re.compile(r"[,;|]")
+
+
+class InvalidRow(ValueError):
+    pass
+
+
+def read_rows(path, file_format=None):
+    """
+    Yield (line_number, row_dict) from a .csv or .jsonl/.ndjson file.
+
+    The file is read lazily so arbitrarily large feeds use constant memory.
+    """
+    path = Path(path)
+    file_format = file_format or path.suffix.lstrip(".").lower()
+
+    if file_format == "csv":
+        with path.open(newline="", encoding="utf-8-sig") as f:
+            reader = csv.DictReader(f)
+            for row in reader:
+                yield reader.line_num, row
+    elif file_format in ("jsonl", "ndjson"):
+        with path.open(encoding="utf-8") as f:
+            for line_number, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError as e:
+                    yield line_number, InvalidRow(f"invalid JSON: {e}")
+                    continue
+                yield line_number, row
+    else:
+        raise ValueError(f"Unsupported feed format: {file_format or path.name}")
+
+
+def _clean_text(row, field, required=False):
+    value = row.get(field)
+    value = "" if value is None else str(value).strip()
+    if required and not value:
+        raise InvalidRow(f"missing {field}")
+    max_length = _MAX_LENGTHS.get(field)
+    if max_length and len(value) > max_length:
+        raise InvalidRow(f"{field} longer than {max_length} characters")
+    return value
+
+
+def _parse_salary(value, field):
+    if value is None or value == "":
+        return None
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        amount = value
+    else:
+        cleaned = _SALARY_JUNK_RE.sub("", str(value))
+        if not cleaned:
+            return None
+        # "85k" style shorthand
+        multiplier = 1000 if cleaned[-1] in "kK" else 1
+        cleaned = cleaned.rstrip("kK")
+        try:
+            amount = float(cleaned) * multiplier
+        except ValueError:
+            raise InvalidRow(f"{field} is not a number: {value!r}")
+    if amount < 0:
+        raise InvalidRow(f"{field} is negative")
+    return int(round(amount))
+
+
+def _parse_date(value):
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime.date):
+        return value
+    text = str(value).strip()
+    try:
+        return datetime.date.fromisoformat(text)
+    except ValueError:
+        pass
+    try:
+        return datetime.datetime.fromisoformat(text).date()
+    except ValueError:
+        raise InvalidRow(f"date is not ISO-8601: {value!r}")
+
+
+def _parse_tech_stack(value):
+    if value is None or value == "":
+        return []
+    if isinstance(value, str):
+        text = value.strip()
+        if text.startswith("["):
+            try:
+                value = json.loads(text)
+            except json.JSONDecodeError:
+                raise InvalidRow("tech_stack is not a valid JSON list")
+        else:
+            value = _TAG_SPLIT_RE.split(text)
+    if not isinstance(value, list):
+        raise InvalidRow("tech_stack must be a list")
+
+    tags = []
+    for tag in value:
+        tag = str(tag).strip()
+        if tag and tag not in tags:
+            tags.append(tag)
+    return tags
+
+
+def normalize_row(row):
+    """
+    Validate one raw feed row and return JobApplication field values.
+
+    Raises InvalidRow describing the first problem found.
+    """
+    if not isinstance(row, dict):
+        raise InvalidRow("row is not an object")
+    row = {FIELD_ALIASES.get(key, key): value for key, value in row.items()}
+
+    salary_min = _parse_salary(row.get("salary_min"), "salary_min")
+    salary_max = _parse_salary(row.get("salary_max"), "salary_max")
+    if salary_min is not None and salary_max is not None and salary_min > salary_max:
+        raise InvalidRow("salary_min is greater than salary_max")
+
+    return {
+        "company": _clean_text(row, "company", required=True),
+        "title": _clean_text(row, "title", required=True),
+        "description": _clean_text(row, "description"),
+        "location": _clean_text(row, "location"),
+        "date": _parse_date(row.get("date")),
+        "tech_stack": _parse_tech_stack(row.get("tech_stack")),
+        "salary_min": salary_min,
+        "salary_max": salary_max,
+    }
+
+
+class IngestResult:
+    def __init__(self):
+        self.created = 0
+        self.updated = 0  # rows that matched an existing posting's fingerprint
+        self.skipped = 0
+        self.errors = []  # (line_number, message)
+        self.recommendations_updated = 0  # profiles whose stored recommendations changed
+        self.started = time.perf_counter()
+        self.elapsed = 0.0
+
+    @property
+    def processed(self):
+        return self.created + self.updated + self.skipped
+
+    @property
+    def rows_per_second(self):
+        elapsed = self.elapsed or (time.perf_counter() - self.started)
+        return self.processed / elapsed if elapsed else 0.0
+
+
+def _dedupe_batch(batch):
+    """Fingerprint the batch and keep the last copy of each posting."""
+    unique = {}
+    for job in batch:
+        job.fingerprint = job.compute_fingerprint()
+        unique[job.fingerprint] = job
+    return unique
+
+
+def _existing_fingerprints(fingerprints):
+    return set(
+        JobApplication.objects
+        .filter(fingerprint__in=list(fingerprints))
+        .values_list("fingerprint", flat=True)
+    )
+
+
+def _write_batch(batch, dry_run=False, seen=None):
+    """
+    Upsert a batch on fingerprint; returns the number of new postings and the
+    ids of existing postings whose tech stack changed.
+
+    A dry run writes nothing, so postings from earlier batches are not in the
+    table yet: `seen` collects the fingerprints of the whole run instead.
+    """
+    unique = _dedupe_batch(batch)
+    if dry_run:
+        new = unique.keys() - _existing_fingerprints(unique) - seen
+        seen.update(unique)
+        return len(new), []
+
+    with transaction.atomic():
+        existing = dict(
+            JobApplication.objects
+            .filter(fingerprint__in=list(unique))
+            .values_list("fingerprint", "tech_stack")
+        )
+        JobApplication.objects.bulk_create(
+            list(unique.values()),
+            update_conflicts=True,
+            unique_fields=["fingerprint"],
+            update_fields=UPSERT_FIELDS,
+        )
+        # Re-read the rows: a re-delivered posting keeps its stored company,
+        # title and description, which may differ from the feed's spelling
+        saved = list(JobApplication.objects.filter(fingerprint__in=list(unique)))
+        # bulk_create skips post_save, so index the rows explicitly
+        search.index_jobs(saved)
+        tags.sync_job_tags(saved)
+        similar.index_jobs(saved)
+        catalog.bump()
+    retagged = [
+        job.id for job in saved
+        if job.fingerprint in existing and existing[job.fingerprint] != job.tech_stack
+    ]
+    return len(unique) - len(existing), retagged
+
+
+def ingest(rows, batch_size=DEFAULT_BATCH_SIZE, dry_run=False, on_batch=None):
+    """
+    Normalize and insert (line_number, row) pairs as produced by read_rows().
+
+    `on_batch(result)` is called after every written batch for progress
+    reporting. With `dry_run` rows are validated but nothing is written.
+    """
+    result = IngestResult()
+    batch = []
+    seen = set()  # fingerprints validated so far, for dry runs
+    retagged = []  # existing postings whose tech stack the feed changed
+    # New rows get ids above this; upserted postings keep theirs
+    last_id = JobApplication.objects.aggregate(last_id=Max("id"))["last_id"] or 0
+
+    def flush():
+        created, changed = _write_batch(batch, dry_run, seen)
+        retagged.extend(changed)
+        result.created += created
+        result.updated += len(batch) - created
+        batch.clear()
+        if on_batch:
+            on_batch(result)
+
+    for line_number, row in rows:
+        try:
+            if isinstance(row, InvalidRow):
+                raise row
+            batch.append(JobApplication(**normalize_row(row)))
+        except InvalidRow as e:
+            result.skipped += 1
+            if len(result.errors) < MAX_KEPT_ERRORS:
+                result.errors.append((line_number, str(e)))
+            continue
+        if len(batch) >= batch_size:
+            flush()
+
+    if batch:
+        flush()
+
+    if retagged:
+        # Before add_jobs: rescoring rebuilds the matrix the new postings are scored with
+        result.recommendations_updated += recommend.rescore_jobs(retagged)
+    if result.created and not dry_run:
+        # Score only the new postings against the stored recommendations
+        new_ids = JobApplication.objects.filter(id__gt=last_id).values_list("id", flat=True)
+        result.recommendations_updated += recommend.add_jobs(new_ids)
+
+    result.elapsed = time.perf_counter() - result.started
+    return result
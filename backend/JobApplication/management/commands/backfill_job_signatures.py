@@ -0,0 +1,23 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from JobApplication import similar
+
+
+class Command(BaseCommand):
+    help = "Rebuild the MinHash signatures and LSH buckets of every job description (similar jobs)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=2000,
+            help="Jobs processed per batch (default: 2000)",
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        total = similar.rebuild_signatures(batch_size=options["batch_size"])
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f"Indexed {total} job descriptions in {elapsed:.2f}s"))
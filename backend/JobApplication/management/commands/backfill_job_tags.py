@@ -0,0 +1,23 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from JobApplication import tags
+
+
+class Command(BaseCommand):
+    help = "Rebuild the normalized tag index (Tag / JobTag) from every job's tech_stack"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=2000,
+            help="Jobs processed per batch (default: 2000)",
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        total = tags.rebuild_tags(batch_size=options["batch_size"])
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f"Tagged {total} jobs in {elapsed:.2f}s"))
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from JobApplication import dedupe
+
+
+class Command(BaseCommand):
+    help = (
+        "Merge duplicate job postings (same fingerprint) into the oldest copy, "
+        "moving their applications, resumes and resume builds over"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Re-fingerprint every job, not only the ones without a fingerprint",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=1000,
+            help="Jobs processed per transaction (default: 1000)",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report what would be merged and roll everything back",
+        )
+
+    def handle(self, *args, **options):
+        run = lambda: dedupe.dedupe(batch_size=options["batch_size"], recompute_all=options["all"])
+        if options["dry_run"]:
+            with transaction.atomic():
+                fingerprinted, merged = run()
+                transaction.set_rollback(True)
+        else:
+            fingerprinted, merged = run()
+
+        prefix = "[dry run] " if options["dry_run"] else ""
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix}Fingerprinted {fingerprinted} jobs, merged {merged} duplicates"
+        ))
@@ -0,0 +1,64 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from JobApplication import ingest
+
+
+class Command(BaseCommand):
+    help = "Bulk load job postings from CSV or JSON Lines files"
+
+    def add_arguments(self, parser):
+        parser.add_argument("paths", nargs="+", help="Feed files (.csv, .jsonl or .ndjson)")
+        parser.add_argument(
+            "--format",
+            choices=["csv", "jsonl"],
+            help="Feed format; inferred from the file extension by default",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=ingest.DEFAULT_BATCH_SIZE,
+            help=f"Rows per bulk insert / transaction (default: {ingest.DEFAULT_BATCH_SIZE})",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Validate the feed without writing anything",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive")
+        self.verbosity = options["verbosity"]
+
+        for path in options["paths"]:
+            self.stdout.write(f"Ingesting {path}...")
+            try:
+                rows = ingest.read_rows(path, options["format"])
+                result = ingest.ingest(
+                    rows,
+                    batch_size=options["batch_size"],
+                    dry_run=options["dry_run"],
+                    on_batch=self.report_progress,
+                )
+            except (OSError, ValueError) as e:
+                raise CommandError(f"{path}: {e}")
+
+            for line_number, message in result.errors[:10]:
+                self.stderr.write(f"  line {line_number}: {message}")
+            if result.skipped > 10:
+                self.stderr.write(f"  ... and {result.skipped - 10} more invalid rows")
+
+            verb = "Validated" if options["dry_run"] else "Ingested"
+            self.stdout.write(self.style.SUCCESS(
+                f"{verb} {result.created} new jobs, refreshed {result.updated} duplicates, "
+                f"skipped {result.skipped} invalid rows "
+                f"in {result.elapsed:.2f}s ({result.rows_per_second:,.0f} rows/s)"
+            ))
+            if result.recommendations_updated:
+                self.stdout.write(f"Updated stored recommendations of {result.recommendations_updated} profiles")
+
+    def report_progress(self, result):
+        if self.verbosity >= 2:
+            self.stdout.write(
+                f"  {result.processed:,} rows ({result.rows_per_second:,.0f} rows/s)"
+            )
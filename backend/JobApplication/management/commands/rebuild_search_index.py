@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from JobApplication import search
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search index used by /api/jobs/?q="
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=2000,
+            help="Number of jobs read and indexed per batch (default: 2000)",
+        )
+
+    def handle(self, *args, **options):
+        if not search.is_enabled():
+            self.stdout.write(self.style.WARNING(
+                "Full-text search needs SQLite FTS5; this database uses the icontains fallback."
+            ))
+            return
+
+        started = time.perf_counter()
+        total = search.rebuild_index(batch_size=options["batch_size"])
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f"Indexed {total} jobs in {elapsed:.2f}s"))
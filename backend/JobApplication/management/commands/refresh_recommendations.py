@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from JobApplication import recommend
+from profiles.models import Profile
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the stored For You recommendations of every profile "
+        "(picks up edited postings and current IDF weights)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--profile",
+            type=int,
+            action="append",
+            help="Only refresh this profile id (repeatable)",
+        )
+
+    def handle(self, *args, **options):
+        profiles = Profile.objects.order_by("id")
+        if options["profile"]:
+            profiles = profiles.filter(id__in=options["profile"])
+
+        started = time.perf_counter()
+        recommend.matrix.refresh(force=True)
+        total = stored = 0
+        for profile in profiles.iterator(chunk_size=500):
+            stored += recommend.refresh_profile(profile)
+            total += 1
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Stored {stored} recommendations for {total} profiles in {elapsed:.2f}s"
+        ))
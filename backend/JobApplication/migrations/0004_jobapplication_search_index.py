@@ -0,0 +1,40 @@
+from django.db import migrations
+
+FTS_TABLE = "JobApplication_jobapplication_fts"
+JOB_TABLE = "JobApplication_jobapplication"
+
+
+def create_search_index(apps, schema_editor):
+    # FTS5 is SQLite-only; other backends use the icontains fallback in search.py
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute(
+        f'CREATE VIRTUAL TABLE IF NOT EXISTS "{FTS_TABLE}" USING fts5('
+        "title, company, description, location, "
+        "tokenize = 'unicode61 remove_diacritics 2')"
+    )
+    # Persist the column weights used by ORDER BY rank: title > company > location > description
+    schema_editor.execute(
+        f'INSERT INTO "{FTS_TABLE}" ("{FTS_TABLE}", rank) '
+        "VALUES ('rank', 'bm25(10.0, 5.0, 1.0, 2.0)')"
+    )
+    schema_editor.execute(
+        f'INSERT INTO "{FTS_TABLE}" (rowid, title, company, description, location) '
+        f'SELECT id, title, company, description, location FROM "{JOB_TABLE}"'
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute(f'DROP TABLE IF EXISTS "{FTS_TABLE}"')
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("JobApplication", "0003_remove_jobapplication_status"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
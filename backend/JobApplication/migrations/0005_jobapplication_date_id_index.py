@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-17 10:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('JobApplication', '0004_jobapplication_search_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['-date', '-id'], name='job_date_id_idx'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-17 10:07
+
+from django.db import migrations, models
+
+from JobApplication.fingerprints import compute_fingerprint
+
+
+def backfill_fingerprints(apps, schema_editor):
+    # The first copy of each posting gets the fingerprint; later duplicates stay
+    # NULL so the unique index holds until `manage.py dedupe_jobs` merges them.
+    JobApplication = apps.get_model("JobApplication", "JobApplication")
+    seen = set()
+    batch = []
+    for job in JobApplication.objects.order_by("id").iterator(chunk_size=2000):
+        fingerprint = compute_fingerprint(job.company, job.title, job.location, job.description)
+        if fingerprint in seen:
+            continue
+        seen.add(fingerprint)
+        job.fingerprint = fingerprint
+        batch.append(job)
+        if len(batch) >= 2000:
+            JobApplication.objects.bulk_update(batch, ["fingerprint"])
+            batch = []
+    if batch:
+        JobApplication.objects.bulk_update(batch, ["fingerprint"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('JobApplication', '0005_jobapplication_date_id_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobapplication',
+            name='fingerprint',
+            field=models.CharField(blank=True, editable=False, max_length=64, null=True, unique=True),
+        ),
+        migrations.RunPython(backfill_fingerprints, migrations.RunPython.noop),
+    ]
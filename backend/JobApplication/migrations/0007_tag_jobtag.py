@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-17 10:08
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('JobApplication', '0006_jobapplication_fingerprint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='JobTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='job_tags', to='JobApplication.jobapplication')),
+                ('tag', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='job_tags', to='JobApplication.tag')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='jobapplication',
+            name='tags',
+            field=models.ManyToManyField(blank=True, related_name='jobs', through='JobApplication.JobTag', to='JobApplication.tag'),
+        ),
+        migrations.AddConstraint(
+            model_name='jobtag',
+            constraint=models.UniqueConstraint(fields=('tag', 'job'), name='jobtag_tag_job_uniq'),
+        ),
+    ]
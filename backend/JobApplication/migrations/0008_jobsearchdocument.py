@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-17 10:10
+
+import JobApplication.models
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('JobApplication', '0007_tag_jobtag'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobSearchDocument',
+            fields=[
+                ('job', models.OneToOneField(db_column='rowid', db_constraint=False, on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_document', serialize=False, to='JobApplication.jobapplication')),
+                ('title', models.TextField()),
+                ('company', models.TextField()),
+                ('description', models.TextField()),
+                ('location', models.TextField()),
+                ('document', JobApplication.models.FullTextMatchField(db_column='JobApplication_jobapplication_fts')),
+                ('rank', models.FloatField()),
+            ],
+            options={
+                'db_table': 'JobApplication_jobapplication_fts',
+                'managed': False,
+            },
+        ),
+    ]
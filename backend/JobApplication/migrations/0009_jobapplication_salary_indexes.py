@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-17 10:11
+
+import django.db.models.functions.comparison
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('JobApplication', '0008_jobsearchdocument'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(django.db.models.functions.comparison.Coalesce('salary_min', 'salary_max'), name='job_salary_floor_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(django.db.models.functions.comparison.Coalesce('salary_max', 'salary_min'), name='job_salary_ceiling_idx'),
+        ),
+    ]
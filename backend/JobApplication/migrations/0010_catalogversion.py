@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-17 10:14
+
+from django.db import migrations, models
+
+
+def create_catalog_row(apps, schema_editor):
+    CatalogVersion = apps.get_model("JobApplication", "CatalogVersion")
+    CatalogVersion.objects.get_or_create(pk=1, defaults={"version": 0})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('JobApplication', '0009_jobapplication_salary_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(create_catalog_row, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,63 @@
+from django.db import migrations
+
+FTS_TABLE = "JobApplication_jobapplication_fts"
+VOCAB_TABLE = "JobApplication_jobapplication_fts_vocab"
+JOB_TABLE = "JobApplication_jobapplication"
+
+
+def _create_index(schema_editor, columns, weights, select):
+    schema_editor.execute(f'DROP TABLE IF EXISTS "{FTS_TABLE}"')
+    schema_editor.execute(
+        f'CREATE VIRTUAL TABLE "{FTS_TABLE}" USING fts5('
+        f"{', '.join(columns)}, "
+        "tokenize = 'unicode61 remove_diacritics 2')"
+    )
+    schema_editor.execute(
+        f'INSERT INTO "{FTS_TABLE}" ("{FTS_TABLE}", rank) '
+        f"VALUES ('rank', 'bm25({weights})')"
+    )
+    schema_editor.execute(
+        f'INSERT INTO "{FTS_TABLE}" (rowid, {", ".join(columns)}) {select}'
+    )
+
+
+def add_tags_column(apps, schema_editor):
+    # FTS5 tables cannot be altered, so the index is recreated with a tags
+    # column (weighted like company) and refilled from the jobs table
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    _create_index(
+        schema_editor,
+        ["title", "company", "description", "location", "tags"],
+        "10.0, 5.0, 1.0, 2.0, 5.0",
+        "SELECT id, title, company, description, location, "
+        "(SELECT group_concat(value, ' ') FROM json_each(tech_stack)) "
+        f'FROM "{JOB_TABLE}"',
+    )
+    # Term -> document counts per column, read by fuzzy.py
+    schema_editor.execute(
+        f'CREATE VIRTUAL TABLE IF NOT EXISTS "{VOCAB_TABLE}" '
+        f"USING fts5vocab('{FTS_TABLE}', 'col')"
+    )
+
+
+def remove_tags_column(apps, schema_editor):
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    schema_editor.execute(f'DROP TABLE IF EXISTS "{VOCAB_TABLE}"')
+    _create_index(
+        schema_editor,
+        ["title", "company", "description", "location"],
+        "10.0, 5.0, 1.0, 2.0",
+        f'SELECT id, title, company, description, location FROM "{JOB_TABLE}"',
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("JobApplication", "0010_catalogversion"),
+    ]
+
+    operations = [
+        migrations.RunPython(add_tags_column, remove_tags_column),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-17 10:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('JobApplication', '0011_search_index_tags'),
+        ('profiles', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobRecommendation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField()),
+                ('matched_skills', models.JSONField(default=list)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recommendations', to='JobApplication.jobapplication')),
+                ('profile', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='job_recommendations', to='profiles.profile')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['profile', '-score'], name='jobrec_profile_score_idx')],
+                'constraints': [models.UniqueConstraint(fields=('profile', 'job'), name='jobrec_profile_job_uniq')],
+            },
+        ),
+    ]
@@ -1,4 +1,14 @@
+from django.core.exceptions import NON_FIELD_ERRORS, ValidationError
 from django.db import models
+from django.db.models import Lookup
+from django.db.models.functions import Coalesce
+
+from .fingerprints import compute_fingerprint
+
+# Effective bounds of a posting's pay range when only one end is advertised.
+# Filters must use these exact expressions to hit the expression indexes below.
+SALARY_FLOOR = Coalesce("salary_min", "salary_max")
+SALARY_CEILING = Coalesce("salary_max", "salary_min")
 
 class JobApplication(models.Model):
 
@@ -12,5 +22,182 @@ class JobApplication(models.Model):
     salary_min = models.IntegerField(null=True, blank=True)
     salary_max = models.IntegerField(null=True, blank=True)
 
+    # Hash of normalized company/title/location/description, see fingerprints.py.
+    # NULL only for rows still waiting on `manage.py dedupe_jobs`.
+    fingerprint = models.CharField(max_length=64, unique=True, null=True, blank=True, editable=False)
+
+    # Normalized copy of tech_stack for indexed tag filtering, maintained by tags.py
+    tags = models.ManyToManyField("Tag", through="JobTag", related_name="jobs", blank=True)
+
+    class Meta:
+        indexes = [
+            # Keyset pagination walks (date, id) newest first
+            models.Index(fields=["-date", "-id"], name="job_date_id_idx"),
+            # Salary range overlap filtering and histograms
+            models.Index(SALARY_FLOOR, name="job_salary_floor_idx"),
+            models.Index(SALARY_CEILING, name="job_salary_ceiling_idx"),
+        ]
+
+    def compute_fingerprint(self):
+        return compute_fingerprint(self.company, self.title, self.location, self.description)
+
+    def validate_unique(self, exclude=None):
+        # fingerprint is not editable, so forms (the admin) leave it out of the
+        # default unique checks; without this a duplicate posting would only
+        # surface as an IntegrityError from save()
+        errors = {}
+        try:
+            super().validate_unique(exclude=exclude)
+        except ValidationError as e:
+            errors = e.update_error_dict(errors)
+        duplicate = (
+            JobApplication.objects.filter(fingerprint=self.compute_fingerprint())
+            .exclude(pk=self.pk)
+            .values_list("pk", flat=True)
+            .first()
+        )
+        if duplicate is not None:
+            errors.setdefault(NON_FIELD_ERRORS, []).append(ValidationError(
+                "This posting already exists as job %(job)s (same company, title, location and description).",
+                code="duplicate_posting",
+                params={"job": duplicate},
+            ))
+        if errors:
+            raise ValidationError(errors)
+
+    def save(self, *args, **kwargs):
+        # Callers that may write a duplicate validate first (full_clean(), as
+        # ModelForms do) or go through ingest.py's upsert
+        self.fingerprint = self.compute_fingerprint()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "fingerprint" not in update_fields:
+            kwargs["update_fields"] = [*update_fields, "fingerprint"]
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return f"{self.company} - {self.title}"
+
+
+
+class CatalogVersion(models.Model):
+    """
+    Single-row version token for the job catalog, replaced by catalog.bump() on
+    every write. Anything derived from job rows (ETags, cached search results)
+    is keyed by it, so one indexed read tells whether those are still current.
+    """
+    version = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"catalog v{self.version}"
+
+
+class Tag(models.Model):
+    """Interned, normalized tech-stack tag ("django", "postgresql", ...)."""
+    name = models.CharField(max_length=100, unique=True)
+
+    def __str__(self):
+        return self.name
+
+
+class JobTag(models.Model):
+    job = models.ForeignKey(JobApplication, on_delete=models.CASCADE, related_name="job_tags")
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name="job_tags")
+
+    class Meta:
+        constraints = [
+            # Tag-leading so "jobs with tag X" is an index range scan
+            models.UniqueConstraint(fields=["tag", "job"], name="jobtag_tag_job_uniq"),
+        ]
+
+    def __str__(self):
+        return f"{self.job_id} - {self.tag_id}"
+
+
+
+class JobRecommendation(models.Model):
+    """
+    Materialized top jobs per profile, maintained by recommend.py so the For
+    You page is a single index range scan on (profile, score).
+    """
+    profile = models.ForeignKey("profiles.Profile", on_delete=models.CASCADE, related_name="job_recommendations")
+    job = models.ForeignKey(JobApplication, on_delete=models.CASCADE, related_name="recommendations")
+    score = models.FloatField()
+    matched_skills = models.JSONField(default=list)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["profile", "job"], name="jobrec_profile_job_uniq"),
+        ]
+        indexes = [
+            models.Index(fields=["profile", "-score"], name="jobrec_profile_score_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.profile_id} - {self.job_id} ({self.score:.3f})"
+
+
+class JobSignature(models.Model):
+    """
+    MinHash signature of a posting's description, maintained by similar.py.
+    Jobs without a description have none.
+    """
+    job = models.OneToOneField(JobApplication, primary_key=True, on_delete=models.CASCADE, related_name="signature")
+    signature = models.BinaryField()  # similar.NUM_PERMUTATIONS little-endian uint32
+
+    def __str__(self):
+        return f"signature of {self.job_id}"
+
+
+class JobSignatureBand(models.Model):
+    """LSH bucket of one band of a job's signature: jobs sharing a bucket are similar-job candidates."""
+    job = models.ForeignKey(JobApplication, on_delete=models.CASCADE, related_name="signature_bands")
+    bucket = models.BigIntegerField()
+
+    class Meta:
+        indexes = [
+            # Bucket-leading so "jobs in these buckets" is an index range scan
+            models.Index(fields=["bucket", "job"], name="jobband_bucket_job_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.job_id} - {self.bucket}"
+
+
+class FullTextMatchField(models.TextField):
+    """The hidden FTS5 column named after its table, used as the MATCH target."""
+
+
+@FullTextMatchField.register_lookup
+class FullTextMatch(Lookup):
+    lookup_name = "match"
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f"{lhs} MATCH {rhs}", [*lhs_params, *rhs_params]
+
+
+class JobSearchDocument(models.Model):
+    """
+    Read-only view of the FTS5 search index (created in migration 0004 and
+    maintained by search.py), so searches are ordinary ORM joins.
+    """
+    job = models.OneToOneField(
+        JobApplication,
+        primary_key=True,
+        db_column="rowid",
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="search_document",
+    )
+    title = models.TextField()
+    company = models.TextField()
+    description = models.TextField()
+    location = models.TextField()
+    tags = models.TextField()  # tech_stack entries, space separated (migration 0011)
+    document = FullTextMatchField(db_column="JobApplication_jobapplication_fts")
+    rank = models.FloatField()
+
+    class Meta:
+        managed = False
+        db_table = "JobApplication_jobapplication_fts"
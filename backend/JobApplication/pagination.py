@@ -0,0 +1,138 @@
+"""
+Keyset (cursor) pagination for job listings.
+
+Pages are addressed by the sort key of the last row served instead of an
+OFFSET, so fetching page N costs the same index seek as fetching page 1 and
+rows inserted mid-scroll never cause duplicates or gaps. Every ordering is
+made total by using the primary key as the tie-breaker.
+
+A cursor is [field, value, pk]: it is only accepted by a listing sorted by
+the same field, and its value must have that field's type, so a tampered or
+reused cursor is a 400 instead of a failing query.
+"""
+import base64
+import binascii
+import json
+
+from django.core.exceptions import FieldDoesNotExist, FieldError, ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.db.models import F, Q
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(values):
+    raw = json.dumps(values, cls=DjangoJSONEncoder, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursor("Invalid cursor")
+    if (
+        not isinstance(values, list) or len(values) != 3
+        or not isinstance(values[0], str)
+        or not isinstance(values[2], int) or isinstance(values[2], bool)
+    ):
+        raise InvalidCursor("Invalid cursor")
+    return values
+
+
+def parse_limit(raw_limit):
+    """Clamp the ?limit= query parameter to [1, MAX_LIMIT]."""
+    if raw_limit in (None, ""):
+        return DEFAULT_LIMIT
+    try:
+        limit = int(raw_limit)
+    except (TypeError, ValueError):
+        raise InvalidCursor(f"Invalid limit: {raw_limit}")
+    return max(1, min(limit, MAX_LIMIT))
+
+
+def _after(field, value, pk, descending):
+    """Rows strictly after (value, pk) in (field, id) order, with NULLs sorted last."""
+    if value is None:
+        id_lookup = "id__lt" if descending else "id__gt"
+        return Q(**{f"{field}__isnull": True, id_lookup: pk})
+
+    lookup = "lt" if descending else "gt"
+    return (
+        Q(**{f"{field}__{lookup}": value}) |
+        Q(**{field: value, f"id__{lookup}": pk}) |
+        Q(**{f"{field}__isnull": True})
+    )
+
+
+def _output_field(queryset, field):
+    """The model field or annotation output field `field` sorts by, or None if unknown."""
+    annotation = queryset.query.annotations.get(field)
+    try:
+        if annotation is not None:
+            return annotation.output_field
+        return queryset.model._meta.get_field(field)
+    except (FieldDoesNotExist, FieldError):
+        return None
+
+
+def _cursor_value(queryset, field, value):
+    """`value` converted to `field`'s type; InvalidCursor when it has another type."""
+    if value is None:
+        return None
+    output_field = _output_field(queryset, field)
+    if isinstance(output_field, (models.DateField, models.DateTimeField)):
+        # Dates travel as ISO strings
+        if not isinstance(value, str):
+            raise InvalidCursor("Invalid cursor")
+    elif isinstance(output_field, (models.IntegerField, models.FloatField, models.DecimalField)):
+        if not isinstance(value, (int, float)) or isinstance(value, bool):
+            raise InvalidCursor("Invalid cursor")
+    elif not isinstance(value, (str, int, float)):
+        raise InvalidCursor("Invalid cursor")
+    try:
+        return output_field.to_python(value) if output_field is not None else value
+    except (ValidationError, TypeError, ValueError):
+        raise InvalidCursor("Invalid cursor")
+
+
+def _row_value(row, name):
+    return row[name] if isinstance(row, dict) else getattr(row, name)
+
+
+def paginate(queryset, field, cursor=None, limit=DEFAULT_LIMIT, descending=False):
+    """
+    Return one page of `queryset` ordered by (`field`, id) and the cursor of
+    the next page (None on the last page).
+
+    `field` may be a model field or an annotation; `cursor` is a value
+    previously returned by this function for the same field and direction
+    (InvalidCursor otherwise).
+    """
+    if descending:
+        ordering = (F(field).desc(nulls_last=True), "-id")
+    else:
+        ordering = (F(field).asc(nulls_last=True), "id")
+    queryset = queryset.order_by(*ordering)
+
+    if cursor:
+        cursor_field, value, pk = decode_cursor(cursor)
+        if cursor_field != field:
+            raise InvalidCursor("Cursor belongs to a different listing")
+        value = _cursor_value(queryset, field, value)
+        queryset = queryset.filter(_after(field, value, pk, descending))
+
+    rows = list(queryset[:limit + 1])
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor([field, _row_value(last, field), _row_value(last, "id")])
+    return rows, next_cursor
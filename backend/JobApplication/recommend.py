@@ -0,0 +1,361 @@
+"""
+Profile-to-job recommendations for the For You page.
+
+Jobs are rows of a sparse job-by-skill matrix built from the tag index
+(JobTag), one column per Tag id. Entries are IDF weighted and every row is L2
+normalized, so a profile is scored against the whole catalog with a single
+sparse matrix-vector product: the cosine similarity between the job's tags and
+the profile's programming languages, frameworks, libraries and experience
+skills. Rare skills count for more than ones every posting lists.
+
+The matrix is kept in memory per process and refreshed the way the suggestion
+index is: at most every REFRESH_INTERVAL seconds, and only when the catalog
+version has moved. New postings are appended as a delta, deletes (noticed by
+the job count) and the periodic REBUILD_INTERVAL reload everything.
+
+The For You page reads materialized results from JobRecommendation instead of
+scoring on every visit. A profile's rows are recomputed when its skills change
+(refresh_profile) and ingested postings are merged in by scoring only the new
+jobs against every materialized profile (add_jobs). Re-delivered postings whose
+tech stack changed have their stored rows dropped and are scored again the
+same way (rescore_jobs). Scores of stored rows are not revised when IDF
+weights drift as the catalog grows;
+`manage.py refresh_recommendations` recomputes everything.
+"""
+import math
+import threading
+import time
+from collections import Counter, defaultdict
+
+import numpy as np
+from scipy import sparse
+
+from django.db import transaction
+from django.db.models import Count, Max
+from django.utils import timezone
+
+from profiles.models import JobExperience, Profile
+from . import catalog, tags
+from .models import JobApplication, JobRecommendation, JobTag, Tag
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+# Rows kept per profile: MAX_LIMIT plus room for jobs the user already applied to
+STORED_PER_PROFILE = 150
+
+REFRESH_INTERVAL = 30  # seconds between catalog version checks
+REBUILD_INTERVAL = 15 * 60  # seconds between full rebuilds
+
+
+def profile_skills(profile):
+    """
+    Normalized skill -> number of mentions across the profile's tech stack
+    and job experiences.
+    """
+    skills = Counter()
+    for names in (profile.programming_languages, profile.frameworks, profile.libraries):
+        skills.update(tags.normalize_tags(names if isinstance(names, list) else []))
+    for experience_skills in profile.job_experiences.values_list("skills", flat=True):
+        skills.update(tags.normalize_tags(experience_skills if isinstance(experience_skills, list) else []))
+    return skills
+
+
+def all_profile_skills():
+    """profile_skills() of every profile, in two queries."""
+    skills = defaultdict(Counter)
+    rows = Profile.objects.values_list("id", "programming_languages", "frameworks", "libraries")
+    for profile_id, *stacks in rows.iterator(chunk_size=2000):
+        for names in stacks:
+            skills[profile_id].update(tags.normalize_tags(names if isinstance(names, list) else []))
+    experiences = JobExperience.objects.values_list("profile_id", "skills")
+    for profile_id, names in experiences.iterator(chunk_size=2000):
+        skills[profile_id].update(tags.normalize_tags(names if isinstance(names, list) else []))
+    return skills
+
+
+class SkillMatrix:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Forget the matrix; the next lookup reloads it."""
+        self.job_ids = np.zeros(0, dtype=np.int64)  # row -> job id, ascending
+        self.binary = sparse.csr_matrix((0, 0), dtype=np.float32)  # job has tag
+        self.weighted = self.binary  # IDF weighted, L2 normalized rows
+        self.idf = np.zeros(0, dtype=np.float32)
+        self.version = None
+        self.max_job_id = 0
+        self.checked_at = 0.0
+        self.built_at = 0.0
+
+    def _read_rows(self, jobs):
+        """(job ids, csr rows) of `jobs`, including jobs without any tag."""
+        job_ids = np.fromiter(jobs.order_by("id").values_list("id", flat=True), dtype=np.int64)
+        pairs = np.array(
+            list(JobTag.objects.filter(job__in=jobs).values_list("job_id", "tag_id")),
+            dtype=np.int64,
+        ).reshape(-1, 2)
+        columns = int(pairs[:, 1].max()) + 1 if len(pairs) else 0
+        rows = sparse.csr_matrix(
+            (
+                np.ones(len(pairs), dtype=np.float32),
+                (np.searchsorted(job_ids, pairs[:, 0]), pairs[:, 1]),
+            ),
+            shape=(len(job_ids), columns),
+        )
+        return job_ids, rows
+
+    def _reweight(self):
+        jobs, columns = self.binary.shape
+        document_frequency = np.diff(self.binary.tocsc().indptr)
+        self.idf = (np.log((1 + jobs) / (1 + document_frequency)) + 1).astype(np.float32)
+        weighted = self.binary @ sparse.diags(self.idf)
+        norms = np.sqrt(np.asarray(weighted.multiply(weighted).sum(axis=1)).ravel())
+        norms[norms == 0] = 1
+        self.weighted = sparse.csr_matrix(sparse.diags(1 / norms) @ weighted, dtype=np.float32)
+
+    def _append(self, job_ids, rows):
+        columns = max(self.binary.shape[1], rows.shape[1])
+        self.binary.resize((self.binary.shape[0], columns))
+        rows.resize((rows.shape[0], columns))
+        self.binary = sparse.vstack([self.binary, rows], format="csr")
+        self.job_ids = np.concatenate([self.job_ids, job_ids])
+
+    def refresh(self, force=False):
+        """Bring the matrix up to date with the catalog (throttled unless `force`)."""
+        now = time.monotonic()
+        if not force and now - self.checked_at < REFRESH_INTERVAL:
+            return
+        with self._lock:
+            if not force and now - self.checked_at < REFRESH_INTERVAL:
+                return
+            self.checked_at = now
+            version = catalog.current_version()
+            if version == self.version:
+                return
+
+            stats = JobApplication.objects.aggregate(max_id=Max("id"), count=Count("id"))
+            max_job_id = stats["max_id"] or 0
+            new_jobs = JobApplication.objects.filter(id__gt=self.max_job_id, id__lte=max_job_id)
+            expected = len(self.job_ids) + new_jobs.count() if self.version is not None else None
+
+            if expected != stats["count"] or now - self.built_at > REBUILD_INTERVAL:
+                self.job_ids, self.binary = self._read_rows(JobApplication.objects.filter(id__lte=max_job_id))
+                self.built_at = now
+            else:
+                # Only new postings since the last refresh
+                self._append(*self._read_rows(new_jobs))
+            self._reweight()
+            self.max_job_id = max_job_id
+            self.version = version
+
+    def _profile_entries(self, skill_ids):
+        """(tag ids, weights) of the IDF weighted, L2 normalized vector for {tag id: mentions}."""
+        columns = [tag_id for tag_id in sorted(skill_ids) if tag_id < len(self.idf)]
+        weights = np.array(
+            [(1 + math.log(skill_ids[tag_id])) * self.idf[tag_id] for tag_id in columns],
+            dtype=np.float32,
+        )
+        norm = np.linalg.norm(weights)
+        return columns, (weights / norm if norm else weights)
+
+    def profile_vector(self, skill_ids):
+        vector = np.zeros(self.binary.shape[1], dtype=np.float32)
+        columns, weights = self._profile_entries(skill_ids)
+        vector[columns] = weights
+        return vector
+
+    def _rows_of(self, job_ids):
+        """Matrix rows of the given job ids (unknown ids are skipped)."""
+        job_ids = np.asarray(sorted(job_ids), dtype=np.int64)
+        rows = np.searchsorted(self.job_ids, job_ids)
+        found = rows < len(self.job_ids)
+        rows, job_ids = rows[found], job_ids[found]
+        return rows[self.job_ids[rows] == job_ids]
+
+    def score(self, skill_ids, limit, exclude_ids=()):
+        """
+        Up to `limit` (job id, score, matched tag ids) for a profile's
+        {tag id: mentions}, best first. Jobs sharing no skill are dropped.
+        """
+        with self._lock:
+            return self._top_jobs(self.profile_vector(skill_ids), limit, exclude_ids)
+
+    def _top_jobs(self, vector, limit, exclude_ids):
+        scores = self.weighted @ vector
+        if exclude_ids:
+            scores[self._rows_of(exclude_ids)] = 0
+        candidates = np.flatnonzero(scores > 0)
+        if len(candidates) > limit:
+            candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+        # Best score first, then newest job
+        candidates = candidates[np.lexsort((-self.job_ids[candidates], -scores[candidates]))]
+
+        wanted = np.flatnonzero(vector)
+        binary = self.binary
+        return [
+            (
+                int(self.job_ids[row]),
+                float(scores[row]),
+                np.intersect1d(binary.indices[binary.indptr[row]:binary.indptr[row + 1]], wanted).tolist(),
+            )
+            for row in candidates
+        ]
+
+    def score_profiles(self, job_ids, profiles):
+        """
+        Score the given jobs against many profiles ({tag id: mentions} each)
+        with one sparse matrix product. Returns {profile index: [(job id,
+        score, matched tag ids)]} for the pairs sharing at least one skill.
+        """
+        with self._lock:
+            rows = self._rows_of(job_ids)
+            data, indices, indptr = [], [], [0]
+            for skill_ids in profiles:
+                columns, weights = self._profile_entries(skill_ids)
+                indices.extend(columns)
+                data.extend(weights)
+                indptr.append(len(indices))
+            vectors = sparse.csr_matrix(
+                (np.asarray(data, dtype=np.float32), indices, indptr),
+                shape=(len(profiles), self.binary.shape[1]),
+            )
+            scores = (self.weighted[rows] @ vectors.T).tocoo()
+
+            binary = self.binary
+            wanted = [set(vectors.indices[vectors.indptr[i]:vectors.indptr[i + 1]]) for i in range(len(profiles))]
+            matches = defaultdict(list)
+            for row, profile, score in zip(scores.row, scores.col, scores.data):
+                job_row = rows[row]
+                job_tags = binary.indices[binary.indptr[job_row]:binary.indptr[job_row + 1]]
+                matched = sorted(wanted[profile].intersection(job_tags.tolist()))
+                matches[int(profile)].append((int(self.job_ids[job_row]), float(score), matched))
+            return matches
+
+
+# One matrix per process
+matrix = SkillMatrix()
+
+
+def recommend(profile, limit=DEFAULT_LIMIT, exclude_ids=()):
+    """
+    Top `limit` jobs for `profile` as (job id, score, matched skill names),
+    plus the normalized skills the scoring used.
+    """
+    skills = profile_skills(profile)
+    tag_ids = dict(Tag.objects.filter(name__in=list(skills)).values_list("name", "id"))
+    if not tag_ids:
+        return [], sorted(skills)
+
+    matrix.refresh()
+    top = matrix.score({tag_ids[name]: skills[name] for name in tag_ids}, limit, exclude_ids)
+
+    names = {tag_id: name for name, tag_id in tag_ids.items()}
+    return [(job_id, score, sorted(names[tag_id] for tag_id in matched)) for job_id, score, matched in top], sorted(skills)
+
+
+def refresh_profile(profile):
+    """Recompute and store the recommendations of `profile` (after its skills changed)."""
+    top, _ = recommend(profile, STORED_PER_PROFILE)
+    refreshed_at = timezone.now()
+    with transaction.atomic():
+        JobRecommendation.objects.filter(profile=profile).delete()
+        JobRecommendation.objects.bulk_create([
+            JobRecommendation(profile=profile, job_id=job_id, score=score, matched_skills=matched)
+            for job_id, score, matched in top
+        ])
+        # update(), not save(): the profile itself did not change
+        Profile.objects.filter(pk=profile.pk).update(recommendations_refreshed_at=refreshed_at)
+    profile.recommendations_refreshed_at = refreshed_at
+    return len(top)
+
+
+def stored_recommendations(profile):
+    """
+    Stored recommendations of `profile` (best first), computing them on the
+    first visit. A profile that matches no job has no rows but is still
+    marked as refreshed, so it is not scored again on every visit.
+    """
+    if profile.recommendations_refreshed_at is None:
+        refresh_profile(profile)
+    return JobRecommendation.objects.filter(profile=profile).order_by("-score", "-job_id")
+
+
+def _merge(profile_id, candidates):
+    """Store the candidates that beat the profile's cut-off, then trim to STORED_PER_PROFILE."""
+    stored = JobRecommendation.objects.filter(profile_id=profile_id)
+    scores = sorted(stored.values_list("score", flat=True), reverse=True)
+    cutoff = scores[STORED_PER_PROFILE - 1] if len(scores) >= STORED_PER_PROFILE else 0.0
+    candidates = sorted((c for c in candidates if c[1] > cutoff), key=lambda c: -c[1])[:STORED_PER_PROFILE]
+    if not candidates:
+        return False
+
+    with transaction.atomic():
+        JobRecommendation.objects.bulk_create(
+            [
+                JobRecommendation(profile_id=profile_id, job_id=job_id, score=score, matched_skills=matched)
+                for job_id, score, matched in candidates
+            ],
+            ignore_conflicts=True,
+        )
+        keep = list(stored.order_by("-score", "-job_id").values_list("id", flat=True)[:STORED_PER_PROFILE])
+        stored.exclude(id__in=keep).delete()
+    return True
+
+
+def add_jobs(job_ids, batch_size=1000):
+    """
+    Merge new postings into the stored recommendations by scoring only them
+    against every profile whose recommendations were stored, even if none
+    matched (the others are computed in full on their next visit). Returns
+    the number of profiles updated.
+    """
+    return len(_merge_jobs(job_ids, batch_size))
+
+
+def _merge_jobs(job_ids, batch_size):
+    """add_jobs(), returning the ids of the profiles updated."""
+    job_ids = sorted(job_ids)
+    materialized = set(Profile.objects.filter(recommendations_refreshed_at__isnull=False).values_list("id", flat=True))
+    if not job_ids or not materialized:
+        return set()
+
+    skills = {profile_id: names for profile_id, names in all_profile_skills().items() if profile_id in materialized}
+    tag_ids = dict(
+        Tag.objects.filter(name__in={name for names in skills.values() for name in names})
+        .values_list("name", "id")
+    )
+    tag_names = {tag_id: name for name, tag_id in tag_ids.items()}
+    profile_ids = list(skills)
+    vectors = [
+        {tag_ids[name]: mentions for name, mentions in skills[profile_id].items() if name in tag_ids}
+        for profile_id in profile_ids
+    ]
+
+    matrix.refresh(force=True)
+    candidates = defaultdict(list)
+    for start in range(0, len(job_ids), batch_size):
+        scored = matrix.score_profiles(job_ids[start:start + batch_size], vectors)
+        for index, pairs in scored.items():
+            candidates[profile_ids[index]].extend(
+                (job_id, score, sorted(tag_names[tag_id] for tag_id in matched))
+                for job_id, score, matched in pairs
+            )
+
+    return {profile_id for profile_id, pairs in candidates.items() if _merge(profile_id, pairs)}
+
+
+def rescore_jobs(job_ids, batch_size=1000):
+    """
+    Score existing postings again after their tags changed: their stored rows
+    are dropped and they are merged in like new postings. Returns the number
+    of profiles updated.
+    """
+    job_ids = list(job_ids)
+    stale = JobRecommendation.objects.filter(job_id__in=job_ids)
+    updated = set(stale.values_list("profile_id", flat=True))
+    stale.delete()
+    # The matrix only appends new postings; changed rows need a full reload
+    matrix.reset()
+    return len(updated | _merge_jobs(job_ids, batch_size))
@@ -0,0 +1,22 @@
+import json
+
+from rest_framework.renderers import BaseRenderer
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    Newline-delimited JSON (one object per line).
+
+    Registering it lets DRF accept ?format=ndjson / Accept: application/x-ndjson;
+    the job list view streams the body itself, so this only renders the small
+    non-streamed payloads such as error responses.
+    """
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        items = data if isinstance(data, list) else [data]
+        return "".join(json.dumps(item) + "\n" for item in items).encode(self.charset)
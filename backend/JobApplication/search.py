@@ -0,0 +1,145 @@
+"""
+Full-text search index for job postings.
+
+Every JobApplication is mirrored into an SQLite FTS5 virtual table (rowid == job id),
+so a keyword search is an inverted-index lookup ranked with BM25 instead of four
+LIKE '%q%' scans over the jobs table. The index is kept in sync by the handlers in
+signals.py and can be rebuilt from scratch with `manage.py rebuild_search_index`.
+"""
+import re
+
+from django.db import connection, transaction
+from django.db.models import F, Q, Value, FloatField
+
+from . import catalog
+from .models import JobApplication, JobSearchDocument
+
+FTS_TABLE = JobSearchDocument._meta.db_table
+INDEXED_FIELDS = ("title", "company", "description", "location")
+
+# Split on anything the unicode61 tokenizer would treat as a separator
+_TOKEN_RE = re.compile(r"[^\W_]+", re.UNICODE)
+
+
+def is_enabled():
+    """FTS5 only exists on SQLite; other backends fall back to icontains."""
+    return connection.vendor == "sqlite"
+
+
+def tokenize(query):
+    """Lowercased words of `query`, split the way the index splits them."""
+    return _TOKEN_RE.findall(query.lower())
+
+
+def build_match_expression(query):
+    """
+    Turn free text from the search box into an FTS5 MATCH expression.
+
+    Each word becomes a quoted prefix term ("pyth"* matches "python") and the
+    terms are ANDed, so user input can never inject FTS5 query syntax. Words
+    are deduped and sorted: every spelling of the same query yields the same
+    expression and the same ranks, which the result cache relies on.
+    """
+    tokens = sorted(set(tokenize(query)))
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def search(queryset, query):
+    """
+    Restrict `queryset` to jobs matching `query`.
+
+    The result is annotated with `search_rank` (BM25, lower is a better match)
+    so callers can `order_by("search_rank", "id")`.
+    """
+    if not is_enabled():
+        return queryset.filter(
+            Q(title__icontains=query) |
+            Q(company__icontains=query) |
+            Q(description__icontains=query) |
+            Q(location__icontains=query)
+        ).annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+    match = build_match_expression(query)
+    if not match:
+        return queryset.none().annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+    # INNER JOIN on the index (rowid = job id); FTS5 drives the query via MATCH
+    return queryset.filter(
+        search_document__document__match=match,
+    ).annotate(search_rank=F("search_document__rank"))
+
+
+def tags_text(tech_stack):
+    """tech_stack as the text of the index's tags column"""
+    return " ".join(str(tag) for tag in tech_stack or [])
+
+
+def index_jobs(jobs):
+    """Insert or replace the index rows for the given JobApplication instances."""
+    if not is_enabled():
+        return
+    rows = [
+        (job.pk, job.title, job.company, job.description or "", job.location or "", tags_text(job.tech_stack))
+        for job in jobs
+    ]
+    if not rows:
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f'DELETE FROM "{FTS_TABLE}" WHERE rowid = %s',
+            [(row[0],) for row in rows],
+        )
+        cursor.executemany(
+            f'INSERT INTO "{FTS_TABLE}" (rowid, title, company, description, location, tags) '
+            f'VALUES (%s, %s, %s, %s, %s, %s)',
+            rows,
+        )
+
+
+def remove_jobs(job_ids):
+    """Drop the index rows for the given job ids."""
+    if not is_enabled():
+        return
+    job_ids = list(job_ids)
+    if not job_ids:
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f'DELETE FROM "{FTS_TABLE}" WHERE rowid = %s',
+            [(job_id,) for job_id in job_ids],
+        )
+
+
+def rebuild_index(batch_size=2000):
+    """
+    Repopulate the whole index from the jobs table and merge its b-trees.
+
+    Returns the number of indexed jobs.
+    """
+    if not is_enabled():
+        return 0
+
+    total = 0
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM "{FTS_TABLE}"')
+
+        batch = []
+        jobs = JobApplication.objects.only("id", *INDEXED_FIELDS, "tech_stack").order_by("id")
+        for job in jobs.iterator(chunk_size=batch_size):
+            batch.append(job)
+            if len(batch) >= batch_size:
+                index_jobs(batch)
+                total += len(batch)
+                batch = []
+        if batch:
+            index_jobs(batch)
+            total += len(batch)
+
+        with connection.cursor() as cursor:
+            cursor.execute(f'INSERT INTO "{FTS_TABLE}" ("{FTS_TABLE}") VALUES (\'optimize\')')
+
+        # ?q= results may differ from what a stale index returned
+        catalog.bump()
+
+    return total
@@ -0,0 +1,67 @@
+"""
+Cache of job search result pages.
+
+Pages of /api/jobs/ are stored in the 'search' cache (see CACHES in settings)
+under the normalized query and filters, the cursor and the limit, with the
+catalog version as the cache key version. Any write to the catalog changes
+the version, so stale pages are never read again and age out through the
+backend's LRU culling (MAX_ENTRIES) and TIMEOUT instead of being deleted.
+
+Hit/miss counters are kept per process, like the local-memory cache itself.
+"""
+import hashlib
+import threading
+
+from django.core.cache import caches
+
+CACHE_ALIAS = "search"
+
+_lock = threading.Lock()
+_counters = {"hits": 0, "misses": 0}
+
+
+def _count(name):
+    with _lock:
+        _counters[name] += 1
+
+
+def page_key(query_key, cursor, limit):
+    """Cache key for one page of the search described by `query_key` (filters.normalized_key)."""
+    raw = f"{query_key}|{cursor or ''}|{limit}"
+    return "job-search:" + hashlib.sha256(raw.encode()).hexdigest()
+
+
+def get_page(query_key, cursor, limit, version, compute):
+    """
+    The cached page for this search at catalog `version`, or `compute()`'s
+    result, which is then cached. Exceptions from `compute` are not cached.
+    """
+    cache = caches[CACHE_ALIAS]
+    key = page_key(query_key, cursor, limit)
+    page = cache.get(key, version=version)
+    if page is not None:
+        _count("hits")
+        return page
+
+    _count("misses")
+    page = compute()
+    cache.set(key, page, version=version)
+    return page
+
+
+def stats():
+    with _lock:
+        hits, misses = _counters["hits"], _counters["misses"]
+    lookups = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": round(hits / lookups, 4) if lookups else None,
+    }
+
+
+def clear():
+    """Drop every cached page and reset the counters."""
+    caches[CACHE_ALIAS].clear()
+    with _lock:
+        _counters.update(hits=0, misses=0)
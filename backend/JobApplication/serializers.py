@@ -1,44 +1,107 @@
+from functools import lru_cache
+
+from django.db.models import CharField
+from django.db.models.functions import Cast
 from rest_framework import serializers
+
 from .models import JobApplication
 
-class JobApplicationSerializer(serializers.ModelSerializer):
-    # Add computed fields that match your frontend expectations
-    salary = serializers.SerializerMethodField()
-    tags = serializers.SerializerMethodField()
-    postedDate = serializers.SerializerMethodField()
-    
-    class Meta:
-        model = JobApplication
-        fields = [
-            "id",
-            "company",
-            "title",
-            "location",
-            "description",
-            "date",
-            "tech_stack",
-            "salary_min",
-            "salary_max",
-            # Add the computed fields
-            "salary",
-            "tags",
-            "postedDate",
-        ]
-    
-    def get_salary(self, obj):
-        """Format salary as a string like '$100 - $9,900'"""
-        if obj.salary_min and obj.salary_max:
-            return f"${obj.salary_min:,} - ${obj.salary_max:,}"
-        elif obj.salary_min:
-            return f"${obj.salary_min:,}+"
-        elif obj.salary_max:
-            return f"Up to ${obj.salary_max:,}"
-        return None
-    
-    def get_tags(self, obj):
-        """Return tech_stack as tags"""
-        return obj.tech_stack if obj.tech_stack else []
-    
-    def get_postedDate(self, obj):
-        """Format date as string"""
-        return obj.date.strftime('%Y-%m-%d') if obj.date else None
\ No newline at end of file
+# Columns read for every job payload. Rows come from QuerySet.values(), so no
+# model instances are built and no per-field serializer methods run.
+JOB_VALUE_FIELDS = (
+    "id",
+    "title",
+    "company",
+    "location",
+    "description",
+    "tech_stack",
+    "salary_min",
+    "salary_max",
+)
+
+
+@lru_cache(maxsize=4096)
+def format_salary(salary_min, salary_max):
+    """Format salary as a string like '$100 - $9,900' (memoized: pay ranges repeat a lot)"""
+    if salary_min and salary_max:
+        return f"${salary_min:,} - ${salary_max:,}"
+    elif salary_min:
+        return f"${salary_min:,}+"
+    elif salary_max:
+        return f"Up to ${salary_max:,}"
+    return ''
+
+
+def job_values(queryset, *extra_fields, **expressions):
+    """
+    `queryset` as dict rows holding everything serialize_job_row() needs,
+    plus `extra_fields` and `expressions` for the caller.
+
+    The posted date is read as its 'YYYY-MM-DD' text straight from the database
+    instead of being parsed into a date and formatted back.
+    """
+    return queryset.values(*JOB_VALUE_FIELDS, *extra_fields, posted=Cast("date", CharField()), **expressions)
+
+
+def serialize_job_row(row, nested=False):
+    """
+    Transform a job_values() row into the shape the frontend expects.
+
+    `nested` gives the job payload applications have always embedded: the
+    same keys plus the raw date, tech_stack and salary columns, with an
+    integer id and null for a missing salary or posted date.
+    """
+    salary = format_salary(row['salary_min'], row['salary_max'])
+    if nested:
+        return {
+            'id': row['id'],
+            'title': row['title'],
+            'company': row['company'],
+            'location': row['location'],
+            'description': row['description'],
+            'date': row['posted'],
+            'tech_stack': row['tech_stack'],
+            'salary_min': row['salary_min'],
+            'salary_max': row['salary_max'],
+            'tags': row['tech_stack'] or [],
+            'salary': salary or None,
+            'postedDate': row['posted'],
+        }
+    return {
+        'id': str(row['id']),
+        'title': row['title'],
+        'company': row['company'],
+        'location': row['location'] or '',
+        'description': row['description'] or '',
+        'tags': row['tech_stack'] or [],  # tech_stack -> tags
+        'salary': salary,
+        'postedDate': row['posted'] or '',
+    }
+
+
+def serialize_jobs(queryset):
+    return [serialize_job_row(row) for row in job_values(queryset)]
+
+
+def job_rows(job_ids):
+    """job_values() rows of the given job ids, keyed by id"""
+    return {row['id']: row for row in job_values(JobApplication.objects.filter(id__in=set(job_ids)))}
+
+
+class JobApplicationSerializer(serializers.Field):
+    """
+    Read-only nested job field (serialize_job_row(nested=True)), read from the
+    job id. A list serializer can put the rows of a whole page into the
+    context as 'job_rows' (see job_rows()); otherwise the row is fetched here.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        kwargs.setdefault('source', 'job_id')
+        super().__init__(**kwargs)
+
+    def to_representation(self, job_id):
+        row = self.context.get('job_rows', {}).get(job_id)
+        if row is None:
+            row = job_rows([job_id])[job_id]
+        return serialize_job_row(row, nested=True)
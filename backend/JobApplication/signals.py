@@ -0,0 +1,22 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from . import catalog, search, similar, tags
+from .models import JobApplication
+
+
+@receiver(post_save, sender=JobApplication)
+def index_saved_job(sender, instance, raw=False, **kwargs):
+    """Keep the catalog version and the search/tag/similarity indexes in sync with every create/update."""
+    catalog.bump()
+    if raw:  # loaddata: fixtures are indexed by rebuild_search_index / backfill_job_tags / backfill_job_signatures
+        return
+    search.index_jobs([instance])
+    tags.sync_job_tags([instance])
+    similar.index_jobs([instance])
+
+
+@receiver(post_delete, sender=JobApplication)
+def unindex_deleted_job(sender, instance, **kwargs):
+    catalog.bump()
+    search.remove_jobs([instance.pk])
@@ -0,0 +1,160 @@
+"""
+"Similar jobs" lookup over posting descriptions (MinHash + LSH).
+
+Each description is cut into overlapping word shingles ("senior python
+developer", "python developer with", ...) and summarized by a MinHash
+signature of NUM_PERMUTATIONS values: the share of positions two signatures
+agree on estimates the Jaccard similarity of their shingle sets.
+
+Signatures are split into BANDS bands and every band is hashed into an LSH
+bucket stored in JobSignatureBand. Two jobs land in a common bucket with high
+probability when their similarity is above roughly (1/BANDS)^(1/ROWS_PER_BAND)
+(about 0.42 here) and rarely when it is well below, so a lookup only compares
+signatures of the jobs sharing a bucket with the posting instead of every
+description in the catalog.
+
+Signatures are written alongside the search and tag indexes (signals.py and
+ingestion) and can be rebuilt with `manage.py backfill_job_signatures`.
+"""
+import hashlib
+import zlib
+
+import numpy as np
+
+from django.db import transaction
+from django.db.models import Count
+
+from . import catalog
+from .fingerprints import normalize_text
+from .models import JobApplication, JobSignature, JobSignatureBand
+
+NUM_PERMUTATIONS = 128
+BANDS = 32
+ROWS_PER_BAND = NUM_PERMUTATIONS // BANDS
+SHINGLE_SIZE = 3  # words per shingle
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 50
+MIN_SIMILARITY = 0.2  # estimated Jaccard below this is noise, not "similar"
+MAX_CANDIDATES = 1000  # bucket mates compared per lookup, most shared bands first
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+# Fixed seed: signatures must be comparable across processes and restarts.
+# Coefficients stay below 2**31 so a * hash + b never overflows 64 bits.
+_random = np.random.RandomState(20240917)
+_A = _random.randint(1, 1 << 31, size=NUM_PERMUTATIONS, dtype=np.uint64)
+_B = _random.randint(0, 1 << 31, size=NUM_PERMUTATIONS, dtype=np.uint64)
+
+
+def shingles(text):
+    """Word SHINGLE_SIZE-grams of the normalized text (one shingle if it is shorter)."""
+    words = normalize_text(text).split()
+    if len(words) <= SHINGLE_SIZE:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)}
+
+
+def signature(text):
+    """MinHash signature of `text` as a uint32 array, or None when it has no words."""
+    grams = shingles(text)
+    if not grams:
+        return None
+    hashes = np.fromiter((zlib.crc32(gram.encode()) for gram in grams), dtype=np.uint64, count=len(grams))
+    # One universal hash (a * x + b) mod p per permutation, minimum over the shingles
+    permuted = (_A[:, None] * hashes[None, :] + _B[:, None]) % _MERSENNE_PRIME
+    return (permuted & _MAX_HASH).min(axis=1).astype(np.uint32)
+
+
+def buckets(signature):
+    """One signed 64-bit LSH bucket per band of `signature`."""
+    values = signature.astype("<u4")
+    return [
+        int.from_bytes(
+            hashlib.blake2b(
+                bytes([band]) + values[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND].tobytes(),
+                digest_size=8,
+            ).digest(),
+            "little",
+            signed=True,
+        )
+        for band in range(BANDS)
+    ]
+
+
+def _decode(raw):
+    return np.frombuffer(bytes(raw), dtype="<u4")
+
+
+def index_jobs(jobs):
+    """Rewrite the signature and LSH buckets of the given JobApplication instances."""
+    jobs = [job for job in jobs if job.pk is not None]
+    if not jobs:
+        return
+    signatures = {}
+    for job in jobs:
+        value = signature(job.description)
+        if value is not None:
+            signatures[job.pk] = value
+
+    with transaction.atomic():
+        job_ids = [job.pk for job in jobs]
+        JobSignatureBand.objects.filter(job_id__in=job_ids).delete()
+        JobSignature.objects.filter(job_id__in=job_ids).delete()
+        JobSignature.objects.bulk_create([
+            JobSignature(job_id=job_id, signature=value.astype("<u4").tobytes())
+            for job_id, value in signatures.items()
+        ])
+        JobSignatureBand.objects.bulk_create([
+            JobSignatureBand(job_id=job_id, bucket=bucket)
+            for job_id, value in signatures.items()
+            for bucket in buckets(value)
+        ])
+
+
+def rebuild_signatures(batch_size=2000):
+    """Backfill signatures for every job. Returns the number of jobs processed."""
+    total = 0
+    last_id = 0
+    while True:
+        batch = list(
+            JobApplication.objects.filter(id__gt=last_id)
+            .order_by("id")
+            .only("id", "description")[:batch_size]
+        )
+        if not batch:
+            break
+        index_jobs(batch)
+        total += len(batch)
+        last_id = batch[-1].id
+    catalog.bump()
+    return total
+
+
+def similar_jobs(job_id, limit=DEFAULT_LIMIT):
+    """
+    Up to `limit` (job id, estimated similarity) pairs for the jobs whose
+    description resembles job `job_id`'s, most similar first.
+    """
+    own = JobSignature.objects.filter(job_id=job_id).values_list("signature", flat=True).first()
+    if own is None:
+        return []
+    own = _decode(own)
+
+    # Bucket mates, the ones sharing the most bands first
+    candidates = (
+        JobSignatureBand.objects.filter(bucket__in=buckets(own))
+        .exclude(job_id=job_id)
+        .values("job_id")
+        .annotate(shared=Count("id"))
+        .order_by("-shared", "-job_id")
+        .values_list("job_id", flat=True)[:MAX_CANDIDATES]
+    )
+    scored = []
+    for other_id, raw in JobSignature.objects.filter(job_id__in=list(candidates)).values_list("job_id", "signature"):
+        similarity = float(np.count_nonzero(_decode(raw) == own)) / NUM_PERMUTATIONS
+        if similarity >= MIN_SIMILARITY:
+            scored.append((other_id, similarity))
+    scored.sort(key=lambda item: (-item[1], -item[0]))
+    return scored[:limit]
@@ -0,0 +1,198 @@
+"""
+Typeahead suggestions for the job search box.
+
+Distinct titles, companies and locations live in memory as a sorted array of
+(search key, entry) pairs, so a prefix lookup is a binary search plus a scan
+of the matching range. Every word start of a value is a key of its own:
+"dev" completes "Backend Developer". Entries carry the number of postings
+using the value and completions are returned most frequent first. Prefixes of
+up to HEAD_LENGTH characters match too much of the array to scan per
+keystroke, so their top MAX_LIMIT entries are kept precomputed.
+
+The index is built on first use in each process and refreshed at most every
+REFRESH_INTERVAL seconds. When the catalog version has moved, only jobs newer
+than the last one seen are grouped and merged in. Deletes are noticed by the
+job count and trigger a full rebuild. Edits to existing postings are picked up
+by the periodic rebuild (REBUILD_INTERVAL).
+"""
+import bisect
+import heapq
+import threading
+import time
+
+from django.db.models import Count, Max
+
+from . import catalog
+from .models import JobApplication
+
+FIELDS = ("title", "company", "location")
+DEFAULT_LIMIT = 8
+MAX_LIMIT = 20
+
+REFRESH_INTERVAL = 5  # seconds between catalog version checks
+REBUILD_INTERVAL = 15 * 60  # seconds between full rebuilds
+HEAD_LENGTH = 3  # prefixes this short are answered from precomputed top lists
+MEMO_SIZE = 4096  # memoized prefix lookups, dropped whenever the index changes
+INSORT_THRESHOLD = 64  # merge larger deltas instead of inserting key by key
+
+
+def normalize(text):
+    """'  Backend   Developer' -> 'backend developer'"""
+    return " ".join(str(text).lower().split())
+
+
+class SuggestionIndex:
+    def __init__(self):
+        self._lock = threading.RLock()
+        self.reset()
+
+    def reset(self):
+        """Forget everything; the next lookup rebuilds from the database."""
+        with self._lock:
+            self._keys = []  # sorted (search key, entry id)
+            self._entries = []  # [field, value, count] by entry id
+            self._entry_ids = {}  # (field, normalized value) -> entry id
+            self._head = {}  # short prefix -> up to MAX_LIMIT entry ids, best first
+            self._memo = {}
+            self.version = None
+            self.max_job_id = 0
+            self.job_count = 0
+            self.checked_at = 0.0
+            self.built_at = 0.0
+
+    def _rank(self, entry_id):
+        field, value, count = self._entries[entry_id]
+        return (-count, value)
+
+    def _add(self, field, value, count, new_keys, touched):
+        norm = normalize(value)
+        if not norm:
+            return
+        entry_id = self._entry_ids.get((field, norm))
+        if entry_id is not None:
+            self._entries[entry_id][2] += count
+        else:
+            entry_id = len(self._entries)
+            self._entries.append([field, value.strip(), count])
+            self._entry_ids[(field, norm)] = entry_id
+            words = norm.split(" ")
+            for start in range(len(words)):
+                new_keys.append((" ".join(words[start:]), entry_id))
+        touched[entry_id] = norm
+
+    def _update_head(self, touched, rebuilding=False):
+        """Re-rank the precomputed short-prefix lists for entries whose count grew."""
+        # Best first: while rebuilding, lists only ever need appending
+        for entry_id in sorted(touched, key=self._rank):
+            norm = touched[entry_id]
+            starts = [0] + [i + 1 for i, char in enumerate(norm) if char == " "]
+            prefixes = {norm[start:start + length] for start in starts for length in range(1, HEAD_LENGTH + 1)}
+            for prefix in prefixes:
+                head = self._head.setdefault(prefix, [])
+                if rebuilding:
+                    if len(head) < MAX_LIMIT:
+                        head.append(entry_id)
+                elif entry_id in head:
+                    head.sort(key=self._rank)
+                elif len(head) < MAX_LIMIT or self._rank(entry_id) < self._rank(head[-1]):
+                    bisect.insort(head, entry_id, key=self._rank)
+                    del head[MAX_LIMIT:]
+
+    def _load(self, jobs):
+        """Merge the value counts of `jobs` (a queryset) into the index."""
+        new_keys = []
+        touched = {}  # entry id -> normalized value
+        for field in FIELDS:
+            rows = (
+                jobs.exclude(**{field: ""})
+                .values_list(field)
+                .annotate(count=Count("id"))
+                .order_by()
+            )
+            for value, count in rows:
+                self._add(field, value, count, new_keys, touched)
+
+        if len(new_keys) < INSORT_THRESHOLD:
+            for key in new_keys:
+                bisect.insort(self._keys, key)
+        else:
+            new_keys.sort()
+            self._keys = list(heapq.merge(self._keys, new_keys))
+        self._update_head(touched, rebuilding=not self._head)
+        self._memo = {}
+
+    def _rebuild(self, max_job_id, job_count):
+        self._keys, self._entries, self._entry_ids, self._head = [], [], {}, {}
+        self._load(JobApplication.objects.filter(id__lte=max_job_id))
+        self.max_job_id = max_job_id
+        self.job_count = job_count
+        self.built_at = time.monotonic()
+
+    def refresh(self, force=False):
+        """Bring the index up to date with the catalog (throttled unless `force`)."""
+        now = time.monotonic()
+        if not force and now - self.checked_at < REFRESH_INTERVAL:
+            return
+        with self._lock:
+            if not force and now - self.checked_at < REFRESH_INTERVAL:
+                return  # another thread just refreshed
+            self.checked_at = now
+            version = catalog.current_version()
+            if version == self.version and not force:
+                return
+
+            stats = JobApplication.objects.aggregate(max_id=Max("id"), count=Count("id"))
+            max_job_id = stats["max_id"] or 0
+            new_jobs = JobApplication.objects.filter(id__gt=self.max_job_id, id__lte=max_job_id)
+            expected = self.job_count + new_jobs.count() if self.version is not None else None
+
+            if force or expected != stats["count"] or now - self.built_at > REBUILD_INTERVAL:
+                self._rebuild(max_job_id, stats["count"])
+            else:
+                # Only new postings since the last refresh
+                self._load(new_jobs)
+                self.max_job_id = max_job_id
+                self.job_count = stats["count"]
+            self.version = version
+
+    def suggest(self, prefix, limit=DEFAULT_LIMIT):
+        """Top `limit` completions of `prefix` as {value, type, count} dicts."""
+        key = normalize(prefix)
+        if not key:
+            return []
+        self.refresh()
+
+        with self._lock:
+            memo_key = (key, limit)
+            if memo_key in self._memo:
+                return self._memo[memo_key]
+
+            if len(key) <= HEAD_LENGTH:
+                top = self._head.get(key, [])[:limit]
+            else:
+                matches = set()
+                keys = self._keys
+                for index in range(bisect.bisect_left(keys, (key,)), len(keys)):
+                    search_key, entry_id = keys[index]
+                    if not search_key.startswith(key):
+                        break
+                    matches.add(entry_id)
+                top = heapq.nsmallest(limit, matches, key=self._rank)
+
+            result = []
+            for entry_id in top:
+                field, value, count = self._entries[entry_id]
+                result.append({"value": value, "type": field, "count": count})
+
+            if len(self._memo) >= MEMO_SIZE:
+                self._memo = {}
+            self._memo[memo_key] = result
+            return result
+
+
+# One index per process
+index = SuggestionIndex()
+
+
+def suggest(prefix, limit=DEFAULT_LIMIT):
+    return index.suggest(prefix, limit)
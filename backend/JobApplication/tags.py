@@ -0,0 +1,110 @@
+"""
+Normalized tag index over JobApplication.tech_stack.
+
+tech_stack stays the source of truth (it is what the API returns), but every
+entry is also interned into the Tag table and linked through JobTag, so
+"jobs using Django and Postgres" is an intersection over the (tag, job)
+index instead of deserializing every row's JSON.
+"""
+import re
+
+from django.db import transaction
+from django.db.models import Count
+
+from . import catalog
+from .models import JobApplication, JobTag, Tag
+
+MATCH_ALL = "all"
+MATCH_ANY = "any"
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_MAX_LENGTH = Tag._meta.get_field("name").max_length
+
+
+def normalize_tag(name):
+    """'  Node.JS ' -> 'node.js'"""
+    return _WHITESPACE_RE.sub(" ", str(name)).strip().lower()[:_MAX_LENGTH]
+
+
+def normalize_tags(names):
+    """Normalize and dedupe a list of tag names, preserving order."""
+    tags = []
+    for name in names or []:
+        tag = normalize_tag(name)
+        if tag and tag not in tags:
+            tags.append(tag)
+    return tags
+
+
+def intern_tags(names):
+    """Return {name: tag_id}, creating missing Tag rows."""
+    names = set(names)
+    if not names:
+        return {}
+    ids = dict(Tag.objects.filter(name__in=names).values_list("name", "id"))
+    missing = names - ids.keys()
+    if missing:
+        Tag.objects.bulk_create([Tag(name=name) for name in missing], ignore_conflicts=True)
+        ids.update(Tag.objects.filter(name__in=missing).values_list("name", "id"))
+    return ids
+
+
+def sync_job_tags(jobs):
+    """Rewrite the JobTag rows of `jobs` from their current tech_stack."""
+    jobs = [job for job in jobs if job.pk is not None]
+    if not jobs:
+        return
+    job_tags = {job.pk: normalize_tags(job.tech_stack) for job in jobs}
+    tag_ids = intern_tags(name for names in job_tags.values() for name in names)
+
+    with transaction.atomic():
+        JobTag.objects.filter(job_id__in=job_tags.keys()).delete()
+        JobTag.objects.bulk_create([
+            JobTag(job_id=job_id, tag_id=tag_ids[name])
+            for job_id, names in job_tags.items()
+            for name in names
+        ])
+
+
+def rebuild_tags(batch_size=2000):
+    """Backfill the tag index for every job. Returns the number of jobs processed."""
+    total = 0
+    last_id = 0
+    while True:
+        batch = list(
+            JobApplication.objects.filter(id__gt=last_id)
+            .order_by("id")
+            .only("id", "tech_stack")[:batch_size]
+        )
+        if not batch:
+            break
+        sync_job_tags(batch)
+        total += len(batch)
+        last_id = batch[-1].id
+    # Drop tags no job uses any more
+    Tag.objects.filter(job_tags__isnull=True).delete()
+    catalog.bump()
+    return total
+
+
+def filter_by_tags(queryset, names, match=MATCH_ALL):
+    """
+    Restrict `queryset` to jobs tagged with `names`.
+
+    MATCH_ALL requires every tag (AND), MATCH_ANY at least one (OR).
+    """
+    names = normalize_tags(names)
+    if not names:
+        return queryset
+
+    matching = JobTag.objects.filter(tag__name__in=names)
+    if match == MATCH_ANY:
+        job_ids = matching.values("job_id")
+    else:
+        job_ids = (
+            matching.values("job_id")
+            .annotate(matched=Count("tag_id"))
+            .filter(matched=len(names))
+            .values("job_id")
+        )
+    return queryset.filter(id__in=job_ids)
@@ -1,3 +1,915 @@
+import datetime
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django.core.management import call_command
+from django.db import connection
+from django.forms import modelform_factory
 from django.test import TestCase
+from rest_framework.test import APIClient
+
+from .factories import make_job
+from . import catalog, dedupe, fuzzy, ingest, pagination, recommend, search, search_cache, similar, suggest
+from applications.models import Application
+from profiles.models import JobExperience, Profile, User
+from resumes import tasks
+from resumes.models import Resume
+from .models import JobApplication, JobRecommendation, JobSignature, JobSignatureBand, JobTag, Tag
+
+
+class JobSearchTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.backend = make_job(
+            title="Backend Developer",
+            company="Shopify",
+            description="Python and Django services",
+        )
+        self.python = make_job(
+            title="Python Engineer",
+            company="Amazon",
+            description="Work on Python tooling",
+        )
+        self.frontend = make_job(
+            title="Frontend Developer",
+            company="Google",
+            description="React and TypeScript",
+            location="Toronto, ON",
+        )
+
+    def search_ids(self, query):
+        response = self.client.get("/api/jobs/", {"q": query})
+        self.assertEqual(response.status_code, 200)
+        return [job["id"] for job in response.json()["results"]]
+
+    def test_title_matches_rank_above_description_matches(self):
+        self.assertEqual(
+            self.search_ids("python"),
+            [str(self.python.id), str(self.backend.id)],
+        )
+
+    def test_prefix_and_multi_word_queries(self):
+        self.assertEqual(self.search_ids("devel toron"), [str(self.frontend.id)])
+
+    def test_fts_syntax_in_query_is_treated_as_text(self):
+        self.assertEqual(self.search_ids('"react" (*:'), [str(self.frontend.id)])
+        self.assertEqual(self.search_ids("***"), [])
+
+    def test_index_follows_updates_and_deletes(self):
+        self.frontend.title = "Rust Developer"
+        self.frontend.save()
+        self.assertEqual(self.search_ids("rust"), [str(self.frontend.id)])
+
+        self.frontend.delete()
+        self.assertEqual(self.search_ids("rust"), [])
+
+    def test_rebuild_command_restores_index(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM "{search.FTS_TABLE}"')
+        self.assertEqual(self.search_ids("python"), [])
+
+        call_command("rebuild_search_index", stdout=StringIO())
+        self.assertEqual(len(self.search_ids("python")), 2)
+
+
+class JobPaginationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        # Two jobs share a date and one has none, to exercise the id tie-break and NULL handling
+        self.jobs = [
+            make_job(title="Oldest", date=datetime.date(2026, 1, 1)),
+            make_job(title="Tied A", date=datetime.date(2026, 1, 5)),
+            make_job(title="Tied B", date=datetime.date(2026, 1, 5)),
+            make_job(title="Newest", date=datetime.date(2026, 1, 9)),
+            make_job(title="Undated", date=None),
+        ]
+
+    def walk(self, params):
+        seen, cursor = [], None
+        while True:
+            response = self.client.get("/api/jobs/", {**params, **({"cursor": cursor} if cursor else {})})
+            self.assertEqual(response.status_code, 200)
+            body = response.json()
+            self.assertLessEqual(len(body["results"]), int(params["limit"]))
+            seen.extend(job["title"] for job in body["results"])
+            cursor = body["next_cursor"]
+            if cursor is None:
+                return seen
+
+    def test_list_is_newest_first_across_pages(self):
+        self.assertEqual(
+            self.walk({"limit": 2}),
+            ["Newest", "Tied B", "Tied A", "Oldest", "Undated"],
+        )
+
+    def test_search_pages_follow_rank_order(self):
+        ranked = self.walk({"q": "a", "limit": 10})
+        self.assertEqual(self.walk({"q": "a", "limit": 1}), ranked)
+
+    def test_default_limit_bounds_response(self):
+        for i in range(pagination.DEFAULT_LIMIT):
+            make_job(title=f"Filler {i}")
+        body = self.client.get("/api/jobs/").json()
+        self.assertEqual(len(body["results"]), pagination.DEFAULT_LIMIT)
+        self.assertIsNotNone(body["next_cursor"])
+
+    def test_invalid_cursor_is_rejected(self):
+        response = self.client.get("/api/jobs/", {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_cursor_with_wrong_value_type_is_rejected(self):
+        for values in (["date", "notadate", 1], ["date", {"a": 1}, 1], ["date", 5, 1], ["date", "2026-01-05", "1"]):
+            with self.subTest(values=values):
+                response = self.client.get("/api/jobs/", {"cursor": pagination.encode_cursor(values)})
+                self.assertEqual(response.status_code, 400)
+
+    def test_cursor_from_another_listing_is_rejected(self):
+        listing_cursor = self.client.get("/api/jobs/", {"limit": 1}).json()["next_cursor"]
+        response = self.client.get("/api/jobs/", {"q": "a", "limit": 1, "cursor": listing_cursor})
+        self.assertEqual(response.status_code, 400)
+
+        search_cursor = self.client.get("/api/jobs/", {"q": "a", "limit": 1}).json()["next_cursor"]
+        self.assertIsNotNone(search_cursor)
+        response = self.client.get("/api/jobs/", {"limit": 1, "cursor": search_cursor})
+        self.assertEqual(response.status_code, 400)
+
+    def test_search_cursor_rank_must_be_a_number(self):
+        cursor = pagination.encode_cursor(["search_rank", "2026-01-05", 1])
+        response = self.client.get("/api/jobs/", {"q": "a", "cursor": cursor})
+        self.assertEqual(response.status_code, 400)
+
+
+class JobExportTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        for i in range(pagination.MAX_LIMIT + 5):
+            make_job(title=f"Engineer {i}", company="Shopify" if i % 2 else "Amazon")
+
+    def read_lines(self, params):
+        response = self.client.get("/api/jobs/", {"format": "ndjson", **params})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        body = b"".join(response.streaming_content).decode()
+        return [json.loads(line) for line in body.splitlines()]
+
+    def test_streams_entire_catalog_unpaginated(self):
+        jobs = self.read_lines({})
+        self.assertEqual(len(jobs), JobApplication.objects.count())
+        self.assertEqual([job["id"] for job in jobs], sorted((job["id"] for job in jobs), key=int))
+
+    def test_stream_respects_search_query(self):
+        jobs = self.read_lines({"q": "shopify"})
+        self.assertTrue(jobs)
+        self.assertTrue(all(job["company"] == "Shopify" for job in jobs))
+
+
+class IngestJobsTests(TestCase):
+    def write_feed(self, name, content):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = Path(directory.name) / name
+        path.write_text(content)
+        return str(path)
+
+    def test_normalize_row(self):
+        row = ingest.normalize_row({
+            "company": " Shopify ",
+            "title": "Backend Developer",
+            "salary_min": "$85,000",
+            "salary_max": "120k",
+            "postedDate": "2026-01-17T08:34:00",
+            "tags": "Python; Django, Python",
+        })
+        self.assertEqual(row["company"], "Shopify")
+        self.assertEqual(row["salary_min"], 85000)
+        self.assertEqual(row["salary_max"], 120000)
+        self.assertEqual(row["date"], datetime.date(2026, 1, 17))
+        self.assertEqual(row["tech_stack"], ["Python", "Django"])
+
+    def test_normalize_row_rejects_bad_values(self):
+        for row in (
+            {"title": "No company"},
+            {"company": "Acme", "title": "Dev", "salary_min": "lots"},
+            {"company": "Acme", "title": "Dev", "salary_min": 10, "salary_max": 5},
+            {"company": "Acme", "title": "Dev", "date": "17/01/2026"},
+        ):
+            with self.assertRaises(ingest.InvalidRow):
+                ingest.normalize_row(row)
+
+    def test_ingest_csv_and_jsonl(self):
+        csv_path = self.write_feed("jobs.csv", (
+            "company,title,location,salary_min,salary_max,date,tech_stack\n"
+            "Shopify,Backend Developer,Ottawa,90000,130000,2026-01-10,\"python,django\"\n"
+            ",Missing Company,,,,,\n"
+        ))
+        jsonl_path = self.write_feed("jobs.jsonl", (
+            json.dumps({"company": "Amazon", "title": "SDE", "tech_stack": ["Java"]}) + "\n"
+            "{broken\n"
+        ))
+
+        out, err = StringIO(), StringIO()
+        call_command("ingest_jobs", csv_path, jsonl_path, "--batch-size", "1", stdout=out, stderr=err)
+
+        self.assertEqual(JobApplication.objects.count(), 2)
+        job = JobApplication.objects.get(company="Shopify")
+        self.assertEqual(job.tech_stack, ["python", "django"])
+        self.assertEqual(job.salary_max, 130000)
+        self.assertIn("missing company", err.getvalue())
+        self.assertIn("invalid JSON", err.getvalue())
+        self.assertIn("rows/s", out.getvalue())
+
+        # bulk_create bypasses signals, so the command has to index new rows itself
+        search_ids = [job.pk for job in search.search(JobApplication.objects.all(), "ottawa")]
+        self.assertEqual(search_ids, [job.pk])
+
+    def test_dry_run_writes_nothing(self):
+        path = self.write_feed("jobs.jsonl", json.dumps({"company": "Acme", "title": "Dev"}) + "\n")
+        call_command("ingest_jobs", path, "--dry-run", stdout=StringIO())
+        self.assertFalse(JobApplication.objects.exists())
+
+    def test_dry_run_counts_duplicates_across_batches(self):
+        rows = [(line, {"company": "Acme", "title": "Dev"}) for line in range(3)]
+        result = ingest.ingest(rows, batch_size=1, dry_run=True)
+        self.assertEqual((result.created, result.updated), (1, 2))
+
+    def test_redelivered_posting_is_indexed_as_stored(self):
+        job = make_job(company="Shopify", title="Backend Developer", description="Python services")
+        ingest.ingest([(1, {"company": "SHOPIFY", "title": "backend developer", "location": "Edmonton, AB",
+                            "description": "PYTHON services", "tech_stack": "Python"})])
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT title, company, description, tags FROM "{search.FTS_TABLE}" WHERE rowid = %s', [job.pk])
+            self.assertEqual(cursor.fetchone(), ("Backend Developer", "Shopify", "Python services", "Python"))
+
+
+class JobDeduplicationTests(TestCase):
+    def make_duplicate(self, original, **fields):
+        """Create a copy of `original` the way pre-fingerprint feeds did (no fingerprint)."""
+        job = make_job(title=f"placeholder {JobApplication.objects.count()}", **fields)
+        JobApplication.objects.filter(pk=job.pk).update(
+            company=original.company,
+            title=original.title,
+            location=original.location,
+            description=original.description,
+            fingerprint=None,
+        )
+        return job
+
+    def test_fingerprint_ignores_case_punctuation_and_whitespace(self):
+        job = make_job(company="Shopify", title="Backend Developer", description="Python")
+        variant = JobApplication(
+            company="shopify.", title="  backend   developer", location="edmonton ab", description="python ",
+        )
+        self.assertEqual(variant.compute_fingerprint(), job.fingerprint)
+
+    def test_duplicate_is_a_validation_error(self):
+        original = make_job(company="Shopify", title="Backend Developer")
+        JobForm = modelform_factory(JobApplication, fields=["company", "title", "location", "description", "tech_stack"])
+        form = JobForm(data={"company": "SHOPIFY", "title": "backend developer", "location": "Edmonton, AB", "tech_stack": '["python"]'})
+        self.assertFalse(form.is_valid())
+        self.assertIn(f"already exists as job {original.pk}", form.non_field_errors()[0])
+
+        # Editing the posting itself is not a duplicate
+        form = JobForm(data={"company": "Shopify", "title": "Backend Developer", "location": "Edmonton, AB", "tech_stack": '["python"]'}, instance=original)
+        self.assertTrue(form.is_valid(), form.errors)
+
+        with self.assertRaises(ValidationError):
+            JobApplication(company="Shopify", title="Backend Developer", location="Edmonton, AB").full_clean()
+
+    def test_ingest_refreshes_existing_posting(self):
+        original = make_job(company="Shopify", title="Backend Developer", salary_max=100000)
+        rows = [
+            (1, {"company": "SHOPIFY", "title": "Backend developer", "location": "Edmonton, AB", "salary_max": "120000"}),
+            (2, {"company": "Shopify", "title": "Backend Developer", "location": "Edmonton AB", "salary_max": "130000"}),
+        ]
+        result = ingest.ingest(rows)
+
+        self.assertEqual((result.created, result.updated), (0, 2))
+        self.assertEqual(JobApplication.objects.count(), 1)
+        original.refresh_from_db()
+        self.assertEqual(original.salary_max, 130000)
+
+    def test_dedupe_merges_and_repoints_references(self):
+        canonical = make_job(company="Shopify", title="Backend Developer")
+        duplicate = self.make_duplicate(canonical)
+        other = self.make_duplicate(canonical)
+        application = Application.objects.create(job=duplicate)
+        resume = Resume.objects.create(job_application=other, data={"summary": "tailored"})
+
+        out = StringIO()
+        call_command("dedupe_jobs", stdout=out)
+
+        self.assertIn("merged 2 duplicates", out.getvalue())
+        self.assertEqual(list(JobApplication.objects.values_list("id", flat=True)), [canonical.id])
+        application.refresh_from_db()
+        resume.refresh_from_db()
+        self.assertEqual(application.job_id, canonical.id)
+        self.assertEqual(resume.job_application_id, canonical.id)
+
+    def test_dedupe_keeps_newest_resume_on_conflict(self):
+        canonical = make_job()
+        duplicate = self.make_duplicate(canonical)
+        Resume.objects.create(job_application=canonical, data={"summary": "old"})
+        Resume.objects.create(job_application=duplicate, data={"summary": "new"})
+
+        dedupe.dedupe()
+
+        self.assertEqual(Resume.objects.get().data, {"summary": "new"})
+        self.assertEqual(Resume.objects.get().job_application_id, canonical.id)
+
+    def test_dedupe_moves_resume_build_tasks(self):
+        canonical = make_job()
+        duplicate = self.make_duplicate(canonical)
+        task, _ = tasks.submit(duplicate)
+
+        dedupe.dedupe()
+
+        task.refresh_from_db()
+        self.assertEqual((task.job_application_id, task.status), (canonical.id, "queued"))
+
+    def test_oldest_copy_is_kept_when_a_newer_one_holds_the_fingerprint(self):
+        older = make_job(title="Placeholder")
+        newer = make_job(company="Shopify", title="Backend Developer")
+        application = Application.objects.create(job=newer)
+        JobApplication.objects.filter(pk=older.pk).update(company="Shopify", title="Backend Developer", fingerprint="stale")
+
+        call_command("dedupe_jobs", "--all", stdout=StringIO())
+
+        self.assertEqual(list(JobApplication.objects.values_list("id", "fingerprint")), [(older.id, newer.fingerprint)])
+        application.refresh_from_db()
+        self.assertEqual(application.job_id, older.id)
+
+    def test_dry_run_rolls_back(self):
+        canonical = make_job()
+        self.make_duplicate(canonical)
+        call_command("dedupe_jobs", "--dry-run", stdout=StringIO())
+        self.assertEqual(JobApplication.objects.count(), 2)
+
+
+class JobTagFilterTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.django_pg = make_job(title="Django + Postgres", tech_stack=["Django", "PostgreSQL"])
+        self.django = make_job(title="Django only", tech_stack=["django"])
+        self.react = make_job(title="React", tech_stack=["React", " postgresql "])
+
+    def titles(self, params):
+        response = self.client.get("/api/jobs/", params)
+        self.assertEqual(response.status_code, 200)
+        return sorted(job["title"] for job in response.json()["results"])
+
+    def test_tags_are_interned_and_normalized(self):
+        self.assertEqual(
+            sorted(Tag.objects.values_list("name", flat=True)),
+            ["django", "postgresql", "react"],
+        )
+
+    def test_all_and_any_semantics(self):
+        self.assertEqual(self.titles({"tags": "django,postgresql"}), ["Django + Postgres"])
+        self.assertEqual(
+            self.titles({"tags": "Django, React", "tags_match": "any"}),
+            ["Django + Postgres", "Django only", "React"],
+        )
+        self.assertEqual(self.titles({"tags": "django,cobol"}), [])
+
+    def test_tag_filter_combines_with_search(self):
+        self.assertEqual(self.titles({"tags": "postgresql", "q": "react"}), ["React"])
+
+    def test_invalid_match_mode(self):
+        response = self.client.get("/api/jobs/", {"tags": "django", "tags_match": "some"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_updates_resync_tags(self):
+        self.django.tech_stack = ["Rust"]
+        self.django.save()
+        self.assertEqual(self.titles({"tags": "django"}), ["Django + Postgres"])
+        self.assertEqual(self.titles({"tags": "rust"}), ["Django only"])
+
+    def test_backfill_command(self):
+        JobTag.objects.all().delete()
+        Tag.objects.create(name="unused")
+        call_command("backfill_job_tags", stdout=StringIO())
+        self.assertEqual(self.titles({"tags": "django"}), ["Django + Postgres", "Django only"])
+        self.assertFalse(Tag.objects.filter(name="unused").exists())
+
+
+class JobFacetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        today = datetime.date.today()
+        make_job(title="Python Dev", company="Shopify", location="Ottawa", tech_stack=["Python"],
+                 salary_min=60000, salary_max=80000, date=today)
+        make_job(title="Python SRE", company="Shopify", location="Toronto", tech_stack=["Python", "Go"],
+                 salary_max=160000, date=today - datetime.timedelta(days=20))
+        make_job(title="Python Intern", company="Amazon", location="Ottawa", tech_stack=["python"],
+                 date=today - datetime.timedelta(days=200))
+        make_job(title="Java Dev", company="Amazon", location="Vancouver", tech_stack=["Java"])
+
+    def facets(self, params):
+        response = self.client.get("/api/jobs/", {"facets": "1", **params})
+        self.assertEqual(response.status_code, 200)
+        facets = response.json()["facets"]
+        return {name: {row["value"]: row["count"] for row in rows} for name, rows in facets.items()}
+
+    def test_facets_cover_whole_filtered_result_set(self):
+        facets = self.facets({"q": "python", "limit": 1})
+        self.assertEqual(facets["company"], {"Shopify": 2, "Amazon": 1})
+        self.assertEqual(facets["location"], {"Ottawa": 2, "Toronto": 1})
+        self.assertEqual(facets["tags"], {"python": 3, "go": 1})
+        self.assertEqual(facets["salary"]["50k-75k"], 1)
+        self.assertEqual(facets["salary"]["150k+"], 1)
+        self.assertEqual(facets["posted"], {"24h": 1, "7d": 1, "30d": 2, "90d": 2})
+
+    def test_facets_respect_tag_filter(self):
+        self.assertEqual(self.facets({"tags": "go"})["company"], {"Shopify": 1})
+
+    def test_facets_are_cached_per_normalized_query(self):
+        self.facets({"q": "Python dev"})
+        # Same words in another order/case: page and facets both come from
+        # the cache, only the catalog version is read
+        with self.assertNumQueries(1):
+            self.facets({"q": "dev PYTHON"})
+
+    def test_facets_are_opt_in(self):
+        self.assertNotIn("facets", self.client.get("/api/jobs/").json())
+
+
+class JobSalaryTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        make_job(title="Range 60-80", salary_min=60000, salary_max=80000)
+        make_job(title="Min only 90", salary_min=90000)
+        make_job(title="Max only 55", salary_max=55000)
+        make_job(title="Range 120-150", salary_min=120000, salary_max=150000)
+        make_job(title="No salary")
+
+    def titles(self, params):
+        response = self.client.get("/api/jobs/", params)
+        self.assertEqual(response.status_code, 200)
+        return sorted(job["title"] for job in response.json()["results"])
+
+    def test_overlap_filtering(self):
+        self.assertEqual(
+            self.titles({"salary_min": 75000}),
+            ["Min only 90", "Range 120-150", "Range 60-80"],
+        )
+        self.assertEqual(self.titles({"salary_max": 60000}), ["Max only 55", "Range 60-80"])
+        self.assertEqual(
+            self.titles({"salary_min": 85000, "salary_max": 125000}),
+            ["Min only 90", "Range 120-150"],
+        )
+
+    def test_invalid_salary_params(self):
+        for params in ({"salary_min": "lots"}, {"salary_min": 10, "salary_max": 5}):
+            self.assertEqual(self.client.get("/api/jobs/", params).status_code, 400)
+
+    def test_salary_filter_uses_expression_index(self):
+        from .filters import filter_by_salary
+        plan = filter_by_salary(JobApplication.objects.all(), salary_min=75000).explain()
+        self.assertIn("job_salary_ceiling_idx", plan)
+
+    def test_histogram(self):
+        response = self.client.get("/api/jobs/salary-histogram/", {"bucket_size": 50000})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {
+            "bucket_size": 50000,
+            "buckets": [
+                {"min": 50000, "max": 100000, "count": 3},
+                {"min": 100000, "max": 150000, "count": 1},
+            ],
+        })
+
+    def test_histogram_respects_filters(self):
+        response = self.client.get("/api/jobs/salary-histogram/", {"q": "range", "salary_max": 100000})
+        self.assertEqual(response.json()["buckets"], [{"min": 60000, "max": 70000, "count": 1}])
+
+
+class JobSerializationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.job = make_job(
+            title="Backend Developer",
+            company="Shopify",
+            tech_stack=["Python"],
+            salary_min=90000,
+            salary_max=120000,
+            date=datetime.date(2026, 1, 17),
+        )
+        self.expected = {
+            "id": str(self.job.id),
+            "title": "Backend Developer",
+            "company": "Shopify",
+            "location": "Edmonton, AB",
+            "description": "",
+            "tags": ["Python"],
+            "salary": "$90,000 - $120,000",
+            "postedDate": "2026-01-17",
+        }
+
+    def test_list_and_detail_payloads_match(self):
+        self.assertEqual(self.client.get("/api/jobs/").json()["results"], [self.expected])
+        self.assertEqual(self.client.get(f"/api/jobs/{self.job.id}/").json(), self.expected)
+
+    def test_nested_payload_keeps_its_shape(self):
+        Application.objects.create(job=self.job)
+        Application.objects.create(job=make_job(title="Unknown"))
+        by_title = {app["job"]["title"]: app["job"] for app in self.client.get("/api/applications/").json()}
+        self.assertEqual(by_title["Backend Developer"], {
+            **self.expected,
+            "id": self.job.id,
+            "date": "2026-01-17",
+            "tech_stack": ["Python"],
+            "salary_min": 90000,
+            "salary_max": 120000,
+        })
+        unknown = by_title["Unknown"]
+        self.assertEqual(
+            {key: unknown[key] for key in ("date", "postedDate", "salary", "salary_min", "salary_max")},
+            dict.fromkeys(("date", "postedDate", "salary", "salary_min", "salary_max")),
+        )
+
+    def test_nested_jobs_are_read_as_rows(self):
+        application = Application.objects.create(job=self.job)
+        Application.objects.create(job=make_job(title="Unknown"))
+        # applications, one values() query for both jobs, responses of each application
+        with self.assertNumQueries(4):
+            listed = self.client.get("/api/applications/").json()
+        detail = self.client.get(f"/api/applications/{application.id}/").json()
+        self.assertEqual(detail["job"], next(app["job"] for app in listed if app["id"] == application.id))
+
+    def test_detail_not_found(self):
+        self.assertEqual(self.client.get("/api/jobs/999999/").status_code, 404)
+
+    def test_salary_formats(self):
+        from .serializers import format_salary
+        self.assertEqual(format_salary(90000, None), "$90,000+")
+        self.assertEqual(format_salary(None, 5000), "Up to $5,000")
+        self.assertEqual(format_salary(None, None), "")
+
+
+class JobConditionalGetTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.job = make_job(title="Backend Developer", company="Shopify")
+
+    def test_list_answers_if_none_match_with_304(self):
+        response = self.client.get("/api/jobs/", {"q": "backend"})
+        etag = response["ETag"]
+        # Only the catalog version is read; no search, no serialization
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/jobs/", {"q": "backend"}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+        self.assertEqual(response["ETag"], etag)
+
+    def test_detail_answers_if_none_match_with_304(self):
+        etag = self.client.get(f"/api/jobs/{self.job.id}/")["ETag"]
+        response = self.client.get(f"/api/jobs/{self.job.id}/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertNotIn("ETag", self.client.get("/api/jobs/999999/"))
+
+    def test_representations_get_distinct_etags(self):
+        json_etag = self.client.get("/api/jobs/")["ETag"]
+        ndjson_etag = self.client.get("/api/jobs/", {"format": "ndjson"})["ETag"]
+        self.assertNotEqual(json_etag, ndjson_etag)
+
+    def test_writes_change_the_etag(self):
+        etag = self.client.get(f"/api/jobs/{self.job.id}/")["ETag"]
+        self.job.title = "Senior Backend Developer"
+        self.job.save()
+        response = self.client.get(f"/api/jobs/{self.job.id}/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["title"], "Senior Backend Developer")
+
+        etag = self.client.get("/api/jobs/")["ETag"]
+        self.job.delete()
+        response = self.client.get("/api/jobs/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["results"], [])
+
+    def test_ingest_bumps_catalog_version(self):
+        version = catalog.current_version()
+        ingest.ingest([(1, {"company": "Amazon", "title": "SDE"})])
+        self.assertNotEqual(catalog.current_version(), version)
+
+
+class JobSearchCacheTests(TestCase):
+    def setUp(self):
+        search_cache.clear()
+        self.client = APIClient()
+        self.job = make_job(title="Python Developer", company="Shopify")
+
+    def search(self, **params):
+        response = self.client.get("/api/jobs/", params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_repeated_search_is_served_from_cache(self):
+        first = self.search(q="python developer")
+        with self.assertNumQueries(1):  # catalog version only
+            second = self.search(q="Developer  PYTHON")
+        self.assertEqual(first, second)
+        self.assertEqual(search_cache.stats(), {"hits": 1, "misses": 1, "hit_rate": 0.5})
+
+    def test_pages_are_cached_separately(self):
+        make_job(title="Python Engineer", company="Amazon")
+        first = self.search(q="python", limit=1)
+        second = self.search(q="python", limit=1, cursor=first["next_cursor"])
+        self.assertNotEqual(first["results"], second["results"])
+        self.assertEqual(search_cache.stats()["misses"], 2)
+
+    def test_writes_invalidate_cached_results(self):
+        self.assertEqual(len(self.search(q="python")["results"]), 1)
+        make_job(title="Python Engineer", company="Amazon")
+        self.assertEqual(len(self.search(q="python")["results"]), 2)
+        self.job.delete()
+        self.assertEqual(len(self.search(q="python")["results"]), 1)
+        self.assertEqual(search_cache.stats()["hits"], 0)
+
+    def test_invalid_cursor_is_not_cached(self):
+        for _ in range(2):
+            response = self.client.get("/api/jobs/", {"cursor": "garbage"})
+            self.assertEqual(response.status_code, 400)
+        self.assertEqual(search_cache.stats()["hits"], 0)
+
+    def test_stats_endpoint(self):
+        self.search(q="python")
+        self.search(q="python")
+        response = self.client.get("/api/jobs/search-cache/")
+        self.assertEqual(response.json(), {"hits": 1, "misses": 1, "hit_rate": 0.5})
+
+
+class JobSuggestTests(TestCase):
+    def setUp(self):
+        suggest.index.reset()
+        self.client = APIClient()
+        make_job(title="Backend Developer", company="Shopify", location="Ottawa, ON")
+        make_job(title="Backend Developer", company="Amazon", location="Toronto, ON")
+        make_job(title="Senior Backend Engineer", company="Shopify", location="Ottawa, ON")
+
+    def suggestions(self, prefix, **params):
+        response = self.client.get("/api/jobs/suggest/", {"prefix": prefix, **params})
+        self.assertEqual(response.status_code, 200)
+        return [(s["value"], s["type"], s["count"]) for s in response.json()["suggestions"]]
+
+    def test_completions_are_ranked_by_frequency(self):
+        self.assertEqual(self.suggestions("back"), [
+            ("Backend Developer", "title", 2),
+            ("Senior Backend Engineer", "title", 1),
+        ])
+        self.assertEqual(self.suggestions(" SHOP"), [("Shopify", "company", 2)])
+
+    def test_matches_any_word_start(self):
+        self.assertEqual(self.suggestions("on"), [
+            ("Ottawa, ON", "location", 2),
+            ("Toronto, ON", "location", 1),
+        ])
+        self.assertEqual(self.suggestions("eng"), [("Senior Backend Engineer", "title", 1)])
+
+    def test_limit_and_empty_prefix(self):
+        self.assertEqual(len(self.suggestions("b", limit=1)), 1)
+        self.assertEqual(self.suggestions(""), [])
+
+    def test_new_jobs_are_merged_incrementally(self):
+        self.suggestions("back")
+        built_at = suggest.index.built_at
+        make_job(title="Backend Intern", company="Wealthsimple")
+        suggest.index.checked_at = 0  # skip the refresh throttle
+        self.assertIn(("Backend Intern", "title", 1), self.suggestions("backend"))
+        self.assertEqual(suggest.index.built_at, built_at)
+
+    def test_short_prefixes_rerank_incrementally(self):
+        self.assertEqual(self.suggestions("b", limit=1), [("Backend Developer", "title", 2)])
+        for company in ("Amazon", "Google", "Wealthsimple"):
+            make_job(title="Backend Intern", company=company)
+        suggest.index.checked_at = 0
+        self.assertEqual(self.suggestions("b", limit=1), [("Backend Intern", "title", 3)])
+        self.assertEqual(self.suggestions("am"), [("Amazon", "company", 2)])
+
+    def test_deletes_trigger_a_rebuild(self):
+        self.suggestions("back")
+        JobApplication.objects.filter(company="Amazon").delete()
+        suggest.index.checked_at = 0
+        self.assertEqual(self.suggestions("toronto"), [])
+
+
+class JobFuzzySearchTests(TestCase):
+    def setUp(self):
+        fuzzy.index.reset()
+        search_cache.clear()
+        self.client = APIClient()
+        self.platform = make_job(
+            title="Platform Engineer",
+            company="Wealthsimple",
+            tech_stack=["Kubernetes", "Go"],
+        )
+        self.shopify = make_job(title="Backend Developer", company="Shopify", tech_stack=["Ruby"])
+        self.kotlin = make_job(title="Android Developer", company="Shopee", tech_stack=["Kotlin"])
+
+    def search_ids(self, query, **params):
+        response = self.client.get("/api/jobs/", {"q": query, "fuzzy": 1, **params})
+        self.assertEqual(response.status_code, 200)
+        return [job["id"] for job in response.json()["results"]]
+
+    def test_trigrams(self):
+        self.assertEqual(fuzzy.trigrams("go"), {"  g", " go", "go "})
+
+    def test_variants_are_ranked_by_similarity(self):
+        variants = fuzzy.index.variants("shopfy")
+        self.assertEqual([term for term, _ in variants], ["shopify", "shopee"])
+        self.assertGreater(variants[0][1], variants[1][1])
+        self.assertEqual(fuzzy.index.variants("shopify")[0], ("shopify", 1.0))
+
+    def test_misspelled_tag_and_company_match(self):
+        self.assertEqual(self.search_ids("kubernets"), [str(self.platform.id)])
+        self.assertEqual(self.search_ids("Wealthsimpl"), [str(self.platform.id)])
+        # Exact search finds nothing for the typo
+        self.assertEqual(self.client.get("/api/jobs/", {"q": "kubernets"}).json()["results"], [])
+
+    def test_closer_spelling_ranks_first(self):
+        self.assertEqual(self.search_ids("shopfy"), [str(self.shopify.id), str(self.kotlin.id)])
+
+    def test_every_word_must_match(self):
+        self.assertEqual(self.search_ids("shopfy developr"), [str(self.shopify.id), str(self.kotlin.id)])
+        self.assertEqual(self.search_ids("shopfy kotlni"), [str(self.kotlin.id)])
+        self.assertEqual(self.search_ids("shopfy zzzzzz"), [])
+
+    def test_pagination(self):
+        first = self.client.get("/api/jobs/", {"q": "shopfy", "fuzzy": 1, "limit": 1}).json()
+        self.assertEqual([job["id"] for job in first["results"]], [str(self.shopify.id)])
+        self.assertEqual(
+            self.search_ids("shopfy", limit=1, cursor=first["next_cursor"]),
+            [str(self.kotlin.id)],
+        )
+
+
+class JobRecommendationTests(TestCase):
+    def setUp(self):
+        recommend.matrix.reset()
+        self.client = APIClient()
+        self.user = User.objects.create(username="ada", email="ada@example.com")
+        self.profile = Profile.objects.create(
+            user=self.user,
+            programming_languages=["Python"],
+            frameworks=["Django"],
+        )
+        JobExperience.objects.create(profile=self.profile, company="Acme", title="Dev", skills=["PostgreSQL"])
+        self.client.force_authenticate(self.user)
+
+        self.django = make_job(title="Backend Developer", tech_stack=["Python", "Django", "PostgreSQL"])
+        self.flask = make_job(title="API Developer", tech_stack=["Python", "Flask", "Redis", "Docker"])
+        self.react = make_job(title="Frontend Developer", tech_stack=["React", "TypeScript"])
+        # Python is everywhere, so it is worth less than the rarer skills
+        for company in ("Amazon", "Google", "Shopify"):
+            make_job(title="Data Engineer", company=company, tech_stack=["Python", "Spark"])
+
+    def recommendations(self, **params):
+        response = self.client.get("/api/jobs/recommendations/", params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_jobs_are_ranked_by_skill_overlap(self):
+        data = self.recommendations()
+        self.assertEqual(data["results"][0]["id"], str(self.django.id))
+        self.assertEqual(data["results"][0]["matchedSkills"], ["django", "postgresql", "python"])
+        self.assertAlmostEqual(data["results"][0]["score"], 1.0, places=3)
+        self.assertNotIn(str(self.react.id), [job["id"] for job in data["results"]])
+
+    def test_rare_skills_outweigh_common_ones(self):
+        ranked = [job["id"] for job in self.recommendations()["results"]]
+        self.assertEqual(len(ranked), 5)
+        self.assertLess(ranked.index(str(self.django.id)), ranked.index(str(self.flask.id)))
+
+    def test_limit_and_applied_jobs(self):
+        self.assertEqual(len(self.recommendations(limit=2)["results"]), 2)
+        Application.objects.create(profile=self.profile, job=self.django)
+        ids = [job["id"] for job in self.recommendations()["results"]]
+        self.assertNotIn(str(self.django.id), ids)
+
+    def test_recommendations_are_stored_on_first_visit(self):
+        self.assertFalse(JobRecommendation.objects.filter(profile=self.profile).exists())
+        self.recommendations()
+        self.assertEqual(JobRecommendation.objects.filter(profile=self.profile).count(), 5)
+        with self.assertNumQueries(2):  # profile, page
+            self.recommendations()
+
+    def test_profile_without_matches_is_not_rescored(self):
+        self.profile.programming_languages = ["COBOL"]
+        self.profile.frameworks = []
+        self.profile.save()
+        self.profile.job_experiences.all().delete()
+        self.assertEqual(self.recommendations(), {"results": []})
+        self.profile.refresh_from_db()
+        self.assertIsNotNone(self.profile.recommendations_refreshed_at)
+        with self.assertNumQueries(2):  # profile, page
+            self.assertEqual(self.recommendations(), {"results": []})
+
+        # New postings are still merged in for it
+        result = ingest.ingest([(1, {"company": "Bank", "title": "COBOL Developer", "tech_stack": "COBOL"})])
+        self.assertEqual(result.recommendations_updated, 1)
+        self.assertIn(
+            str(JobApplication.objects.get(company="Bank").id),
+            [job["id"] for job in self.recommendations()["results"]],
+        )
+
+    def test_ingested_jobs_are_merged_into_stored_recommendations(self):
+        self.recommendations()
+        built_at = recommend.matrix.built_at
+        result = ingest.ingest([(1, {"company": "Stripe", "title": "Django Developer", "tech_stack": "Django, PostgreSQL"})])
+        job = JobApplication.objects.get(company="Stripe")
+        self.assertEqual(result.recommendations_updated, 1)
+        self.assertIn(str(job.id), [job["id"] for job in self.recommendations()["results"]])
+        self.assertEqual(recommend.matrix.built_at, built_at)
+
+    def test_redelivered_jobs_with_a_new_tech_stack_are_rescored(self):
+        self.recommendations()
+        self.assertFalse(JobRecommendation.objects.filter(job=self.react).exists())
+        result = ingest.ingest([(1, {"company": "Acme", "title": "Frontend Developer", "location": "Edmonton, AB",
+                                     "tech_stack": "React, Django, PostgreSQL"})])
+        self.assertEqual((result.created, result.updated, result.recommendations_updated), (0, 1, 1))
+        self.assertIn(str(self.react.id), [job["id"] for job in self.recommendations()["results"]])
+
+        # Dropping the matching skills removes the stored row again
+        ingest.ingest([(1, {"company": "Acme", "title": "Frontend Developer", "location": "Edmonton, AB",
+                            "tech_stack": "React"})])
+        self.assertFalse(JobRecommendation.objects.filter(job=self.react).exists())
+
+    def test_skill_changes_refresh_stored_recommendations(self):
+        self.recommendations()
+        response = self.client.put("/api/profile/", {"programmingLanguages": ["TypeScript"], "frameworks": ["React"]}, format="json")
+        self.assertEqual(response.status_code, 200)
+        # PostgreSQL is still listed under the Acme experience
+        stored = JobRecommendation.objects.filter(profile=self.profile).order_by("-score")
+        self.assertEqual(list(stored.values_list("job_id", flat=True)), [self.react.id, self.django.id])
+
+    def test_requires_authentication(self):
+        self.client.force_authenticate(None)
+        self.assertIn(self.client.get("/api/jobs/recommendations/").status_code, (401, 403))
+
+    def test_profile_without_skills(self):
+        self.profile.programming_languages = []
+        self.profile.frameworks = []
+        self.profile.save()
+        self.profile.job_experiences.all().delete()
+        self.assertEqual(self.recommendations(), {"results": []})
+
+
+class JobSimilarTests(TestCase):
+    BASE = (
+        "We are looking for a backend developer to design and build scalable REST APIs "
+        "with Python and Django, maintain PostgreSQL schemas, write automated tests and "
+        "review pull requests with a small product team in a fast paced environment"
+    )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.job = make_job(company="Shopify", description=self.BASE)
+        self.close = make_job(company="Stripe", description=self.BASE.replace("small product", "distributed platform"))
+        self.closer = make_job(company="Amazon", description=self.BASE + " with great benefits")
+        self.other = make_job(company="Bakery", description="Bake bread and pastries every morning and serve customers at the counter")
+
+    def similar(self, job_id, **params):
+        response = self.client.get(f"/api/jobs/{job_id}/similar/", params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()["results"]
+
+    def test_signature_estimates_jaccard(self):
+        self.assertIsNone(similar.signature("   "))
+        first, second = similar.signature(self.BASE), similar.signature(self.BASE.upper() + "!")
+        self.assertTrue((first == second).all())
+        words = self.BASE.split()
+        half = " ".join(words[: len(words) // 2])
+        estimate = (similar.signature(half) == first).mean()
+        self.assertAlmostEqual(estimate, 0.5, delta=0.15)
+
+    def test_similar_descriptions_are_ranked(self):
+        results = self.similar(self.job.id)
+        self.assertEqual([job["id"] for job in results], [str(self.closer.id), str(self.close.id)])
+        self.assertGreater(results[0]["similarity"], results[1]["similarity"])
+        self.assertEqual(self.similar(self.other.id), [])
+
+    def test_signature_follows_description_edits(self):
+        self.other.description = self.BASE
+        self.other.save()
+        self.assertIn(str(self.other.id), [job["id"] for job in self.similar(self.job.id)])
+        self.assertEqual(JobSignatureBand.objects.filter(job=self.other).count(), similar.BANDS)
+
+    def test_ingested_jobs_are_indexed(self):
+        ingest.ingest([(1, {"company": "Google", "title": "Backend Developer", "description": self.BASE})])
+        google = JobApplication.objects.get(company="Google")
+        self.assertIn(str(google.id), [job["id"] for job in self.similar(self.job.id, limit=5)])
+
+    def test_missing_job(self):
+        self.assertEqual(self.client.get("/api/jobs/999999/similar/").status_code, 404)
 
-# Create your tests here.
+    def test_backfill_command(self):
+        JobSignature.objects.all().delete()
+        self.assertEqual(self.similar(self.job.id), [])
+        call_command("backfill_job_signatures", stdout=StringIO())
+        self.assertEqual(len(self.similar(self.job.id)), 2)
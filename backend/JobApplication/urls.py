@@ -1,10 +1,28 @@
 from django.urls import path
-from .views import JobApplicationAPIView, JobDetailAPIView
+from .views import (
+    JobApplicationAPIView, JobDetailAPIView, JobSalaryHistogramAPIView, JobSearchCacheStatsAPIView,
+    JobRecommendationsAPIView, JobSimilarAPIView, JobSuggestAPIView,
+)
 
 urlpatterns = [
     # GET /api/jobs/?q=search_term - List/search jobs
     path("", JobApplicationAPIView.as_view(), name="job-list"),
     
+    # GET /api/jobs/salary-histogram/?bucket_size=10000 - Job counts per salary band
+    path("salary-histogram/", JobSalaryHistogramAPIView.as_view(), name="job-salary-histogram"),
+    
+    # GET /api/jobs/suggest/?prefix=pyth - Typeahead completions for titles, companies, locations
+    path("suggest/", JobSuggestAPIView.as_view(), name="job-suggest"),
+    
+    # GET /api/jobs/recommendations/?limit=20 - Jobs matching the signed-in user's skills
+    path("recommendations/", JobRecommendationsAPIView.as_view(), name="job-recommendations"),
+    
+    # GET /api/jobs/search-cache/ - Search result cache hit/miss counters
+    path("search-cache/", JobSearchCacheStatsAPIView.as_view(), name="job-search-cache"),
+    
     # GET /api/jobs/123/ - Get specific job details
     path("<int:job_id>/", JobDetailAPIView.as_view(), name="job-detail"),
+    
+    # GET /api/jobs/123/similar/?limit=10 - Postings with a near-similar description
+    path("<int:job_id>/similar/", JobSimilarAPIView.as_view(), name="job-similar"),
 ]
\ No newline at end of file
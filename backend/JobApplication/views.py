@@ -1,81 +1,231 @@
+import datetime
+import json
+
+from django.db.models import F
+from django.http import StreamingHttpResponse
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAuthenticated
+from rest_framework.settings import api_settings
+from applications.models import Application
+from config.http import not_modified
+from profiles.models import Profile
 from .models import JobApplication
-from django.db.models import Q
+from .renderers import NDJSONRenderer
+from .serializers import job_values, serialize_job_row, serialize_jobs
+from . import catalog, facets, fuzzy, pagination, recommend, search, search_cache, similar, suggest
+from .filters import filter_jobs, normalized_key, parse_flag, parse_int, InvalidFilter
+
+# Rows fetched per database round trip while streaming an export
+EXPORT_CHUNK_SIZE = 2000
+
+
+def search_jobs(params):
+    """Jobs matching ?q= (?fuzzy=1 for typo tolerance) and the structured filters in `params` (request.GET)"""
+    jobs = filter_jobs(JobApplication.objects.all(), params)
+    query = params.get('q', '')
+    if query and parse_flag(params, 'fuzzy'):
+        # Misspelled words resolved through the trigram index, annotated with fuzzy_score
+        jobs = fuzzy.fuzzy_search(jobs, query)
+    elif query:
+        # Full-text index lookup, annotated with the BM25 rank
+        jobs = search.search(jobs, query)
+    return jobs
+
 
 class JobApplicationAPIView(APIView):
     permission_classes = [AllowAny]  # Allow unauthenticated access for now
+    renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES + [NDJSONRenderer]
     
     def get(self, request):
         # Get query parameter for search
         query = request.GET.get('q', '')
+        fuzzy_mode = bool(query) and parse_flag(request.GET, 'fuzzy')
+        with_facets = parse_flag(request.GET, 'facets')
+        
+        # Unchanged catalog: answer from the client's copy before running the search.
+        # Facets bucket on "posted in the last N days", so they also change daily.
+        etag_parts = ['jobs', request.accepted_renderer.format]
+        if with_facets:
+            etag_parts.append(datetime.date.today().isoformat())
+        version = catalog.current_version()
+        etag = catalog.jobs_etag(version, *etag_parts)
+        response = not_modified(request, etag)
+        if response is not None:
+            return response
         
-        # Get all jobs or filter based on query
-        jobs = JobApplication.objects.all()
+        # Get all jobs or filter based on query and ?tags= / ?salary_min= ...
+        try:
+            jobs = search_jobs(request.GET)
+        except InvalidFilter as e:
+            return Response({'error': str(e)}, status=400)
         
-        if query:
-            jobs = jobs.filter(
-                Q(title__icontains=query) |
-                Q(company__icontains=query) |
-                Q(description__icontains=query) |
-                Q(location__icontains=query)
+        # ?format=ndjson streams every matching job instead of one page
+        if request.accepted_renderer.format == NDJSONRenderer.format:
+            response = self.stream_ndjson(jobs, query, fuzzy_mode)
+            response['ETag'] = etag
+            return response
+        
+        query_key = normalized_key(request.GET)
+        try:
+            limit = pagination.parse_limit(request.GET.get('limit'))
+            cursor = request.GET.get('cursor')
+            # Popular searches are served from the versioned result cache
+            response_data = search_cache.get_page(
+                query_key, cursor, limit, version,
+                lambda: self.get_page(jobs, query, fuzzy_mode, cursor, limit),
             )
+        except pagination.InvalidCursor as e:
+            return Response({'error': str(e)}, status=400)
+        
+        # ?facets=1 adds counts for the whole result set, not just this page
+        if with_facets:
+            response_data = dict(response_data, facets=facets.get_facets(jobs, query_key, version))
+        
+        return Response(response_data, headers={'ETag': etag})
+    
+    def get_page(self, jobs, query, fuzzy_mode, cursor, limit):
+        if fuzzy_mode:
+            # Closest spelling first
+            rows = job_values(jobs, 'fuzzy_score')
+            page, next_cursor = pagination.paginate(rows, 'fuzzy_score', cursor, limit, descending=True)
+        elif query:
+            # Best BM25 match first
+            rows = job_values(jobs, 'search_rank')
+            page, next_cursor = pagination.paginate(rows, 'search_rank', cursor, limit)
+        else:
+            # Newest postings first
+            rows = job_values(jobs, 'date')
+            page, next_cursor = pagination.paginate(rows, 'date', cursor, limit, descending=True)
         
         # Transform data to match frontend expectations
-        jobs_data = []
-        for job in jobs:
-            # Format salary
-            salary = ''
-            if job.salary_min and job.salary_max:
-                salary = f"${job.salary_min:,} - ${job.salary_max:,}"
-            elif job.salary_min:
-                salary = f"${job.salary_min:,}+"
-            elif job.salary_max:
-                salary = f"Up to ${job.salary_max:,}"
-            
-            jobs_data.append({
-                'id': str(job.id),
-                'title': job.title,
-                'company': job.company,
-                'location': job.location or '',
-                'description': job.description or '',
-                'tags': job.tech_stack if job.tech_stack else [],  # tech_stack -> tags
-                'salary': salary,
-                'postedDate': job.date.strftime('%Y-%m-%d') if job.date else '',
-            })
-        
-        return Response(jobs_data)
+        return {
+            'results': [serialize_job_row(row) for row in page],
+            'next_cursor': next_cursor,
+        }
+    
+    def stream_ndjson(self, jobs, query, fuzzy_mode):
+        """Stream the full result set one job per line with flat memory use"""
+        if fuzzy_mode:
+            jobs = jobs.order_by('-fuzzy_score', '-id')
+        elif query:
+            jobs = jobs.order_by('search_rank', 'id')
+        else:
+            jobs = jobs.order_by('id')
+        
+        lines = (
+            json.dumps(serialize_job_row(row)) + '\n'
+            for row in job_values(jobs).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+        )
+        return StreamingHttpResponse(lines, content_type=NDJSONRenderer.media_type)
+
+
+class JobSalaryHistogramAPIView(APIView):
+    permission_classes = [AllowAny]
+    
+    def get(self, request):
+        try:
+            bucket_size = parse_int(request.GET, 'bucket_size') or facets.DEFAULT_HISTOGRAM_BUCKET
+            bucket_size = max(bucket_size, facets.MIN_HISTOGRAM_BUCKET)
+            jobs = search_jobs(request.GET)
+        except InvalidFilter as e:
+            return Response({'error': str(e)}, status=400)
+        
+        return Response({
+            'bucket_size': bucket_size,
+            'buckets': facets.salary_histogram(jobs, bucket_size),
+        })
+
+
+class JobSuggestAPIView(APIView):
+    permission_classes = [AllowAny]
+    
+    def get(self, request):
+        # Completions for the search box, served from the in-memory index
+        try:
+            limit = parse_int(request.GET, 'limit') or suggest.DEFAULT_LIMIT
+        except InvalidFilter as e:
+            return Response({'error': str(e)}, status=400)
+        limit = min(limit, suggest.MAX_LIMIT)
+        
+        prefix = request.GET.get('prefix', '')
+        return Response({'suggestions': suggest.suggest(prefix, limit)})
+
+
+class JobRecommendationsAPIView(APIView):
+    permission_classes = [IsAuthenticated]
+    
+    def get(self, request):
+        try:
+            limit = parse_int(request.GET, 'limit') or recommend.DEFAULT_LIMIT
+        except InvalidFilter as e:
+            return Response({'error': str(e)}, status=400)
+        limit = min(limit, recommend.MAX_LIMIT)
+        
+        profile, _ = Profile.objects.get_or_create(user=request.user)
+        
+        # Precomputed top jobs, minus the ones already in the user's pipeline
+        applied = Application.objects.filter(profile=profile, job__isnull=False).values('job_id')
+        stored = recommend.stored_recommendations(profile).exclude(job_id__in=applied)[:limit]
+        rows = job_values(
+            JobApplication.objects.filter(recommendations__in=stored),
+            score=F('recommendations__score'),
+            matched_skills=F('recommendations__matched_skills'),
+        ).order_by('-score', '-id')
+        
+        results = [
+            dict(serialize_job_row(row), score=round(row['score'], 4), matchedSkills=row['matched_skills'])
+            for row in rows
+        ]
+        return Response({'results': results})
+
+
+class JobSearchCacheStatsAPIView(APIView):
+    permission_classes = [AllowAny]
+    
+    def get(self, request):
+        # Counters of the worker process that answers this request
+        return Response(search_cache.stats())
 
 
 class JobDetailAPIView(APIView):
     permission_classes = [AllowAny]
     
     def get(self, request, job_id):
-        try:
-            job = JobApplication.objects.get(id=job_id)
-            
-            # Format salary
-            salary = ''
-            if job.salary_min and job.salary_max:
-                salary = f"${job.salary_min:,} - ${job.salary_max:,}"
-            elif job.salary_min:
-                salary = f"${job.salary_min:,}+"
-            elif job.salary_max:
-                salary = f"Up to ${job.salary_max:,}"
-            
-            job_data = {
-                'id': str(job.id),
-                'title': job.title,
-                'company': job.company,
-                'location': job.location or '',
-                'description': job.description or '',
-                'tags': job.tech_stack if job.tech_stack else [],
-                'salary': salary,
-                'postedDate': job.date.strftime('%Y-%m-%d') if job.date else '',
-            }
-            
-            return Response(job_data)
-        except JobApplication.DoesNotExist:
+        etag = catalog.jobs_etag(catalog.current_version(), 'job', job_id)
+        response = not_modified(request, etag)
+        if response is not None:
+            return response
+        
+        jobs = serialize_jobs(JobApplication.objects.filter(id=job_id))
+        if not jobs:
             return Response({'error': 'Job not found'}, status=404)
+        return Response(jobs[0], headers={'ETag': etag})
 
+
+class JobSimilarAPIView(APIView):
+    permission_classes = [AllowAny]
+    
+    def get(self, request, job_id):
+        try:
+            limit = parse_int(request.GET, 'limit') or similar.DEFAULT_LIMIT
+        except InvalidFilter as e:
+            return Response({'error': str(e)}, status=400)
+        limit = min(limit, similar.MAX_LIMIT)
+        
+        etag = catalog.jobs_etag(catalog.current_version(), 'similar', job_id, limit)
+        response = not_modified(request, etag)
+        if response is not None:
+            return response
+        
+        if not JobApplication.objects.filter(id=job_id).exists():
+            return Response({'error': 'Job not found'}, status=404)
+        
+        # Candidates come from the LSH buckets shared with this posting's description
+        scores = dict(similar.similar_jobs(job_id, limit))
+        rows = job_values(JobApplication.objects.filter(id__in=scores))
+        results = sorted(
+            (dict(serialize_job_row(row), similarity=round(scores[row['id']], 4)) for row in rows),
+            key=lambda job: (-job['similarity'], -int(job['id'])),
+        )
+        return Response({'results': results}, headers={'ETag': etag})
@@ -1,6 +1,7 @@
+from django.db import models
 from rest_framework import serializers
 from .models import Application, ApplicationResponse
-from JobApplication.serializers import JobApplicationSerializer
+from JobApplication.serializers import JobApplicationSerializer, job_rows
 
 
 class ApplicationResponseSerializer(serializers.ModelSerializer):
@@ -16,14 +17,23 @@ class ApplicationResponseSerializer(serializers.ModelSerializer):
         ]
 
 
+class ApplicationListSerializer(serializers.ListSerializer):
+    def to_representation(self, data):
+        applications = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
+        # One values() query for the jobs of the whole list
+        self.context['job_rows'] = job_rows(application.job_id for application in applications)
+        return super().to_representation(applications)
+
+
 class ApplicationSerializer(serializers.ModelSerializer):
-    job = JobApplicationSerializer(read_only=True)
+    job = JobApplicationSerializer()  # read-only nested job
     responses = ApplicationResponseSerializer(many=True, read_only=True)
     job_id = serializers.IntegerField(write_only=True)  # Accept job_id for creation
     stage = serializers.ChoiceField(choices=['draft', 'applied', 'interview', 'offer', 'rejection', 'withdrawn'])
     
     class Meta:
         model = Application
+        list_serializer_class = ApplicationListSerializer
         fields = [
             "id",
             "job_id",  # For writing
@@ -31,7 +31,7 @@ class ApplicationViewSet(ModelViewSet):
     
     def get_queryset(self):
         """Show all applications"""
-        return Application.objects.all().select_related('job', 'profile')
+        return Application.objects.all().select_related('profile')  # jobs are read as values() rows
     
     def create(self, request, *args, **kwargs):
         """Override create to add logging"""
@@ -0,0 +1,11 @@
+"""HTTP helpers shared by the apps' views."""
+from django.utils.cache import get_conditional_response
+
+
+def not_modified(request, etag):
+    """304 (with no body) if the client's If-None-Match already holds `etag`, else None"""
+    response = get_conditional_response(request, etag=etag)
+    if response is not None and response.status_code == 304:
+        response['ETag'] = etag
+        return response
+    return None
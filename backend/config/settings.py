@@ -170,6 +170,51 @@ OPENROUTER_API_KEY = os.getenv('OPENROUTER_API_KEY')
 API_BASE_URL = os.getenv('API_BASE_URL', 'https://openrouter.ai/api/v1')
 MODEL_NAME = os.getenv('MODEL_NAME', 'deepseek/deepseek-r1')
 
+# Model responses are reused for identical requests (resumes/llm_cache.py):
+# entries expire after LLM_CACHE_TTL seconds, least recently used ones are
+# evicted past LLM_CACHE_MAX_ENTRIES
+LLM_CACHE_TTL = int(os.getenv('LLM_CACHE_TTL', 7 * 24 * 60 * 60))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv('LLM_CACHE_MAX_ENTRIES', 2000))
+
+# Shared model client (resumes/llm_client.py): requests in flight per process,
+# request starts per minute (the provider's rate limit, 0 for none), retries
+# on 429/5xx and the per-request timeout in seconds
+LLM_MAX_CONCURRENCY = int(os.getenv('LLM_MAX_CONCURRENCY', 8))
+LLM_REQUESTS_PER_MINUTE = int(os.getenv('LLM_REQUESTS_PER_MINUTE', 0))
+LLM_MAX_RETRIES = int(os.getenv('LLM_MAX_RETRIES', 3))
+LLM_TIMEOUT = int(os.getenv('LLM_TIMEOUT', 60))
+
+# Resume prompts (resumes/compaction.py): estimated tokens spent on the
+# profile's bullets and projects, and on the job description; the most
+# relevant items and sentences are kept (0 sends everything)
+RESUME_PROMPT_TOKEN_BUDGET = int(os.getenv('RESUME_PROMPT_TOKEN_BUDGET', 1500))
+RESUME_JOB_TOKEN_BUDGET = int(os.getenv('RESUME_JOB_TOKEN_BUDGET', 800))
+
+# Compiled resume PDFs are cached on disk by content (resumes/pdf_cache.py);
+# least recently used ones are deleted past RESUME_PDF_CACHE_MAX_BYTES
+RESUME_PDF_CACHE_DIR = os.getenv('RESUME_PDF_CACHE_DIR', str(BASE_DIR / 'pdf_cache'))
+RESUME_PDF_CACHE_MAX_BYTES = int(os.getenv('RESUME_PDF_CACHE_MAX_BYTES', 200 * 1024 * 1024))
+# pdflatex compiles run at most RESUME_PDF_COMPILE_WORKERS at a time per
+# process, RESUME_PDF_COMPILE_QUEUE more may wait; further downloads get a 503
+RESUME_PDF_COMPILE_WORKERS = int(os.getenv('RESUME_PDF_COMPILE_WORKERS', 2))
+RESUME_PDF_COMPILE_QUEUE = int(os.getenv('RESUME_PDF_COMPILE_QUEUE', 8))
+
+# Caches: 'default' holds facet counts, 'search' holds pages of job search
+# results (LRU culling past MAX_ENTRIES, entries expire after TIMEOUT seconds)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'search': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'job-search',
+        'TIMEOUT': int(os.getenv('SEARCH_CACHE_TIMEOUT', 300)),
+        'OPTIONS': {
+            'MAX_ENTRIES': int(os.getenv('SEARCH_CACHE_MAX_ENTRIES', 5000)),
+        },
+    },
+}
+
 
 # Re-enable APPEND_SLASH to handle missing trailing slashes
 APPEND_SLASH = True
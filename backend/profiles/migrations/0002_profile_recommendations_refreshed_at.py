@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-17 10:58
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def mark_stored_profiles(apps, schema_editor):
+    # Profiles that already have stored recommendations were refreshed before
+    Profile = apps.get_model("profiles", "Profile")
+    JobRecommendation = apps.get_model("JobApplication", "JobRecommendation")
+    Profile.objects.filter(
+        id__in=JobRecommendation.objects.values("profile_id"),
+    ).update(recommendations_refreshed_at=timezone.now())
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0001_initial'),
+        ('JobApplication', '0012_jobrecommendation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='recommendations_refreshed_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(mark_stored_profiles, migrations.RunPython.noop),
+    ]
@@ -22,6 +22,10 @@ class Profile(models.Model):
     frameworks = models.JSONField(default=list, blank=True)
     libraries = models.JSONField(default=list, blank=True)
 
+    # Last time JobApplication/recommend.py stored this profile's recommendations
+    # (possibly none); NULL until the first visit to the For You page
+    recommendations_refreshed_at = models.DateTimeField(null=True, blank=True, editable=False)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
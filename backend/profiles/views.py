@@ -6,6 +6,7 @@ from django.db import transaction
 from dateutil import parser # Recommended: pip install python-dateutil
 from .models import Profile, Education, JobExperience, Project
 from .serializers import ProfileSerializer
+from JobApplication import recommend
 
 class ProfileView(APIView):
     permission_classes = [IsAuthenticated]
@@ -39,6 +40,7 @@ class ProfileView(APIView):
 
                 # 2. Update Profile Tech Stack
                 profile, _ = Profile.objects.get_or_create(user=user)
+                skills_before = recommend.profile_skills(profile)
 
                 if 'programmingLanguages' in data:
                     profile.programming_languages = data['programmingLanguages']
@@ -95,6 +97,10 @@ class ProfileView(APIView):
                             github_link=proj.get('url', ''),
                         )
 
+            # Skills changed: recompute the stored For You recommendations
+            if recommend.profile_skills(profile) != skills_before:
+                recommend.refresh_profile(profile)
+
             # Return updated profile
             serializer = ProfileSerializer(profile)
             return Response(serializer.data, status=status.HTTP_200_OK)
@@ -122,6 +128,7 @@ class ProfileView(APIView):
             with transaction.atomic():
                 # Create Profile
                 profile, created = Profile.objects.get_or_create(user=user)
+                skills_before = recommend.profile_skills(profile)
 
                 if 'programmingLanguages' in data:
                     profile.programming_languages = data['programmingLanguages']
@@ -173,6 +180,10 @@ class ProfileView(APIView):
                             github_link=proj.get('url', ''),
                         )
 
+            # Skills changed: recompute the stored For You recommendations
+            if recommend.profile_skills(profile) != skills_before:
+                recommend.refresh_profile(profile)
+
             # Return created profile
             serializer = ProfileSerializer(profile)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
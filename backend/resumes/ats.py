@@ -0,0 +1,164 @@
+"""
+Local ATS keyword scoring.
+
+Keywords are extracted from the job description without calling the model:
+technologies are the posting's tech_stack plus every known tag (the Tag table
+of the jobs catalog) that appears in the text as a word or phrase, and the
+remaining keywords are the most frequent content words once stopwords and
+job-ad filler ("experience", "team", ...) are dropped. The resume matches a
+keyword when its text contains the same phrase (technologies) or the same
+word up to a plural or verb ending (other terms). Technologies weigh twice as
+much in the score.
+
+A scan is a handful of regex passes and one indexed Tag lookup, so it takes
+milliseconds; the model is only needed for prose feedback.
+"""
+import re
+from collections import Counter
+
+from JobApplication.models import Tag
+from JobApplication.tags import normalize_tags
+
+MAX_NGRAM = 3  # words in the longest tag looked up in a description
+MAX_TERMS = 15  # non-technical keywords taken from a description
+TECH_WEIGHT = 2.0
+TERM_WEIGHT = 1.0
+
+# Words, keeping "c++", "c#" and dotted names like "node.js" whole
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9+#]+)*")
+
+STOPWORDS = frozenset("""
+a about above across after again against all also am an and any are as at be because been before being
+below between both but by can could did do does doing down during each either etc every few for from
+further had has have having he her here hers him his how i if in into is it its itself just least less
+like may me might more most much must my no nor not now of off on once only or other our ours out over
+own per same shall she should so some such than that the their them then there these they this those
+through to too under until up upon us very via was we well were what when where which while who whom
+why will with within without would yet you your yours
+ability able apply applicant applicants benefits best candidate candidates company day days degree
+description end environment equal excellent experience experienced familiar familiarity full good great
+help ideal including job join looking new opportunity opportunities own plus position preferred
+qualifications related required requirements responsibilities role salary skill skills strong team
+teams time understanding using work working year years
+""".split())
+
+
+def tokenize(text):
+    return _TOKEN_RE.findall((text or "").lower())
+
+
+def stem(word):
+    """Crude suffix stripping, applied to both sides: 'deployed', 'deploying', 'deploys' -> 'deploy'."""
+    if len(word) > 5 and word.endswith("ing"):
+        return word[:-3]
+    if len(word) > 4 and word.endswith("ed"):
+        return word[:-2]
+    if len(word) > 4 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+def ngrams(tokens, max_words=MAX_NGRAM):
+    """Every run of up to `max_words` consecutive tokens, joined by spaces."""
+    return {
+        " ".join(tokens[start:start + size])
+        for size in range(1, max_words + 1)
+        for start in range(len(tokens) - size + 1)
+    }
+
+
+def extract_keywords(description, tech_stack=()):
+    """
+    (technologies, terms) of a job description, both in order of first
+    appearance with the posting's own tech_stack first.
+    """
+    tokens = tokenize(description)
+    positions = {}
+    for size in range(MAX_NGRAM, 0, -1):
+        for start in range(len(tokens) - size + 1):
+            positions.setdefault(" ".join(tokens[start:start + size]), start)
+
+    known = Tag.objects.filter(name__in=list(positions)).values_list("name", flat=True)
+    found = sorted(
+        (name for name in known if len(name) > 1 and name not in STOPWORDS),
+        key=lambda name: positions[name],
+    )
+    technologies = normalize_tags([*normalize_tags(tech_stack), *found])
+
+    covered = {stem(word) for name in technologies for word in name.split()}
+    counts = Counter()
+    first_seen = {}
+    for index, token in enumerate(tokens):
+        if len(token) < 3 or token in STOPWORDS or token.isdigit():
+            continue
+        root = stem(token)
+        if root in covered:
+            continue
+        counts[root] += 1
+        first_seen.setdefault(root, (index, token))
+
+    top = sorted(counts, key=lambda root: (-counts[root], first_seen[root][0]))[:MAX_TERMS]
+    terms = [first_seen[root][1] for root in sorted(top, key=lambda root: first_seen[root][0])]
+    return technologies, terms
+
+
+def resume_text(data):
+    """Every string in the resume JSON, one per line."""
+    if isinstance(data, dict):
+        return "\n".join(resume_text(value) for key, value in data.items() if key != "id")
+    if isinstance(data, list):
+        return "\n".join(resume_text(value) for value in data)
+    return data if isinstance(data, str) else ""
+
+
+def score_resume(resume_data, description, tech_stack=()):
+    """
+    {score (0-100), matched_keywords, missing_keywords, strengths,
+    improvements} for a stored Resume.data against a job description.
+    """
+    technologies, terms = extract_keywords(description, tech_stack)
+    tokens = tokenize(resume_text(resume_data))
+    longest = max((len(name.split()) for name in technologies), default=1)
+    phrases = ngrams(tokens, max(longest, 1))
+    stems = {stem(token) for token in tokens}
+
+    matched, missing = [], []
+    total = earned = 0.0
+    for name in technologies:
+        total += TECH_WEIGHT
+        if name in phrases:
+            earned += TECH_WEIGHT
+            matched.append(name)
+        else:
+            missing.append(name)
+    for term in terms:
+        total += TERM_WEIGHT
+        if stem(term) in stems:
+            earned += TERM_WEIGHT
+            matched.append(term)
+        else:
+            missing.append(term)
+
+    matched_tech = [name for name in technologies if name in matched]
+    missing_tech = [name for name in technologies if name in missing]
+    strengths, improvements = [], []
+    if matched_tech:
+        strengths.append(
+            f"Covers {len(matched_tech)} of the {len(technologies)} technologies in the posting: "
+            + ", ".join(matched_tech[:8])
+        )
+    if missing_tech:
+        improvements.append(
+            "Mention these technologies if you have used them: " + ", ".join(missing_tech[:8])
+        )
+    missing_terms = [term for term in terms if term in missing]
+    if missing_terms:
+        improvements.append("Echo the posting's wording: " + ", ".join(missing_terms[:8]))
+
+    return {
+        "score": round(100 * earned / total) if total else 0,
+        "matched_keywords": matched,
+        "missing_keywords": missing,
+        "strengths": strengths,
+        "improvements": improvements,
+    }
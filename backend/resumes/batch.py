@@ -0,0 +1,101 @@
+"""
+Tailored resumes for a whole shortlist of jobs in one request.
+
+The profile is serialized once and the model calls run concurrently on a
+bounded thread pool (no more threads than the shared model client has
+in-flight slots, LLM_MAX_CONCURRENCY). Request starts also go through the
+client's LLM_REQUESTS_PER_MINUTE limiter, so a large batch cannot exceed the
+provider's rate limit. A batch takes roughly as long as its slowest call
+instead of the sum of all of them.
+
+Only the model calls run on the pool: cache lookups, cache writes and the
+Resume rows stay on the calling thread, because SQLite rejects concurrent
+writers. Jobs with identical descriptions share one call, and each job
+succeeds or fails on its own.
+"""
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from JobApplication.models import JobApplication
+from resumes import llm_cache, llm_client
+from resumes.models import Resume
+from resumes.resume_generator import ResumeGeneratorService
+
+MAX_JOBS = 50  # jobs accepted per batch
+
+
+def _call(generator, prompt):
+    """(validated resume JSON text, seconds); runs on a pool thread."""
+    started = time.perf_counter()
+    generated = generator.complete(prompt)
+    return generated, time.perf_counter() - started
+
+
+def _error(job_id, message):
+    return {"jobId": str(job_id), "status": "error", "error": message}
+
+
+def build_resumes(job_ids, profile_data, refresh=False, max_workers=None):
+    """
+    Generate and store a tailored resume for each job id (deduplicated, in
+    order). Returns one result dict per job: {"jobId", "status": "ok" with
+    the "resume" and "seconds", or "error" with the "error"}.
+    """
+    job_ids = list(dict.fromkeys(job_ids))
+    jobs = JobApplication.objects.in_bulk(job_ids)
+    generator = ResumeGeneratorService()
+    results = {}
+    answers = {}  # cache key -> (resume JSON text, seconds)
+    pending = {}  # cache key -> (prompt, [jobs waiting for it])
+    for job_id in job_ids:
+        job = jobs.get(job_id)
+        if job is None:
+            results[job_id] = _error(job_id, f"Job {job_id} not found")
+            continue
+        if not job.description:
+            results[job_id] = _error(job_id, "Job has no description")
+            continue
+        prompt = generator.build_prompt(profile_data, job.description)
+        key = llm_cache.request_key(generator.model, prompt, generator.TEMPERATURE, generator.MAX_TOKENS)
+        if key in pending:
+            pending[key][1].append(job)
+            continue
+        cached = None if refresh else llm_cache.get(key)
+        if cached is not None:
+            answers[key] = (cached, 0.0)
+        pending[key] = (prompt, [job])
+
+    calls = {key: prompt for key, (prompt, _) in pending.items() if key not in answers}
+    if calls:
+        workers = min(max_workers or llm_client.client.max_concurrency, len(calls))
+        print(f"[BATCH] {len(calls)} model calls on {workers} threads ({len(answers)} cached)")
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="resume-batch") as pool:
+            futures = {pool.submit(_call, generator, prompt): key for key, prompt in calls.items()}
+            for future in as_completed(futures):
+                key = futures[future]
+                try:
+                    answers[key] = future.result()
+                except Exception as e:
+                    for job in pending[key][1]:
+                        print(f"[BATCH] Job {job.id} failed: {e}")
+                        results[job.id] = _error(job.id, str(e))
+                    continue
+                llm_cache.put(key, generator.model, answers[key][0])
+
+    for key, (generated, seconds) in answers.items():
+        for job in pending[key][1]:
+            try:
+                resume, _ = Resume.objects.update_or_create(job_application=job, defaults={'data': json.loads(generated)})
+            except Exception as e:
+                print(f"[BATCH] Job {job.id} could not be saved: {e}")
+                results[job.id] = _error(job.id, f"Failed to save resume: {e}")
+                continue
+            results[job.id] = {
+                "jobId": str(job.id),
+                "status": "ok",
+                "seconds": round(seconds, 2),
+                "resume": {"id": str(resume.id), "applicationId": str(job.id), **resume.data},
+            }
+
+    return [results[job_id] for job_id in job_ids]
@@ -0,0 +1,225 @@
+"""
+Token-budgeted resume prompts.
+
+Without a budget the prompt carries every experience, bullet and project of
+the profile plus the whole job description, so its size (and the model's
+latency and cost) grows with the profile. Before the prompt is written:
+
+- bullets (with their experience's header) and projects are ranked by how
+  many of the job's keywords they mention (resumes/ats.py: technologies
+  count twice, other terms once), and the best ones are kept until
+  RESUME_PROMPT_TOKEN_BUDGET is spent. Kept items stay in profile order.
+- single bullets and project descriptions longer than MAX_ITEM_TOKENS are cut
+  at a word boundary
+- sentences of the job description that are boilerplate (equal opportunity
+  statements, benefits, application instructions) and mention no keyword are
+  dropped, then the least relevant sentences go until the description fits
+  RESUME_JOB_TOKEN_BUDGET
+
+A budget of 0 turns that part off. Tokens are estimated at CHARS_PER_TOKEN
+characters each, close enough for English prose to budget with. stats()
+reports the prompt tokens saved by this process.
+"""
+import re
+import threading
+
+from django.conf import settings
+
+from resumes import ats
+
+CHARS_PER_TOKEN = 4
+MAX_ITEM_TOKENS = 120  # one bullet or project description
+
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9•*-])")
+_BOILERPLATE_RE = re.compile(
+    r"equal (employment )?opportunit|affirmative action|without regard to|regardless of"
+    r"|race, colou?r|sexual orientation|gender identity|national origin|veteran status|disabilit"
+    r"|reasonable accommodation|e-verify|background check|drug test"
+    r"|benefits|perks|401\s?\(?k\)?|paid time off|\bpto\b|parental leave|health,? dental|dental,? (and )?vision"
+    r"|salary range|pay range|compensation|stock options|equity package"
+    r"|how to apply|apply now|click apply|submit (your|a) (resume|application)|cover letter"
+    r"|recruit(ers|ing agencies)|third[- ]party|privacy (policy|notice)",
+    re.IGNORECASE,
+)
+
+_lock = threading.Lock()
+_stats = {"prompts": 0, "tokens_before": 0, "tokens_after": 0}
+
+
+def estimate_tokens(text):
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN if text else 0
+
+
+def clip(text, max_tokens=MAX_ITEM_TOKENS):
+    """`text` cut to about `max_tokens` at a word boundary."""
+    limit = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    cut = text[:limit].rsplit(" ", 1)[0].rstrip(" ,;:-")
+    return cut + "…"
+
+
+class KeywordMatcher:
+    """Relevance of a piece of text to a job description's keywords."""
+
+    def __init__(self, job_description):
+        self.technologies, terms = ats.extract_keywords(job_description)
+        self.term_stems = {ats.stem(term) for term in terms}
+        self.longest = max((len(name.split()) for name in self.technologies), default=1)
+
+    def score(self, text):
+        tokens = ats.tokenize(text)
+        if not tokens:
+            return 0.0
+        phrases = ats.ngrams(tokens, self.longest)
+        stems = {ats.stem(token) for token in tokens}
+        technologies = sum(1 for name in self.technologies if name in phrases)
+        return ats.TECH_WEIGHT * technologies + ats.TERM_WEIGHT * len(self.term_stems & stems)
+
+
+def _bullets(experience):
+    description = experience.get("description") or []
+    if isinstance(description, str):
+        description = [line.strip() for line in description.split("\n") if line.strip()]
+    return description
+
+
+def _header(experience):
+    return f"{experience.get('position', '')} at {experience.get('company', '')} ({experience.get('startDate', '')} - {experience.get('endDate', '')})"
+
+
+def _project_text(project):
+    return " ".join([project.get("name", ""), " ".join(project.get("technologies") or []), project.get("description", "")])
+
+
+def profile_tokens(profile_data):
+    """Estimated tokens of the experiences and projects of `profile_data`, counted the way select_items budgets them."""
+    tokens = 0
+    for exp in profile_data.get("experience") or []:
+        tokens += estimate_tokens(_header(exp)) + sum(estimate_tokens(bullet) for bullet in _bullets(exp))
+    for proj in profile_data.get("projects") or []:
+        tokens += estimate_tokens(_project_text(proj))
+    return tokens
+
+
+def select_items(profile_data, matcher, budget):
+    """
+    A copy of `profile_data` with only the most relevant bullets and projects
+    that fit in `budget` tokens, each clipped to MAX_ITEM_TOKENS. Returns
+    (profile data, items offered, items kept).
+    """
+    experiences = [dict(exp, description=[clip(bullet) for bullet in _bullets(exp)]) for exp in profile_data.get("experience") or []]
+    projects = [dict(proj, description=clip(proj.get("description") or "")) for proj in profile_data.get("projects") or []]
+
+    # (score, experience score, order, cost, kind, index, position): `index` is
+    # the experience or project, `position` the bullet within the experience
+    units = []
+    order = 0
+    for index, exp in enumerate(experiences):
+        header_score = matcher.score(exp.get("position", ""))
+        bullets = exp["description"] or [None]  # an experience without bullets competes with its header alone
+        scores = [matcher.score(bullet) + header_score if bullet else header_score for bullet in bullets]
+        for position, (bullet, score) in enumerate(zip(bullets, scores)):
+            units.append((score, max(scores), order, estimate_tokens(bullet or ""), "bullet", index, position))
+            order += 1
+    for index, proj in enumerate(projects):
+        score = matcher.score(_project_text(proj))
+        units.append((score, score, order, estimate_tokens(_project_text(proj)), "project", index, None))
+        order += 1
+
+    kept_bullets = {}  # experience index -> positions of its kept bullets
+    kept_projects = set()
+    used = 0
+    kept = 0
+    for score, _, _, cost, kind, index, position in sorted(units, key=lambda unit: (-unit[0], -unit[1], unit[2])):
+        if kind == "bullet" and index not in kept_bullets:
+            cost += estimate_tokens(_header(experiences[index]))
+        if used + cost > budget:
+            continue
+        used += cost
+        kept += 1
+        if kind == "bullet":
+            kept_bullets.setdefault(index, set()).add(position)
+        else:
+            kept_projects.add(index)
+
+    compacted = dict(profile_data)
+    compacted["experience"] = [
+        # Original bullet order within each experience
+        dict(exp, description=[bullet for position, bullet in enumerate(exp["description"]) if position in kept_bullets[index]])
+        for index, exp in enumerate(experiences) if index in kept_bullets
+    ]
+    compacted["projects"] = [proj for index, proj in enumerate(projects) if index in kept_projects]
+    return compacted, len(units), kept
+
+
+def trim_description(job_description, matcher, budget):
+    """The job description without keyword-free boilerplate, cut to `budget` tokens by relevance."""
+    # (line, sentence) pairs, so kept sentences can be put back on their lines
+    sentences = [
+        (line_number, sentence)
+        for line_number, line in enumerate(job_description.splitlines())
+        for sentence in _SENTENCE_RE.split(line.strip()) if sentence
+    ]
+    scored = []
+    for position, (line_number, sentence) in enumerate(sentences):
+        score = matcher.score(sentence)
+        if score == 0 and _BOILERPLATE_RE.search(sentence):
+            continue
+        scored.append((score, position, line_number, sentence))
+
+    total = sum(estimate_tokens(sentence) + 1 for _, _, _, sentence in scored)
+    # Least relevant (then latest) sentences go first
+    for score, position, line_number, sentence in sorted(scored, key=lambda item: (item[0], -item[1])):
+        if total <= budget:
+            break
+        scored.remove((score, position, line_number, sentence))
+        total -= estimate_tokens(sentence) + 1
+
+    lines = {}
+    for _, position, line_number, sentence in sorted(scored, key=lambda item: item[1]):
+        lines.setdefault(line_number, []).append(sentence)
+    trimmed = "\n".join(" ".join(parts) for parts in lines.values())
+    return trimmed or clip(job_description, budget)
+
+
+def compact(profile_data, job_description):
+    """
+    (profile data, job description) reduced to the configured token budgets,
+    a short report of what was dropped and the estimated tokens saved.
+    """
+    profile_budget = settings.RESUME_PROMPT_TOKEN_BUDGET
+    job_budget = settings.RESUME_JOB_TOKEN_BUDGET
+    if not profile_budget and not job_budget:
+        return profile_data, job_description, "compaction off", 0
+
+    matcher = KeywordMatcher(job_description)
+    report = []
+    saved = 0
+    if profile_budget:
+        compacted, offered, kept = select_items(profile_data, matcher, profile_budget)
+        saved += profile_tokens(profile_data) - profile_tokens(compacted)
+        report.append(f"kept {kept}/{offered} bullets and projects")
+        profile_data = compacted
+    if job_budget:
+        trimmed = trim_description(job_description, matcher, job_budget)
+        before, after = estimate_tokens(job_description), estimate_tokens(trimmed)
+        saved += before - after
+        report.append(f"job description {before} -> {after} tokens")
+        job_description = trimmed
+    return profile_data, job_description, ", ".join(report), saved
+
+
+def record(tokens_before, tokens_after):
+    with _lock:
+        _stats["prompts"] += 1
+        _stats["tokens_before"] += tokens_before
+        _stats["tokens_after"] += tokens_after
+
+
+def stats():
+    with _lock:
+        stats = dict(_stats)
+    stats["tokens_saved"] = stats["tokens_before"] - stats["tokens_after"]
+    stats["saved_ratio"] = round(stats["tokens_saved"] / stats["tokens_before"], 3) if stats["tokens_before"] else None
+    return stats
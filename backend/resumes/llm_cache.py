@@ -0,0 +1,75 @@
+"""
+Content-addressed cache of model responses.
+
+A call is identified by the SHA-256 of (model, prompt, temperature,
+max_tokens): byte-identical requests, such as rebuilding a resume from an
+unchanged profile and job description, are answered from the LLMResponse
+table instead of the API. Only responses that passed the caller's validation
+are stored, so a malformed answer is never replayed.
+
+Entries expire LLM_CACHE_TTL seconds after they were written, and the least
+recently used ones are evicted once the table holds more than
+LLM_CACHE_MAX_ENTRIES. Callers pass refresh=True (?refresh=1 on the
+endpoints) to skip the lookup and overwrite the entry with a fresh answer.
+"""
+import hashlib
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import F
+from django.utils import timezone
+
+from resumes.models import LLMResponse
+
+
+def request_key(model, prompt, temperature, max_tokens):
+    raw = json.dumps([model, prompt, temperature, max_tokens], ensure_ascii=False)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def get(key):
+    """The cached response for `key`, or None when missing or expired."""
+    entry = LLMResponse.objects.filter(key=key).values_list("id", "response", "created_at").first()
+    if entry is None:
+        return None
+    entry_id, response, created_at = entry
+    now = timezone.now()
+    if created_at < now - timedelta(seconds=settings.LLM_CACHE_TTL):
+        LLMResponse.objects.filter(id=entry_id).delete()
+        return None
+    LLMResponse.objects.filter(id=entry_id).update(last_used_at=now, hits=F("hits") + 1)
+    return response
+
+
+def put(key, model, response):
+    now = timezone.now()
+    LLMResponse.objects.update_or_create(
+        key=key,
+        defaults={"model": model, "response": response, "created_at": now, "last_used_at": now, "hits": 0},
+    )
+    evict()
+
+
+def evict():
+    """Drop expired entries, then the least recently used ones beyond LLM_CACHE_MAX_ENTRIES."""
+    cutoff = timezone.now() - timedelta(seconds=settings.LLM_CACHE_TTL)
+    LLMResponse.objects.filter(created_at__lt=cutoff).delete()
+    keep = LLMResponse.objects.order_by("-last_used_at", "-id").values("id")[:settings.LLM_CACHE_MAX_ENTRIES]
+    LLMResponse.objects.exclude(id__in=keep).delete()
+
+
+def get_or_call(model, prompt, temperature, max_tokens, call, refresh=False):
+    """
+    The cached response for this request, or `call()`'s result, which is then
+    cached. Exceptions from `call` are not cached. Returns (response, cached).
+    """
+    key = request_key(model, prompt, temperature, max_tokens)
+    if not refresh:
+        response = get(key)
+        if response is not None:
+            return response, True
+
+    response = call()
+    put(key, model, response)
+    return response, False
@@ -0,0 +1,211 @@
+"""
+Process-wide client for the OpenAI-compatible chat completions API (OpenRouter).
+
+Every model call of the app (resume generation, streamed builds, ATS scans)
+goes through the shared `client`:
+
+- one pooled requests.Session, so connections are kept alive and reused
+  instead of paying a TLS handshake per call
+- at most LLM_MAX_CONCURRENCY requests in flight per process; extra callers
+  wait for a slot instead of piling onto the provider
+- request starts spaced to stay under LLM_REQUESTS_PER_MINUTE (the
+  provider's rate limit; 0 disables the limit)
+- 429 and 5xx answers, timeouts and dropped connections are retried up to
+  LLM_MAX_RETRIES times with jittered exponential backoff (or the
+  provider's Retry-After), so a rate-limit burst does not turn into a
+  synchronized retry storm
+- every call's duration and attempt count are logged and added to stats()
+
+Errors surface as requests exceptions once retries are exhausted.
+"""
+import json
+import random
+import threading
+import time
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+BACKOFF_BASE = 1.0  # seconds before the first retry, doubled for every further one
+BACKOFF_CAP = 20.0  # seconds
+
+
+def strip_code_fences(text):
+    """Remove the markdown code fences models like to wrap JSON in."""
+    text = text.strip()
+    if text.startswith("```json"):
+        text = text[7:]
+    if text.startswith("```"):
+        text = text[3:]
+    if text.endswith("```"):
+        text = text[:-3]
+    return text.strip()
+
+
+class RateLimiter:
+    """Spaces request starts at least 60 / per_minute seconds apart (0: no limit)."""
+
+    def __init__(self, per_minute):
+        self.interval = 60.0 / per_minute if per_minute else 0.0
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next)
+            self._next = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+
+class LLMClient:
+    def __init__(self, max_concurrency, max_retries, timeout, requests_per_minute=0):
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self._rate = RateLimiter(requests_per_minute)
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_concurrency)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+        self._lock = threading.Lock()
+        self._stats = {"calls": 0, "retries": 0, "failures": 0, "seconds": 0.0}
+
+    def _headers(self, title):
+        return {
+            "Authorization": f"Bearer {settings.OPENROUTER_API_KEY}",
+            "Content-Type": "application/json",
+            "HTTP-Referer": "http://localhost:8000",
+            "X-Title": title,
+        }
+
+    def _payload(self, prompt, max_tokens, temperature, stream):
+        payload = {
+            "model": settings.MODEL_NAME,
+            "messages": [{"role": "user", "content": prompt}],
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+        }
+        if stream:
+            payload["stream"] = True
+        return payload
+
+    def _backoff(self, attempt, response=None):
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), BACKOFF_CAP)
+        # "Full jitter": concurrent callers spread out instead of retrying in lockstep
+        return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+    def _post(self, payload, title, tally, stream=False):
+        """POST with retries on 429/5xx and network errors, counting attempts in `tally`."""
+        attempt = 0
+        while True:
+            response = None
+            tally["attempts"] = attempt + 1
+            self._rate.wait()
+            try:
+                response = self._session.post(
+                    f"{settings.API_BASE_URL}/chat/completions",
+                    headers=self._headers(title),
+                    json=payload,
+                    timeout=self.timeout,
+                    stream=stream,
+                )
+                if response.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                    response.raise_for_status()
+                    return response
+                response.close()
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                if attempt >= self.max_retries:
+                    raise
+            delay = self._backoff(attempt, response)
+            print(f"[LLM] Attempt {attempt + 1} failed ({response.status_code if response is not None else 'network error'}), retrying in {delay:.1f}s")
+            with self._lock:
+                self._stats["retries"] += 1
+            time.sleep(delay)
+            attempt += 1
+
+    def _record(self, title, started, attempts, failed):
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self._stats["calls"] += 1
+            self._stats["seconds"] += elapsed
+            if failed:
+                self._stats["failures"] += 1
+        print(f"[LLM] {title}: {'failed' if failed else 'done'} in {elapsed:.2f}s ({attempts} attempt{'s' if attempts != 1 else ''})")
+
+    def complete(self, prompt, max_tokens, temperature, title="Job Application Organizer"):
+        """The model's answer to `prompt`, code fences stripped."""
+        started = time.perf_counter()
+        tally, failed = {"attempts": 0}, True
+        with self._slots:
+            try:
+                response = self._post(self._payload(prompt, max_tokens, temperature, False), title, tally)
+                data = response.json()
+                if not data.get("choices"):
+                    raise ValueError("No response generated from API")
+                content = (data["choices"][0].get("message") or {}).get("content")
+                if not isinstance(content, str):
+                    # e.g. a refusal or a tool-only answer
+                    raise ValueError(f"Unexpected API response format: message content is {type(content).__name__}")
+                content = strip_code_fences(content)
+                failed = False
+                return content
+            finally:
+                self._record(title, started, tally["attempts"], failed)
+
+    def stream(self, prompt, max_tokens, temperature, title="Job Application Organizer"):
+        """
+        Yield the content deltas of a streamed completion. A slot is held until
+        the stream is exhausted or the generator is closed (a client that
+        disconnects), which also closes the upstream response.
+        """
+        started = time.perf_counter()
+        tally, failed = {"attempts": 0}, True
+        response = None
+        self._slots.acquire()
+        try:
+            response = self._post(self._payload(prompt, max_tokens, temperature, True), title, tally, stream=True)
+            for line in response.iter_lines(decode_unicode=True):
+                # Blank keep-alives and ": PROCESSING" comments carry no data
+                if not line or not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    break
+                event = json.loads(data)
+                if "error" in event:
+                    raise ValueError(f"API stream failed: {event['error']}")
+                choices = event.get("choices") or [{}]
+                content = (choices[0].get("delta") or {}).get("content")
+                if content:
+                    yield content
+            failed = False
+        finally:
+            if response is not None:
+                response.close()
+            self._slots.release()
+            self._record(title, started, tally["attempts"], failed)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        stats["seconds"] = round(stats["seconds"], 3)
+        stats["average_seconds"] = round(stats["seconds"] / stats["calls"], 3) if stats["calls"] else None
+        return stats
+
+
+# One client (and connection pool) per process
+client = LLMClient(
+    max_concurrency=settings.LLM_MAX_CONCURRENCY,
+    max_retries=settings.LLM_MAX_RETRIES,
+    timeout=settings.LLM_TIMEOUT,
+    requests_per_minute=settings.LLM_REQUESTS_PER_MINUTE,
+)
@@ -0,0 +1,49 @@
+import os
+import socket
+import threading
+import time
+
+from django.core.management.base import BaseCommand
+
+from resumes import tasks
+
+
+class Command(BaseCommand):
+    help = "Run a pool of worker threads executing queued resume builds (POST .../resume/build/?async=1)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Builds run concurrently (default: 4)",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=tasks.POLL_INTERVAL,
+            help=f"Seconds an idle worker waits between queue checks (default: {tasks.POLL_INTERVAL})",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once the queue is empty instead of waiting for new tasks",
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        requeued = tasks.requeue_stale()
+        if requeued:
+            self.stdout.write(f"Requeued {requeued} stale tasks")
+
+        prefix = f"{socket.gethostname()}:{os.getpid()}"
+        self.stdout.write(f"Starting {options['workers']} resume build workers ({prefix})")
+        executed = tasks.run_pool(
+            options["workers"],
+            prefix,
+            threading.Event(),
+            poll_interval=options["poll_interval"],
+            once=options["once"],
+        )
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f"Executed {executed} resume builds in {elapsed:.2f}s"))
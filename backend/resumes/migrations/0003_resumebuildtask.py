@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-17 10:35
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('JobApplication', '0013_jobsignature'),
+        ('resumes', '0002_llmresponse'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumeBuildTask',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('succeeded', 'Succeeded'), ('failed', 'Failed')], default='queued', max_length=20)),
+                ('refresh', models.BooleanField(default=False)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('error', models.TextField(blank=True)),
+                ('worker', models.CharField(blank=True, max_length=100)),
+                ('available_at', models.DateTimeField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('job_application', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='resume_build_tasks', to='JobApplication.jobapplication')),
+                ('resume', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='build_tasks', to='resumes.resume')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'available_at'], name='resumetask_status_avail_idx')],
+            },
+        ),
+    ]
@@ -15,4 +15,53 @@ class Resume(models.Model):
         ordering = ['-updated_at']
 
     def __str__(self):
-        return f"Resume for {self.job_application.job.title}"
\ No newline at end of file
+        return f"Resume for {self.job_application.job.title}"
+
+
+class LLMResponse(models.Model):
+    """Model output cached under the hash of the request that produced it (see llm_cache.py)."""
+    key = models.CharField(max_length=64, unique=True)
+    model = models.CharField(max_length=200)
+    response = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(db_index=True)
+    hits = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.model} response {self.key[:12]}"
+
+
+
+class ResumeBuildTask(models.Model):
+    """A queued resume build, executed by `manage.py run_resume_workers` (see tasks.py)."""
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    SUCCEEDED = 'succeeded'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (QUEUED, 'Queued'),
+        (RUNNING, 'Running'),
+        (SUCCEEDED, 'Succeeded'),
+        (FAILED, 'Failed'),
+    ]
+
+    job_application = models.ForeignKey(JobApplication, on_delete=models.CASCADE, related_name='resume_build_tasks')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default=QUEUED)
+    refresh = models.BooleanField(default=False)  # skip the model response cache
+    attempts = models.PositiveSmallIntegerField(default=0)
+    error = models.TextField(blank=True)
+    resume = models.ForeignKey(Resume, null=True, blank=True, on_delete=models.SET_NULL, related_name='build_tasks')
+    worker = models.CharField(max_length=100, blank=True)
+    available_at = models.DateTimeField()  # not picked up before this (retry backoff)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # Workers claim the oldest runnable task
+            models.Index(fields=['status', 'available_at'], name='resumetask_status_avail_idx'),
+        ]
+
+    def __str__(self):
+        return f"Build of job {self.job_application_id} ({self.status})"
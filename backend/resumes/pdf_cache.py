@@ -0,0 +1,217 @@
+"""
+Compiled resume PDFs, cached on disk by content.
+
+A PDF is stored as RESUME_PDF_CACHE_DIR/<sha256>.pdf, where the hash covers
+the rendered .tex source and TEMPLATE_VERSION. A download whose LaTeX did
+not change since the last one (the usual case: Resume.data only changes on a
+rebuild or an edit) is a file read instead of two pdflatex runs, and an edit
+simply produces a new key, so nothing has to be invalidated.
+
+Every hit refreshes the file's mtime; once the directory grows past
+RESUME_PDF_CACHE_MAX_BYTES the least recently used PDFs are deleted. Files
+are written under a temporary name and renamed into place, so concurrent
+compiles of the same resume and readers never see a partial PDF.
+
+Misses are compiled on `pool`, at most RESUME_PDF_COMPILE_WORKERS at a time
+per process, so a burst of downloads cannot fork dozens of TeX processes.
+Up to RESUME_PDF_COMPILE_QUEUE more compiles wait for a worker; beyond that
+open_pdf raises Saturated (503 with Retry-After from the view). Requests for
+a PDF that is already being compiled wait for that compile instead of
+starting another one.
+"""
+import hashlib
+import math
+import os
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from django.conf import settings
+
+# Bump when the compile step changes in a way the .tex source does not show
+# (pdflatex flags, number of passes), so stale PDFs are not served
+TEMPLATE_VERSION = 1
+PDFLATEX_TIMEOUT = 30  # seconds per pdflatex run
+
+
+class CompileError(Exception):
+    """pdflatex failed or produced no PDF; `details` holds its output."""
+
+    def __init__(self, message, details=""):
+        super().__init__(message)
+        self.details = details
+
+
+class Saturated(Exception):
+    """The compile pool and its queue are full; try again after `retry_after` seconds."""
+
+    def __init__(self, retry_after):
+        super().__init__(f"PDF compiler busy, retry in {retry_after}s")
+        self.retry_after = retry_after
+
+
+def cache_key(latex_content):
+    raw = f"{TEMPLATE_VERSION}\n{latex_content}"
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def _cache_dir():
+    path = Path(settings.RESUME_PDF_CACHE_DIR)
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def compile_pdf(latex_content):
+    """The PDF bytes for `latex_content` (pdflatex twice, for references)."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        (Path(tmpdir) / "resume.tex").write_text(latex_content)
+        for _ in range(2):
+            result = subprocess.run(
+                ["pdflatex", "-interaction=nonstopmode", "resume.tex"],
+                cwd=tmpdir,
+                capture_output=True,
+                timeout=PDFLATEX_TIMEOUT,
+            )
+            if result.returncode != 0:
+                raise CompileError("LaTeX compilation failed", result.stderr.decode() or result.stdout.decode()[-2000:])
+        pdf_file = Path(tmpdir) / "resume.pdf"
+        if not pdf_file.exists():
+            raise CompileError("PDF file not generated")
+        return pdf_file.read_bytes()
+
+
+def open_pdf(latex_content):
+    """
+    An open binary file with the PDF for `latex_content`, compiled only on a
+    cache miss. Returns (file, key, cached).
+    """
+    key = cache_key(latex_content)
+    path = _cache_dir() / f"{key}.pdf"
+    try:
+        # Touched before opening, so a failure here cannot leak the handle
+        os.utime(path)  # most recently used
+        return open(path, "rb"), key, True
+    except FileNotFoundError:
+        pass
+
+    content = pool.compile(key, latex_content)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+    pdf = open(path, "rb")  # stays readable even if evicted right away
+    evict(keep=path)
+    return pdf, key, False
+
+
+def evict(keep=None):
+    """Delete the least recently used PDFs until the cache fits RESUME_PDF_CACHE_MAX_BYTES. Returns how many."""
+    entries = []
+    for path in _cache_dir().glob("*.pdf"):
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue  # evicted by another process meanwhile
+        entries.append((stat.st_mtime, stat.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+        if total <= settings.RESUME_PDF_CACHE_MAX_BYTES:
+            break
+        if path == keep:
+            continue
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+        total -= size
+        removed += 1
+    return removed
+
+
+class CompilePool:
+    """At most `workers` pdflatex compiles at a time, with `queue_size` more waiting."""
+
+    def __init__(self, workers, queue_size):
+        self.workers = workers
+        self.queue_size = queue_size
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pdflatex")
+        self._lock = threading.Lock()
+        self._inflight = {}  # cache key -> future of the compile producing it
+        self._queued = 0
+        self._running = 0
+        self._stats = {
+            "compiled": 0,
+            "failed": 0,
+            "rejected": 0,
+            "shared": 0,
+            "compile_seconds": 0.0,
+            "max_compile_seconds": 0.0,
+            "wait_seconds": 0.0,
+        }
+
+    def compile(self, key, latex_content):
+        """The PDF bytes for `latex_content`; raises Saturated when the queue is full."""
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                self._stats["shared"] += 1
+            else:
+                if self._queued + self._running >= self.workers + self.queue_size:
+                    self._stats["rejected"] += 1
+                    raise Saturated(self._retry_after())
+                self._queued += 1
+                future = self._executor.submit(self._run, key, latex_content, time.perf_counter())
+                self._inflight[key] = future
+        return future.result()
+
+    def _run(self, key, latex_content, submitted):
+        started = time.perf_counter()
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+            self._stats["wait_seconds"] += started - submitted
+        failed = True
+        try:
+            content = compile_pdf(latex_content)
+            failed = False
+            return content
+        finally:
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                self._running -= 1
+                self._inflight.pop(key, None)
+                if failed:
+                    self._stats["failed"] += 1
+                else:
+                    self._stats["compiled"] += 1
+                    self._stats["compile_seconds"] += elapsed
+                    self._stats["max_compile_seconds"] = max(self._stats["max_compile_seconds"], elapsed)
+
+    def _retry_after(self):
+        """Seconds until a slot is likely free: the backlog ahead, at the average compile time."""
+        compiled = self._stats["compiled"]
+        average = self._stats["compile_seconds"] / compiled if compiled else 2.0
+        return max(1, math.ceil(average * (self._queued + self._running) / self.workers))
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats, queued=self._queued, running=self._running)
+            handled = stats["compiled"] + stats["failed"]
+        stats.update(workers=self.workers, queue_size=self.queue_size)
+        stats["average_compile_seconds"] = round(stats["compile_seconds"] / stats["compiled"], 3) if stats["compiled"] else None
+        stats["average_wait_seconds"] = round(stats["wait_seconds"] / handled, 3) if handled else None
+        for name in ("compile_seconds", "max_compile_seconds", "wait_seconds"):
+            stats[name] = round(stats[name], 3)
+        return stats
+
+
+# One compile pool per process
+pool = CompilePool(
+    workers=settings.RESUME_PDF_COMPILE_WORKERS,
+    queue_size=settings.RESUME_PDF_COMPILE_QUEUE,
+)
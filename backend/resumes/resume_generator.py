@@ -1,26 +1,32 @@
 import requests
 from django.conf import settings
 import json
+from contextlib import closing
+
+from resumes import compaction, llm_cache, llm_client
 
 
 class ResumeGeneratorService:
     """Service to generate tailored resumes using DeepSeek R1 via OpenRouter API."""
     
+    MAX_TOKENS = 3000  # Increased for longer resumes
+    TEMPERATURE = 0.3  # Lower for more consistent formatting
+    
     def __init__(self):
         self.api_key = settings.OPENROUTER_API_KEY
-        self.base_url = settings.API_BASE_URL
         self.model = settings.MODEL_NAME
         
         if not self.api_key:
             raise ValueError("OPENROUTER_API_KEY is not set in environment variables")
     
-    def generate_resume(self, profile_data: dict, job_description: str) -> str:
+    def generate_resume(self, profile_data: dict, job_description: str, refresh: bool = False) -> str:
         """
         Generate a tailored resume based on profile data and job description.
         
         Args:
             profile_data (dict): Complete profile data from ProfileSerializer (master resume)
             job_description (str): The job description to tailor the resume for
+            refresh (bool): Ignore a cached response for the identical prompt and call the API again
             
         Returns:
             str: The generated tailored resume content as JSON string
@@ -41,17 +47,38 @@ class ResumeGeneratorService:
         print("="*80 + "\n")
         
         # Create the prompt for the AI
-        prompt = self._create_prompt(profile_data, job_description)
+        prompt = self.build_prompt(profile_data, job_description)
         
-        # Call OpenRouter API
-        response = self._call_api(prompt)
+        # Call OpenRouter API, unless this exact prompt was already answered
+        response, cached = llm_cache.get_or_call(
+            self.model, prompt, self.TEMPERATURE, self.MAX_TOKENS,
+            lambda: self.complete(prompt),
+            refresh=refresh,
+        )
+        if cached:
+            print("[CACHE] Reusing the response to an identical earlier prompt")
         
         print(f"\n[SUCCESS] Generated resume length: {len(response)} characters\n")
         
         return response
     
-    def _create_prompt(self, profile_data: dict, job_description: str) -> str:
-        """Create the prompt for the AI model."""
+    def build_prompt(self, profile_data: dict, job_description: str) -> str:
+        """
+        Create the prompt for the AI model, keeping only the profile items and
+        job description sentences that fit the token budgets (see compaction.py).
+        """
+        compact_profile, compact_description, report, saved = compaction.compact(profile_data, job_description)
+        prompt = self._render_prompt(compact_profile, compact_description)
+        
+        compacted = compaction.estimate_tokens(prompt)
+        full = compacted + saved  # the dropped sections, so the full prompt is never rendered
+        compaction.record(full, compacted)
+        print(f"[PROMPT] ~{full} -> ~{compacted} tokens ({report})")
+        
+        return prompt
+    
+    def _render_prompt(self, profile_data: dict, job_description: str) -> str:
+        """Write out the prompt for the given profile data and job description."""
         
         # Extract data from profile
         name = profile_data.get('name', 'Candidate')
@@ -270,75 +297,62 @@ NOW GENERATE THE TAILORED RESUME JSON:
         
         return '\n\n'.join(formatted)
     
-    def _call_api(self, prompt: str) -> str:
-        """Call the OpenRouter API to generate the resume."""
+    def stream_resume(self, profile_data: dict, job_description: str, refresh: bool = False):
+        """
+        Like generate_resume, but yield the resume JSON text chunk by chunk as
+        the model writes it. A cached answer to the identical prompt is
+        yielded in one piece unless `refresh`; a complete, valid answer is
+        cached once the stream ends.
+        """
+        prompt = self.build_prompt(profile_data, job_description)
+        key = llm_cache.request_key(self.model, prompt, self.TEMPERATURE, self.MAX_TOKENS)
+        if not refresh:
+            cached = llm_cache.get(key)
+            if cached is not None:
+                print("[CACHE] Reusing the response to an identical earlier prompt")
+                yield cached
+                return
         
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-            "HTTP-Referer": "http://localhost:8000",
-            "X-Title": "Job Application Organizer"
-        }
+        chunks = []
+        # closing(): stopping early must end the upstream stream, not wait for GC
+        with closing(self._stream_api(prompt)) as stream:
+            for chunk in stream:
+                chunks.append(chunk)
+                yield chunk
         
-        payload = {
-            "model": self.model,
-            "messages": [
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            "max_tokens": 3000,  # Increased for longer resumes
-            "temperature": 0.3,  # Lower for more consistent formatting
-        }
+        generated = llm_client.strip_code_fences("".join(chunks))
+        try:
+            json.loads(generated)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"AI did not return valid JSON: {e}")
+        llm_cache.put(key, self.model, generated)
+    
+    def _stream_api(self, prompt: str):
+        """Yield the content deltas of a streamed (stream: true) completion."""
+        try:
+            yield from llm_client.client.stream(prompt, self.MAX_TOKENS, self.TEMPERATURE)
+        except requests.exceptions.RequestException as e:
+            print(f"[ERROR] API request failed: {str(e)}")
+            raise Exception(f"API request failed: {str(e)}")
+    
+    def complete(self, prompt: str) -> str:
+        """Call the OpenRouter API with a build_prompt() prompt; returns the validated resume JSON text."""
         
         try:
             print("[API] Calling OpenRouter API...")
-            response = requests.post(
-                f"{self.base_url}/chat/completions",
-                headers=headers,
-                json=payload,
-                timeout=60
-            )
-            response.raise_for_status()
+            generated_resume = llm_client.client.complete(prompt, self.MAX_TOKENS, self.TEMPERATURE)
+            print(f"[API] Cleaned response preview: {generated_resume[:200]}...")
             
-            data = response.json()
-            print(f"[API] Response Status: {response.status_code}")
+            # Validate it's valid JSON
+            try:
+                json.loads(generated_resume)
+                print("[API] ✓ Successfully validated JSON resume")
+            except json.JSONDecodeError as e:
+                print(f"[ERROR] Generated resume is not valid JSON: {e}")
+                print(f"[ERROR] Cleaned response: {generated_resume[:500]}...")
+                raise ValueError(f"AI did not return valid JSON: {e}")
             
-            if "choices" in data and len(data["choices"]) > 0:
-                generated_resume = data["choices"][0]["message"]["content"]
-                
-                # Clean up the response - remove markdown code fences if present
-                generated_resume = generated_resume.strip()
-                
-                print(f"[API] Raw response preview: {generated_resume[:200]}...")
-                
-                # Remove markdown code blocks
-                if generated_resume.startswith("```json"):
-                    print("[API] Removing ```json prefix")
-                    generated_resume = generated_resume[7:]
-                if generated_resume.startswith("```"):
-                    print("[API] Removing ``` prefix")
-                    generated_resume = generated_resume[3:]
-                if generated_resume.endswith("```"):
-                    print("[API] Removing ``` suffix")
-                    generated_resume = generated_resume[:-3]
-                
-                generated_resume = generated_resume.strip()
-                
-                # Validate it's valid JSON
-                try:
-                    json.loads(generated_resume)
-                    print("[API] ✓ Successfully validated JSON resume")
-                except json.JSONDecodeError as e:
-                    print(f"[ERROR] Generated resume is not valid JSON: {e}")
-                    print(f"[ERROR] Cleaned response: {generated_resume[:500]}...")
-                    raise ValueError(f"AI did not return valid JSON: {e}")
-                
-                return generated_resume
-            else:
-                print("[ERROR] No choices in API response")
-                raise ValueError("No response generated from API")
+            return generated_resume
                 
         except requests.exceptions.RequestException as e:
             print(f"[ERROR] API request failed: {str(e)}")
@@ -0,0 +1,135 @@
+"""
+Incremental parsing of a resume JSON object while the model is still writing it.
+
+The model answers with one JSON object ("header", "summary", "experience",
+...), streamed a few characters at a time. ResumeStreamParser scans the text
+as it arrives, tracking string/escape state and nesting depth, and reports
+each top-level field as soon as its value is complete, and each entry of the
+list sections (experience, education, projects) as soon as its closing brace
+arrives, so the page can render the summary and the first experience long
+before the whole resume is written. Text before the opening brace (a
+```json fence) and after the closing one is ignored.
+"""
+import json
+
+LIST_SECTIONS = ("experience", "education", "projects")
+
+
+class ResumeStreamParser:
+    def __init__(self):
+        self._text = []  # chunks received so far
+        self._buffer = ""  # joined text from the opening brace on
+        self._pos = 0  # next character of _buffer to scan
+        self._started = False
+        self.finished = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        # Top-level (depth 1) bookkeeping
+        self._expect_key = True
+        self._key_start = None
+        self._key = None
+        self._value_start = None
+        # Entries of a list section (depth 2)
+        self._item_start = None
+        self._item_index = 0
+
+    @property
+    def text(self):
+        """Everything received so far, including any code fences."""
+        return "".join(self._text)
+
+    def feed(self, chunk):
+        """
+        Add a chunk of model output. Returns the events it completed, each
+        ("section", key, value) or ("item", section, index, value).
+        """
+        self._text.append(chunk)
+        if self.finished:
+            return []
+        if not self._started:
+            start = self.text.find("{")
+            if start < 0:
+                return []
+            self._started = True
+            self._buffer = self.text[start:]
+        else:
+            self._buffer += chunk
+
+        events = []
+        buffer = self._buffer
+        while self._pos < len(buffer) and not self.finished:
+            index = self._pos
+            char = buffer[index]
+            self._pos += 1
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._key_start is not None:
+                        self._key = json.loads(buffer[self._key_start:index + 1])
+                        self._key_start = None
+                continue
+
+            if char.isspace():
+                continue
+
+            if self._depth == 1 and self._value_start is None and not self._expect_key and char != ":":
+                self._value_start = index
+            if self._depth == 2 and self._item_start is None and self._in_list() and char not in ",]":
+                self._item_start = index
+
+            if char == '"':
+                self._in_string = True
+                if self._depth == 1 and self._expect_key:
+                    self._key_start = index
+            elif char == ":" and self._depth == 1:
+                self._expect_key = False
+            elif char in "{[":
+                self._depth += 1
+            elif char in "}]":
+                if self._depth == 2 and self._in_list() and self._item_start is not None:
+                    events.append(self._item(buffer[self._item_start:index]))
+                self._depth -= 1
+                if self._depth == 0:
+                    if self._value_start is not None:
+                        events.append(self._section(buffer[self._value_start:index]))
+                    self.finished = True
+            elif char == ",":
+                if self._depth == 1 and self._value_start is not None:
+                    events.append(self._section(buffer[self._value_start:index]))
+                elif self._depth == 2 and self._in_list() and self._item_start is not None:
+                    events.append(self._item(buffer[self._item_start:index]))
+        return [event for event in events if event is not None]
+
+    def _in_list(self):
+        return self._key in LIST_SECTIONS and self._value_start is not None
+
+    def _section(self, raw):
+        key = self._key
+        self._expect_key = True
+        self._key = None
+        self._value_start = None
+        self._item_index = 0
+        try:
+            return ("section", key, json.loads(raw))
+        except json.JSONDecodeError:
+            return None
+
+    def _item(self, raw):
+        self._item_start = None
+        index = self._item_index
+        self._item_index += 1
+        try:
+            return ("item", self._key, index, json.loads(raw))
+        except json.JSONDecodeError:
+            return None
+
+
+def sse_event(event, data):
+    """One server-sent event with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
@@ -0,0 +1,207 @@
+"""
+Database-backed queue for resume builds.
+
+POST /api/resumes/<job id>/resume/build/?async=1 only inserts a
+ResumeBuildTask row and answers 202, so no web worker waits on the model.
+`manage.py run_resume_workers` runs a pool of worker threads that claim
+queued tasks with a compare-and-set UPDATE (safe across several worker
+processes), build the resume and record the outcome. Throughput is bounded by
+the number of workers instead of HTTP timeouts.
+
+Failed builds are retried with exponential backoff up to MAX_ATTEMPTS times,
+except for problems another attempt cannot fix (no profile, no job
+description, no API key). Tasks left running by a worker that died are
+requeued after STALE_AFTER seconds.
+"""
+import json
+import threading
+import time
+from datetime import timedelta
+
+from django.db import close_old_connections, connections
+from django.db.models import F
+from django.utils import timezone
+
+from profiles.models import Profile, User
+from resumes.models import Resume, ResumeBuildTask
+from resumes.resume_generator import ResumeGeneratorService
+
+MAX_ATTEMPTS = 3
+RETRY_DELAY = 30  # seconds before the first retry, doubled for every further one
+STALE_AFTER = 10 * 60  # seconds a task may stay running before it is requeued
+POLL_INTERVAL = 2  # seconds an idle worker sleeps between queue checks
+
+ACTIVE = (ResumeBuildTask.QUEUED, ResumeBuildTask.RUNNING)
+
+
+class PermanentBuildError(Exception):
+    """A build failure that retrying cannot fix."""
+
+
+def submit(job, refresh=False):
+    """
+    Queue a build of `job`'s resume. A build already queued or running for the
+    job is returned instead of queueing another. Returns (task, created).
+    """
+    active = ResumeBuildTask.objects.filter(job_application=job, status__in=ACTIVE).order_by('id').first()
+    if active is not None:
+        return active, False
+    task = ResumeBuildTask.objects.create(job_application=job, refresh=refresh, available_at=timezone.now())
+    return task, True
+
+
+def task_payload(task):
+    """Status of `task` as the frontend sees it; includes the resume once built."""
+    payload = {
+        "id": str(task.id),
+        "applicationId": str(task.job_application_id),
+        "status": task.status,
+        "attempts": task.attempts,
+        "error": task.error,
+        "createdAt": task.created_at.isoformat(),
+        "startedAt": task.started_at.isoformat() if task.started_at else None,
+        "finishedAt": task.finished_at.isoformat() if task.finished_at else None,
+    }
+    if task.status == ResumeBuildTask.SUCCEEDED and task.resume is not None:
+        payload["resume"] = {
+            "id": str(task.resume.id),
+            "applicationId": str(task.job_application_id),
+            **task.resume.data,
+        }
+    return payload
+
+
+def build_resume(task):
+    """Generate and store the resume for `task`'s job (the synchronous build, without the logging)."""
+    job = task.job_application
+    user = User.objects.first()
+    profile = Profile.objects.filter(user=user).first() if user else None
+    if profile is None:
+        raise PermanentBuildError("Profile not found. Please complete your profile setup before building resumes")
+    if not job.description:
+        raise PermanentBuildError("Job has no description")
+    try:
+        generator = ResumeGeneratorService()
+    except ValueError as e:
+        raise PermanentBuildError(str(e))
+
+    from profiles.serializers import ProfileSerializer
+    generated = generator.generate_resume(
+        profile_data=ProfileSerializer(profile).data,
+        job_description=job.description,
+        refresh=task.refresh,
+    )
+    resume, _ = Resume.objects.update_or_create(job_application=job, defaults={'data': json.loads(generated)})
+    return resume
+
+
+def claim(worker):
+    """Mark the oldest runnable task as running by `worker` and return it, or None."""
+    now = timezone.now()
+    candidates = list(
+        ResumeBuildTask.objects.filter(status=ResumeBuildTask.QUEUED, available_at__lte=now)
+        .order_by('available_at', 'id')
+        .values_list('id', flat=True)[:10]
+    )
+    for task_id in candidates:
+        # Only one worker wins the status transition
+        claimed = ResumeBuildTask.objects.filter(id=task_id, status=ResumeBuildTask.QUEUED).update(
+            status=ResumeBuildTask.RUNNING,
+            worker=worker,
+            started_at=now,
+            attempts=F('attempts') + 1,
+        )
+        if claimed:
+            return ResumeBuildTask.objects.select_related('job_application').get(id=task_id)
+    return None
+
+
+def execute(task):
+    """Run a claimed task and record success, a scheduled retry or the final failure."""
+    started = time.perf_counter()
+    try:
+        resume = build_resume(task)
+    except Exception as e:
+        now = timezone.now()
+        retry = not isinstance(e, PermanentBuildError) and task.attempts < MAX_ATTEMPTS
+        print(f"[BUILD TASK] {task.id} attempt {task.attempts} failed ({'retrying' if retry else 'giving up'}): {e}")
+        if retry:
+            ResumeBuildTask.objects.filter(id=task.id).update(
+                status=ResumeBuildTask.QUEUED,
+                error=str(e),
+                available_at=now + timedelta(seconds=RETRY_DELAY * 2 ** (task.attempts - 1)),
+            )
+        else:
+            ResumeBuildTask.objects.filter(id=task.id).update(
+                status=ResumeBuildTask.FAILED,
+                error=str(e),
+                finished_at=now,
+            )
+        return False
+
+    ResumeBuildTask.objects.filter(id=task.id).update(
+        status=ResumeBuildTask.SUCCEEDED,
+        resume=resume,
+        error='',
+        finished_at=timezone.now(),
+    )
+    print(f"[BUILD TASK] {task.id} built resume {resume.id} in {time.perf_counter() - started:.1f}s")
+    return True
+
+
+def requeue_stale():
+    """Put tasks whose worker stopped responding back in the queue. Returns how many."""
+    now = timezone.now()
+    stale = ResumeBuildTask.objects.filter(
+        status=ResumeBuildTask.RUNNING,
+        started_at__lt=now - timedelta(seconds=STALE_AFTER),
+    )
+    stale.filter(attempts__gte=MAX_ATTEMPTS).update(
+        status=ResumeBuildTask.FAILED,
+        error='Worker stopped before the build finished',
+        finished_at=now,
+    )
+    return stale.update(status=ResumeBuildTask.QUEUED, available_at=now)
+
+
+def run_worker(name, stop, poll_interval=POLL_INTERVAL, once=False):
+    """
+    Claim and execute tasks until `stop` (a threading.Event) is set, or until
+    the queue is empty when `once`. Returns the number of tasks executed.
+    """
+    executed = 0
+    while not stop.is_set():
+        close_old_connections()
+        task = claim(name)
+        if task is None:
+            if once:
+                break
+            requeue_stale()
+            stop.wait(poll_interval)
+            continue
+        execute(task)
+        executed += 1
+    connections.close_all()  # this thread's connections
+    return executed
+
+
+def run_pool(workers, prefix, stop, poll_interval=POLL_INTERVAL, once=False):
+    """Run `workers` worker threads until `stop` is set; returns the tasks executed."""
+    counts = [0] * workers
+
+    def work(index):
+        counts[index] = run_worker(f"{prefix}-{index}", stop, poll_interval, once)
+
+    threads = [threading.Thread(target=work, args=(index,), daemon=True) for index in range(workers)]
+    for thread in threads:
+        thread.start()
+    try:
+        while any(thread.is_alive() for thread in threads):
+            for thread in threads:
+                thread.join(timeout=0.5)
+    except KeyboardInterrupt:
+        # Running builds finish, nothing new is claimed
+        stop.set()
+        for thread in threads:
+            thread.join()
+    return sum(counts)
@@ -0,0 +1,832 @@
+import json
+import os
+import tempfile
+import threading
+from datetime import timedelta
+from pathlib import Path
+from unittest import mock
+
+import requests
+from django.db import DatabaseError
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from JobApplication.factories import make_job
+from JobApplication.models import Tag
+from profiles.models import Profile, User
+from resumes import ats, batch, compaction, llm_cache, llm_client, pdf_cache, tasks
+from resumes.models import LLMResponse, Resume, ResumeBuildTask
+from resumes.resume_generator import ResumeGeneratorService
+from resumes.streaming import ResumeStreamParser, sse_event
+
+
+def model_answer(payload):
+    """Patch the shared model client so every completion answers `payload` (as JSON)."""
+    return mock.patch.object(llm_client.client, "complete", return_value=json.dumps(payload))
+
+
+class ATSKeywordTests(TestCase):
+    def setUp(self):
+        for name in ("python", "django", "machine learning", "go"):
+            Tag.objects.create(name=name)
+
+    def test_stem_strips_plural_and_verb_endings(self):
+        for word in ("deployed", "deploying", "deploys"):
+            self.assertEqual(ats.stem(word), "deploy")
+        self.assertEqual(ats.stem("class"), "class")
+        self.assertEqual(ats.stem("bus"), "bus")
+
+    def test_technologies_are_known_tags_in_order_of_appearance(self):
+        technologies, terms = ats.extract_keywords(
+            "We use Django and Python for machine learning pipelines. Pipelines run nightly."
+        )
+        self.assertEqual(technologies, ["django", "python", "machine learning"])
+        self.assertIn("pipelines", terms)
+        # Words covered by a technology and stopwords are not terms
+        self.assertNotIn("machine", terms)
+        self.assertNotIn("we", terms)
+
+    def test_posting_tech_stack_comes_first(self):
+        technologies, _ = ats.extract_keywords("Python services", tech_stack=["Go"])
+        self.assertEqual(technologies, ["go", "python"])
+
+    def test_terms_match_up_to_their_ending(self):
+        result = ats.score_resume({"summary": "Deployed pipeline tooling"}, "Deploying pipelines")
+        self.assertEqual(result["score"], 100)
+        self.assertEqual(result["missing_keywords"], [])
+
+    def test_technologies_weigh_twice_as_much_as_terms(self):
+        description = "Python pipelines"
+        tech_only = ats.score_resume({"summary": "Python"}, description)
+        term_only = ats.score_resume({"summary": "pipelines"}, description)
+        self.assertEqual(tech_only["score"], round(100 * ats.TECH_WEIGHT / (ats.TECH_WEIGHT + ats.TERM_WEIGHT)))
+        self.assertEqual(term_only["score"], round(100 * ats.TERM_WEIGHT / (ats.TECH_WEIGHT + ats.TERM_WEIGHT)))
+        self.assertEqual(tech_only["missing_keywords"], ["pipelines"])
+        self.assertTrue(tech_only["strengths"])
+        self.assertTrue(term_only["improvements"])
+
+    def test_nothing_to_match_scores_zero(self):
+        self.assertEqual(ats.score_resume({"summary": "Python"}, "")["score"], 0)
+
+
+class ATSScanModeTests(TestCase):
+    def setUp(self):
+        Tag.objects.create(name="python")
+        self.job = make_job(description="Python pipelines")
+        Resume.objects.create(job_application=self.job, data={"summary": "Python developer"})
+
+    def scan(self, mode=None):
+        url = f"/api/resumes/{self.job.id}/resume/ats-scan/"
+        return self.client.post(url + (f"?mode={mode}" if mode else ""))
+
+    def test_local_mode_never_calls_the_model(self):
+        with mock.patch.object(llm_client.client, "complete", side_effect=AssertionError("model called")):
+            response = self.scan("local")
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual((body["mode"], body["score"], body["cached"]), ("local", 67, False))
+        self.assertEqual(body["missing_keywords"], ["pipelines"])
+
+    def test_hybrid_is_the_default_and_only_asks_for_feedback(self):
+        with model_answer({"score": 5, "strengths": ["Clear summary"], "improvements": ["Add pipelines"]}) as complete:
+            body = self.scan().json()
+        self.assertEqual(complete.call_count, 1)
+        self.assertEqual(body["mode"], "hybrid")
+        self.assertEqual(body["score"], 67)  # the model does not rescore
+        self.assertEqual(body["strengths"], ["Clear summary"])
+
+    def test_hybrid_keeps_local_feedback_when_the_model_fails(self):
+        with mock.patch.object(llm_client.client, "complete", return_value="not json"):
+            body = self.scan("hybrid").json()
+        self.assertEqual(body["score"], 67)
+        self.assertTrue(body["improvements"])
+
+    def test_llm_mode_uses_the_model_score(self):
+        with model_answer({"score": 42, "missing_keywords": [], "matched_keywords": [], "strengths": [], "improvements": []}):
+            body = self.scan("llm").json()
+        self.assertEqual((body["mode"], body["score"]), ("llm", 42))
+
+    def test_unknown_mode_is_rejected(self):
+        self.assertEqual(self.scan("fast").status_code, 400)
+
+
+class LLMCacheTests(TestCase):
+    def call(self, prompt="prompt", refresh=False, answer="answer"):
+        calls = mock.Mock(return_value=answer)
+        response, cached = llm_cache.get_or_call("model", prompt, 0.3, 100, calls, refresh=refresh)
+        return response, cached, calls.call_count
+
+    def test_miss_calls_and_stores(self):
+        self.assertEqual(self.call(), ("answer", False, 1))
+        self.assertEqual(LLMResponse.objects.get().response, "answer")
+
+    def test_identical_request_is_a_hit(self):
+        self.call()
+        self.assertEqual(self.call(answer="other"), ("answer", True, 0))
+        self.assertEqual(LLMResponse.objects.get().hits, 1)
+
+    def test_any_request_field_changes_the_key(self):
+        key = llm_cache.request_key("model", "prompt", 0.3, 100)
+        self.assertNotEqual(key, llm_cache.request_key("model", "prompt", 0.3, 200))
+        self.assertNotEqual(key, llm_cache.request_key("other", "prompt", 0.3, 100))
+        self.assertNotEqual(key, llm_cache.request_key("model", "prompt!", 0.3, 100))
+
+    def test_refresh_bypasses_and_overwrites_the_entry(self):
+        self.call()
+        self.assertEqual(self.call(refresh=True, answer="fresh"), ("fresh", False, 1))
+        self.assertEqual(self.call(), ("fresh", True, 0))
+        self.assertEqual(LLMResponse.objects.count(), 1)
+
+    def test_failed_calls_are_not_cached(self):
+        with self.assertRaises(ValueError):
+            llm_cache.get_or_call("model", "prompt", 0.3, 100, mock.Mock(side_effect=ValueError("bad")))
+        self.assertFalse(LLMResponse.objects.exists())
+
+    @override_settings(LLM_CACHE_TTL=60)
+    def test_expired_entries_are_missed_and_deleted(self):
+        self.call()
+        LLMResponse.objects.update(created_at=timezone.now() - timedelta(seconds=61))
+        self.assertIsNone(llm_cache.get(llm_cache.request_key("model", "prompt", 0.3, 100)))
+        self.assertFalse(LLMResponse.objects.exists())
+        self.assertEqual(self.call(answer="new"), ("new", False, 1))
+
+    @override_settings(LLM_CACHE_MAX_ENTRIES=2)
+    def test_least_recently_used_entries_are_evicted(self):
+        self.call("first")
+        self.call("second")
+        LLMResponse.objects.filter(response="answer").update(last_used_at=timezone.now() - timedelta(minutes=5))
+        self.call("first")  # a hit makes "first" the most recently used
+        self.call("third", answer="third")
+        self.assertEqual(set(LLMResponse.objects.values_list("key", flat=True)), {
+            llm_cache.request_key("model", "first", 0.3, 100),
+            llm_cache.request_key("model", "third", 0.3, 100),
+        })
+
+
+@override_settings(OPENROUTER_API_KEY="test-key")
+class ResumeBuildTaskTests(TestCase):
+    def setUp(self):
+        user = User.objects.create(username="ada", email="ada@example.com")
+        Profile.objects.create(user=user)
+        self.job = make_job(description="Python services")
+
+    def generator(self, **kwargs):
+        """Patch the model call behind every build."""
+        return mock.patch(
+            "resumes.resume_generator.ResumeGeneratorService.generate_resume",
+            **({"return_value": json.dumps({"summary": "Built"})} | kwargs),
+        )
+
+    def work(self):
+        return tasks.run_worker("test-worker", threading.Event(), once=True)
+
+    def reload(self, task):
+        task.refresh_from_db()
+        return task
+
+    def test_endpoint_queues_and_reports_the_task(self):
+        response = self.client.post(f"/api/resumes/{self.job.id}/resume/build/?async=1")
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()["status"], "queued")
+        again = self.client.post(f"/api/resumes/{self.job.id}/resume/build/?async=1")
+        self.assertEqual(again.json()["id"], response.json()["id"])  # one active build per job
+
+        with self.generator():
+            self.assertEqual(self.work(), 1)
+        body = self.client.get(response["Location"]).json()
+        self.assertEqual((body["status"], body["attempts"], body["resume"]["summary"]), ("succeeded", 1, "Built"))
+        self.assertEqual(Resume.objects.get(job_application=self.job).data, {"summary": "Built"})
+
+    def test_claim_hands_a_task_to_one_worker(self):
+        task, _ = tasks.submit(self.job)
+        claimed = tasks.claim("first")
+        self.assertEqual((claimed.id, claimed.status, claimed.worker, claimed.attempts), (task.id, "running", "first", 1))
+        self.assertIsNone(tasks.claim("second"))
+
+    def test_failed_builds_back_off_then_give_up(self):
+        task, _ = tasks.submit(self.job)
+        with self.generator(side_effect=Exception("API request failed: 502")) as generate:
+            for attempt in range(1, tasks.MAX_ATTEMPTS + 1):
+                before = timezone.now()
+                self.assertEqual(self.work(), 1)
+                task = self.reload(task)
+                self.assertEqual(task.attempts, attempt)
+                if attempt < tasks.MAX_ATTEMPTS:
+                    self.assertEqual(task.status, "queued")
+                    delay = (task.available_at - before).total_seconds()
+                    self.assertAlmostEqual(delay, tasks.RETRY_DELAY * 2 ** (attempt - 1), delta=5)
+                    self.assertEqual(self.work(), 0)  # not runnable before the backoff ends
+                    ResumeBuildTask.objects.filter(id=task.id).update(available_at=timezone.now())
+        self.assertEqual(generate.call_count, tasks.MAX_ATTEMPTS)
+        self.assertEqual((task.status, task.error), ("failed", "API request failed: 502"))
+        self.assertIsNotNone(task.finished_at)
+
+    def test_permanent_failures_are_not_retried(self):
+        task, _ = tasks.submit(make_job(description=""))
+        with self.generator() as generate:
+            self.work()
+        task = self.reload(task)
+        self.assertEqual((task.status, task.attempts, task.error), ("failed", 1, "Job has no description"))
+        generate.assert_not_called()
+
+    def test_missing_profile_fails_permanently(self):
+        Profile.objects.all().delete()
+        task, _ = tasks.submit(self.job)
+        with self.generator():
+            self.work()
+        self.assertEqual(self.reload(task).status, "failed")
+
+    def test_stale_running_tasks_are_requeued(self):
+        stale_at = timezone.now() - timedelta(seconds=tasks.STALE_AFTER + 1)
+        task, _ = tasks.submit(self.job)
+        ResumeBuildTask.objects.filter(id=task.id).update(status="running", attempts=1, started_at=stale_at)
+        spent = ResumeBuildTask.objects.create(
+            job_application=make_job(description="Go"), status="running",
+            attempts=tasks.MAX_ATTEMPTS, started_at=stale_at, available_at=stale_at,
+        )
+        fresh = ResumeBuildTask.objects.create(
+            job_application=make_job(description="Rust"), status="running",
+            attempts=1, started_at=timezone.now(), available_at=stale_at,
+        )
+        self.assertEqual(tasks.requeue_stale(), 1)
+        self.assertEqual(self.reload(task).status, "queued")
+        self.assertEqual(self.reload(spent).status, "failed")
+        self.assertEqual(self.reload(fresh).status, "running")
+
+
+RESUME_JSON = json.dumps({
+    "header": "Ada | ada@example.com",
+    "summary": "Says \"hi\" {not a brace}, uses [brackets] and \\ backslashes",
+    "experience": [
+        {"id": "exp-1", "company": "Acme", "description": ["Built {APIs}", "Shipped, fast"]},
+        {"id": "exp-2", "company": "Initech", "description": []},
+    ],
+    "education": [],
+    "programmingLanguages": ["Python", "Go"],
+}, indent=2)
+
+
+class ResumeStreamParserTests(TestCase):
+    def feed(self, text, size):
+        parser = ResumeStreamParser()
+        events = []
+        for start in range(0, len(text), size):
+            events.extend(parser.feed(text[start:start + size]))
+        return parser, events
+
+    def test_events_do_not_depend_on_chunk_boundaries(self):
+        expected = json.loads(RESUME_JSON)
+        for size in (1, 2, 3, 7, 64, len(RESUME_JSON)):
+            with self.subTest(size=size):
+                parser, events = self.feed(RESUME_JSON, size)
+                self.assertTrue(parser.finished)
+                self.assertEqual(
+                    [event[1] for event in events if event[0] == "section"],
+                    ["header", "summary", "experience", "education", "programmingLanguages"],
+                )
+                sections = {event[1]: event[2] for event in events if event[0] == "section"}
+                self.assertEqual(sections, expected)
+                items = [event[1:] for event in events if event[0] == "item"]
+                self.assertEqual(items, [
+                    ("experience", 0, expected["experience"][0]),
+                    ("experience", 1, expected["experience"][1]),
+                ])
+
+    def test_items_arrive_before_their_section_closes(self):
+        parser = ResumeStreamParser()
+        head, tail = RESUME_JSON.split('"education"')
+        events = parser.feed(head)
+        self.assertIn(("item", "experience", 1, json.loads(RESUME_JSON)["experience"][1]), events)
+        self.assertFalse(parser.finished)
+        parser.feed('"education"' + tail)
+        self.assertTrue(parser.finished)
+
+    def test_code_fences_and_trailing_text_are_ignored(self):
+        fenced = "```json\n" + RESUME_JSON + "\n```\nHope this helps! {}"
+        parser, events = self.feed(fenced, 5)
+        self.assertTrue(parser.finished)
+        self.assertEqual(len([event for event in events if event[0] == "section"]), 5)
+        self.assertEqual(parser.text, fenced)
+
+    def test_unfinished_stream_is_not_finished(self):
+        parser, events = self.feed(RESUME_JSON[:-10], 4)
+        self.assertFalse(parser.finished)
+        self.assertNotIn("programmingLanguages", [event[1] for event in events if event[0] == "section"])
+
+    def test_sse_event_format(self):
+        self.assertEqual(sse_event("token", {"text": "a"}), 'event: token\ndata: {"text": "a"}\n\n')
+
+
+def api_response(status=200, content="{}", headers=None):
+    response = mock.Mock(status_code=status, headers=headers or {})
+    response.json.return_value = {"choices": [{"message": {"content": content}}]}
+    if status >= 400:
+        response.raise_for_status.side_effect = requests.exceptions.HTTPError(str(status))
+    return response
+
+
+class LLMClientTests(TestCase):
+    def setUp(self):
+        self.client_ = llm_client.LLMClient(max_concurrency=2, max_retries=2, timeout=5)
+        sleep = mock.patch.object(llm_client.time, "sleep")
+        self.sleep = sleep.start()
+        self.addCleanup(sleep.stop)
+
+    def answers(self, *responses):
+        return mock.patch.object(self.client_._session, "post", side_effect=list(responses))
+
+    def test_answer_is_stripped_of_code_fences(self):
+        with self.answers(api_response(content='```json\n{"a": 1}\n```')):
+            self.assertEqual(self.client_.complete("prompt", 10, 0.3), '{"a": 1}')
+        self.assertEqual(self.client_.stats()["calls"], 1)
+
+    def test_rate_limits_and_server_errors_are_retried(self):
+        with self.answers(api_response(429), api_response(502), api_response(content="ok")) as post:
+            self.assertEqual(self.client_.complete("prompt", 10, 0.3), "ok")
+        self.assertEqual(post.call_count, 3)
+        self.assertEqual(self.client_.stats()["retries"], 2)
+        for call in self.sleep.call_args_list:
+            self.assertLessEqual(call.args[0], llm_client.BACKOFF_CAP)
+
+    def test_retry_after_is_honoured(self):
+        with self.answers(api_response(429, headers={"Retry-After": "7"}), api_response(content="ok")):
+            self.client_.complete("prompt", 10, 0.3)
+        self.sleep.assert_called_once_with(7.0)
+
+    def test_network_errors_are_retried(self):
+        with self.answers(requests.exceptions.ConnectionError("reset"), api_response(content="ok")):
+            self.assertEqual(self.client_.complete("prompt", 10, 0.3), "ok")
+
+    def test_gives_up_after_max_retries(self):
+        with self.answers(*[api_response(503)] * 3) as post:
+            with self.assertRaises(requests.exceptions.HTTPError):
+                self.client_.complete("prompt", 10, 0.3)
+        self.assertEqual(post.call_count, 3)
+        self.assertEqual(self.client_.stats()["failures"], 1)
+
+    def test_client_errors_are_not_retried(self):
+        with self.answers(api_response(401)) as post:
+            with self.assertRaises(requests.exceptions.HTTPError):
+                self.client_.complete("prompt", 10, 0.3)
+        self.assertEqual(post.call_count, 1)
+
+    def test_null_content_is_an_unexpected_format(self):
+        with self.answers(api_response(content=None)):
+            with self.assertRaisesMessage(ValueError, "Unexpected API response format"):
+                self.client_.complete("prompt", 10, 0.3)
+
+    def test_concurrent_calls_are_bounded_by_the_slots(self):
+        in_flight, peak, lock = [0], [0], threading.Lock()
+
+        def post(*args, **kwargs):
+            with lock:
+                in_flight[0] += 1
+                peak[0] = max(peak[0], in_flight[0])
+            threading.Event().wait(0.05)  # time.sleep is patched
+            with lock:
+                in_flight[0] -= 1
+            return api_response(content="ok")
+
+        with mock.patch.object(self.client_._session, "post", side_effect=post):
+            threads = [threading.Thread(target=self.client_.complete, args=("prompt", 10, 0.3)) for _ in range(6)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(peak[0], 2)
+        self.assertEqual(self.client_.stats()["calls"], 6)
+
+    def test_rate_limiter_spaces_request_starts(self):
+        limiter = llm_client.RateLimiter(per_minute=600)  # one start every 0.1s
+        with mock.patch.object(llm_client.time, "monotonic", return_value=100.0):
+            for _ in range(4):
+                limiter.wait()
+        self.assertEqual([round(call.args[0], 3) for call in self.sleep.call_args_list], [0.1, 0.2, 0.3])
+
+    def test_rate_limit_of_zero_never_waits(self):
+        limiter = llm_client.RateLimiter(per_minute=0)
+        for _ in range(3):
+            limiter.wait()
+        self.sleep.assert_not_called()
+
+
+def stream_response(text, size=16):
+    """An upstream (stream: true) response delivering `text` in `size` character deltas."""
+    lines = [
+        "data: " + json.dumps({"choices": [{"delta": {"content": text[start:start + size]}}]})
+        for start in range(0, len(text), size)
+    ]
+    response = mock.Mock(status_code=200, headers={})
+    response.iter_lines.return_value = iter(lines + ["data: [DONE]"])
+    return response
+
+
+@override_settings(OPENROUTER_API_KEY="test-key")
+class StreamBuildTests(TestCase):
+    def setUp(self):
+        user = User.objects.create(username="ada", email="ada@example.com")
+        Profile.objects.create(user=user)
+        self.job = make_job(description="Python services")
+        self.client_ = llm_client.LLMClient(max_concurrency=1, max_retries=0, timeout=5)
+        patcher = mock.patch.object(llm_client, "client", self.client_)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.upstream = stream_response(RESUME_JSON)
+        post = mock.patch.object(self.client_._session, "post", return_value=self.upstream)
+        post.start()
+        self.addCleanup(post.stop)
+
+    def stream(self):
+        response = self.client.post(f"/api/resumes/{self.job.id}/resume/build/stream/")
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        return response
+
+    def slot_is_free(self):
+        if not self.client_._slots.acquire(blocking=False):
+            return False
+        self.client_._slots.release()
+        return True
+
+    def test_stream_saves_the_resume_and_frees_the_slot(self):
+        events = b"".join(self.stream().streaming_content).decode()
+        self.assertIn("event: done", events)
+        self.assertEqual(Resume.objects.get(job_application=self.job).data, json.loads(RESUME_JSON))
+        self.upstream.close.assert_called_once()
+        self.assertTrue(self.slot_is_free())
+
+    def test_disconnecting_mid_stream_frees_the_slot(self):
+        response = self.stream()
+        content = iter(response.streaming_content)
+        self.assertTrue(next(content).startswith(b"event: token"))
+        next(content)
+        self.assertFalse(self.slot_is_free())
+
+        response.close()  # what the server does when the client goes away
+        self.upstream.close.assert_called_once()
+        self.assertTrue(self.slot_is_free())
+        self.assertFalse(Resume.objects.filter(job_application=self.job).exists())
+
+
+@override_settings(OPENROUTER_API_KEY="test-key")
+class BatchBuildTests(TestCase):
+    def setUp(self):
+        user = User.objects.create(username="ada", email="ada@example.com")
+        Profile.objects.create(user=user)
+
+    def model(self, fail_on=None):
+        """Patch the model call; prompts containing `fail_on` raise."""
+        def call(prompt):
+            if fail_on and fail_on in prompt:
+                raise Exception("API request failed: 502")
+            return json.dumps({"summary": "Built"})
+        return mock.patch("resumes.resume_generator.ResumeGeneratorService.complete", side_effect=call)
+
+    def build(self, *job_ids):
+        response = self.client.post(
+            "/api/resumes/batch/build/",
+            json.dumps({"jobIds": [str(job_id) for job_id in job_ids]}),
+            content_type="application/json",
+        )
+        return response
+
+    def test_each_job_succeeds_or_fails_on_its_own(self):
+        ok = make_job(description="Python services")
+        empty = make_job(description="")
+        failing = make_job(description="Golang services")
+        with self.model(fail_on="Golang"):
+            response = self.build(ok.id, 999, empty.id, failing.id)
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual((body["succeeded"], body["failed"]), (1, 3))
+        self.assertEqual(
+            [(result["jobId"], result["status"], result.get("error")) for result in body["results"]],
+            [
+                (str(ok.id), "ok", None),
+                ("999", "error", "Job 999 not found"),
+                (str(empty.id), "error", "Job has no description"),
+                (str(failing.id), "error", "API request failed: 502"),
+            ],
+        )
+        self.assertEqual(body["results"][0]["resume"]["summary"], "Built")
+        self.assertEqual(list(Resume.objects.values_list("job_application_id", flat=True)), [ok.id])
+
+    def test_jobs_with_the_same_description_share_one_call(self):
+        first = make_job(description="Python services", company="A")
+        second = make_job(description="Python services", company="B")
+        with self.model() as call:
+            body = self.build(first.id, second.id, first.id).json()
+        self.assertEqual(call.call_count, 1)
+        self.assertEqual([result["status"] for result in body["results"]], ["ok", "ok"])
+        self.assertEqual(Resume.objects.count(), 2)
+
+    def test_cached_answers_skip_the_pool(self):
+        job = make_job(description="Python services")
+        with self.model():
+            self.build(job.id)
+        with self.model() as call, mock.patch.object(batch, "ThreadPoolExecutor", side_effect=AssertionError("pool used")):
+            body = self.build(job.id).json()
+        call.assert_not_called()
+        self.assertEqual(body["results"][0]["status"], "ok")
+
+    def test_refresh_asks_the_model_again(self):
+        job = make_job(description="Python services")
+        with self.model():
+            self.build(job.id)
+        with self.model() as call:
+            self.client.post(
+                "/api/resumes/batch/build/?refresh=1",
+                json.dumps({"jobIds": [job.id]}),
+                content_type="application/json",
+            )
+        self.assertEqual(call.call_count, 1)
+
+    def test_save_failures_are_reported_per_job(self):
+        job = make_job(description="Python services")
+        with self.model(), mock.patch.object(Resume.objects, "update_or_create", side_effect=DatabaseError("locked")):
+            body = self.build(job.id).json()
+        self.assertEqual(body["results"][0]["status"], "error")
+        self.assertIn("locked", body["results"][0]["error"])
+
+    def test_unexpected_errors_are_a_json_500(self):
+        job = make_job(description="Python services")
+        with mock.patch.object(batch, "build_resumes", side_effect=DatabaseError("disk I/O error")):
+            response = self.build(job.id)
+        self.assertEqual(response.status_code, 500)
+        self.assertEqual(response.json()["details"], "disk I/O error")
+
+    def test_request_validation(self):
+        self.assertEqual(self.build().status_code, 400)
+        self.assertEqual(self.build("x").status_code, 400)
+        self.assertEqual(self.build(*range(1, batch.MAX_JOBS + 2)).status_code, 400)
+        self.assertEqual(self.client.get("/api/resumes/batch/build/").status_code, 405)
+
+
+class CompactionTests(TestCase):
+    JOB = "We are hiring a backend engineer to build Django APIs on PostgreSQL."
+
+    def setUp(self):
+        self.matcher = compaction.KeywordMatcher(self.JOB)
+
+    def cost(self, profile_data):
+        """Estimated tokens of what select_items kept, counted the way it budgets them."""
+        tokens = 0
+        for exp in profile_data["experience"]:
+            tokens += compaction.estimate_tokens(compaction._header(exp))
+            tokens += sum(compaction.estimate_tokens(bullet) for bullet in exp["description"])
+        for proj in profile_data["projects"]:
+            tokens += compaction.estimate_tokens(compaction._project_text(proj))
+        return tokens
+
+    def test_budget_is_respected_with_duplicate_bullets(self):
+        bullet = "Built Django APIs on PostgreSQL for the billing team"
+        exp = {"position": "Engineer", "company": "Acme", "description": [bullet, bullet, "Ran the office book club"]}
+        budget = compaction.estimate_tokens(compaction._header(exp)) + compaction.estimate_tokens(bullet)
+        compacted, offered, kept = compaction.select_items({"experience": [exp], "projects": []}, self.matcher, budget)
+        self.assertEqual((offered, kept), (3, 1))
+        self.assertEqual(compacted["experience"][0]["description"], [bullet])
+        self.assertLessEqual(self.cost(compacted), budget)
+
+    def test_budget_is_respected(self):
+        profile = {
+            "experience": [
+                {"position": f"Engineer {i}", "company": "Acme", "description": [f"Built Django APIs, part {i}", "Organised team lunches"]}
+                for i in range(5)
+            ],
+            "projects": [{"name": "Ledger", "technologies": ["PostgreSQL"], "description": "Double-entry bookkeeping"}],
+        }
+        for budget in (10, 40, 80):
+            compacted, _, _ = compaction.select_items(profile, self.matcher, budget)
+            self.assertLessEqual(self.cost(compacted), budget)
+
+    def test_kept_items_stay_in_profile_order(self):
+        profile = {
+            "experience": [
+                {"position": "Engineer", "company": "First", "description": ["Organised team lunches", "Built Django APIs", "Tuned PostgreSQL queries"]},
+                {"position": "Engineer", "company": "Second", "description": ["Wrote Django APIs on PostgreSQL"]},
+            ],
+            "projects": [
+                {"name": "Notes", "technologies": [], "description": "A notes app"},
+                {"name": "Ledger", "technologies": ["PostgreSQL", "Django"], "description": "Bookkeeping"},
+            ],
+        }
+        compacted, offered, kept = compaction.select_items(profile, self.matcher, 1000)
+        self.assertEqual(offered, kept)
+        self.assertEqual([exp["company"] for exp in compacted["experience"]], ["First", "Second"])
+        self.assertEqual(compacted["experience"][0]["description"], profile["experience"][0]["description"])
+        self.assertEqual([proj["name"] for proj in compacted["projects"]], ["Notes", "Ledger"])
+
+    def test_boilerplate_is_dropped(self):
+        description = (
+            "You will build Django APIs on PostgreSQL.\n"
+            "We are an equal opportunity employer. Great benefits and paid time off."
+        )
+        trimmed = compaction.trim_description(description, self.matcher, 1000)
+        self.assertEqual(trimmed, "You will build Django APIs on PostgreSQL.")
+
+    @override_settings(OPENROUTER_API_KEY="test-key", RESUME_PROMPT_TOKEN_BUDGET=20, RESUME_JOB_TOKEN_BUDGET=1000)
+    def test_prompt_is_rendered_once(self):
+        profile = {"experience": [
+            {"position": "Engineer", "company": "Acme", "description": ["Built Django APIs", "Organised team lunches " * 10]},
+        ]}
+        description = self.JOB + " We are an equal opportunity employer."
+        generator = ResumeGeneratorService()
+        full = compaction.estimate_tokens(generator._render_prompt(profile, description))
+        before = compaction.stats()
+        with mock.patch.object(generator, "_render_prompt", wraps=generator._render_prompt) as render:
+            prompt = generator.build_prompt(profile, description)
+        render.assert_called_once()
+        after = compaction.stats()
+        self.assertEqual(after["tokens_after"] - before["tokens_after"], compaction.estimate_tokens(prompt))
+        # Estimated from the dropped sections: close to the full prompt, not exact
+        self.assertAlmostEqual(after["tokens_before"] - before["tokens_before"], full, delta=full * 0.05)
+
+    @override_settings(OPENROUTER_API_KEY="test-key", RESUME_PROMPT_TOKEN_BUDGET=0, RESUME_JOB_TOKEN_BUDGET=0)
+    def test_zero_budget_turns_compaction_off(self):
+        profile = {"experience": [{"position": "Engineer", "company": "Acme", "description": ["Organised team lunches"]}]}
+        description = self.JOB + " We are an equal opportunity employer."
+        self.assertEqual(compaction.compact(profile, description), (profile, description, "compaction off", 0))
+        generator = ResumeGeneratorService()
+        self.assertEqual(generator.build_prompt(profile, description), generator._render_prompt(profile, description))
+
+
+class PDFCacheTests(TestCase):
+    def setUp(self):
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        self.cache_dir = Path(cache_dir.name)
+        settings_override = override_settings(RESUME_PDF_CACHE_DIR=cache_dir.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        patcher = mock.patch("resumes.pdf_cache.compile_pdf", side_effect=lambda latex: b"%PDF " + latex.encode())
+        self.compile_pdf = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def read(self, latex):
+        pdf, key, cached = pdf_cache.open_pdf(latex)
+        with pdf:
+            return pdf.read(), key, cached
+
+    def test_key_changes_with_template_version(self):
+        key = pdf_cache.cache_key("\\documentclass{article}")
+        self.assertEqual(pdf_cache.cache_key("\\documentclass{article}"), key)
+        with mock.patch.object(pdf_cache, "TEMPLATE_VERSION", pdf_cache.TEMPLATE_VERSION + 1):
+            self.assertNotEqual(pdf_cache.cache_key("\\documentclass{article}"), key)
+
+    def test_hit_skips_compile(self):
+        first = self.read("resume")
+        second = self.read("resume")
+        self.assertEqual(first[:2], second[:2])
+        self.assertEqual((first[2], second[2]), (False, True))
+        self.compile_pdf.assert_called_once_with("resume")
+        self.assertTrue((self.cache_dir / f"{first[1]}.pdf").exists())
+
+    def test_edited_resume_compiles_again(self):
+        self.read("resume")
+        content, _, cached = self.read("edited resume")
+        self.assertFalse(cached)
+        self.assertEqual(content, b"%PDF edited resume")
+        self.assertEqual(self.compile_pdf.call_count, 2)
+
+    def test_failed_touch_does_not_open_the_cached_file(self):
+        self.read("resume")
+        with mock.patch.object(pdf_cache.os, "utime", side_effect=PermissionError("read-only")), \
+                mock.patch("resumes.pdf_cache.open", create=True) as opened:
+            with self.assertRaises(PermissionError):
+                pdf_cache.open_pdf("resume")
+        opened.assert_not_called()
+
+    @override_settings(RESUME_PDF_CACHE_MAX_BYTES=25)
+    def test_eviction_deletes_least_recently_used_except_keep(self):
+        for age, name in enumerate(["newest", "middle", "oldest"]):
+            path = self.cache_dir / f"{name}.pdf"
+            path.write_bytes(b"x" * 10)
+            os.utime(path, (1000 - age, 1000 - age))
+
+        self.assertEqual(pdf_cache.evict(keep=self.cache_dir / "oldest.pdf"), 1)
+        self.assertEqual(sorted(path.name for path in self.cache_dir.glob("*.pdf")), ["newest.pdf", "oldest.pdf"])
+
+    @override_settings(RESUME_PDF_CACHE_MAX_BYTES=0)
+    def test_fresh_compile_is_kept_over_the_limit(self):
+        content, key, _ = self.read("resume")
+        self.assertEqual(content, b"%PDF resume")
+        self.assertEqual([path.name for path in self.cache_dir.glob("*.pdf")], [f"{key}.pdf"])
+
+    def test_download_honors_if_none_match(self):
+        job = make_job(description="Build Django APIs")
+        Resume.objects.create(job_application=job, data={"name": "Ada Lovelace"})
+        url = f"/api/resumes/{job.id}/resume/pdf/"
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        etag = response["ETag"]
+        response.close()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.compile_pdf.assert_called_once()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH='"stale"')
+        self.assertEqual(response.status_code, 200)
+        response.close()
+
+
+class CompilePoolTests(TestCase):
+    def setUp(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.threads = []
+
+        def compile_pdf(latex):
+            self.started.set()
+            self.release.wait(5)
+            if latex == "broken":
+                raise pdf_cache.CompileError("LaTeX compilation failed")
+            return b"%PDF " + latex.encode()
+
+        patcher = mock.patch("resumes.pdf_cache.compile_pdf", side_effect=compile_pdf)
+        self.compile_pdf = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.pool = pdf_cache.CompilePool(workers=1, queue_size=1)
+        self.addCleanup(self.pool._executor.shutdown)
+        self.addCleanup(self.finish)  # runs first: unblock compiles before the shutdown waits for them
+        self.results = {}
+
+    def finish(self):
+        self.release.set()
+        for thread in self.threads:
+            thread.join()
+
+    def start(self, key, latex=None):
+        """Compile on a client thread; the outcome lands in self.results[thread name]."""
+        def run():
+            try:
+                self.results[thread.name] = self.pool.compile(key, latex or key)
+            except Exception as e:
+                self.results[thread.name] = e
+        thread = threading.Thread(target=run)
+        thread.start()
+        self.threads.append(thread)
+        return thread
+
+    def wait_for(self, **counts):
+        for _ in range(500):
+            stats = self.pool.stats()
+            if all(stats[name] == value for name, value in counts.items()):
+                return
+            threading.Event().wait(0.01)
+        self.fail(f"pool never reached {counts}: {self.pool.stats()}")
+
+    def test_same_key_shares_one_compile(self):
+        first = self.start("resume")
+        self.started.wait(5)
+        second = self.start("resume")
+        self.wait_for(shared=1)
+        self.release.set()
+        first.join()
+        second.join()
+        self.assertEqual(self.results[first.name], b"%PDF resume")
+        self.assertEqual(self.results[second.name], b"%PDF resume")
+        self.compile_pdf.assert_called_once_with("resume")
+
+    def test_full_queue_is_rejected(self):
+        self.start("first")
+        self.started.wait(5)
+        self.start("second")
+        self.wait_for(running=1, queued=1)
+        with self.assertRaises(pdf_cache.Saturated) as raised:
+            self.pool.compile("third", "third")
+        # No compile finished yet: 2s assumed for each of the two ahead
+        self.assertEqual(raised.exception.retry_after, 4)
+        self.assertEqual(self.pool.stats()["rejected"], 1)
+        # A compile already in flight is still shared, not rejected
+        self.start("first")
+        self.wait_for(shared=1)
+
+    def test_stats_counters(self):
+        self.release.set()
+        self.assertEqual(self.pool.compile("a", "resume"), b"%PDF resume")
+        with self.assertRaises(pdf_cache.CompileError):
+            self.pool.compile("b", "broken")
+        stats = self.pool.stats()
+        self.assertEqual(
+            {name: stats[name] for name in ("compiled", "failed", "rejected", "shared", "queued", "running", "workers", "queue_size")},
+            {"compiled": 1, "failed": 1, "rejected": 0, "shared": 0, "queued": 0, "running": 0, "workers": 1, "queue_size": 1},
+        )
+        self.assertIsNotNone(stats["average_compile_seconds"])
+        self.assertIsNotNone(stats["average_wait_seconds"])
+        self.assertLessEqual(stats["max_compile_seconds"], stats["compile_seconds"])
+
+    def test_download_answers_503_when_saturated(self):
+        job = make_job(description="Build Django APIs")
+        Resume.objects.create(job_application=job, data={"name": "Ada Lovelace"})
+        self.start("first")
+        self.started.wait(5)
+        self.start("second")
+        self.wait_for(running=1, queued=1)
+        with tempfile.TemporaryDirectory() as cache_dir, override_settings(RESUME_PDF_CACHE_DIR=cache_dir), \
+                mock.patch.object(pdf_cache, "pool", self.pool):
+            response = self.client.get(f"/api/resumes/{job.id}/resume/pdf/")
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response["Retry-After"], "4")
+        self.assertEqual(self.pool.stats()["rejected"], 1)
@@ -2,8 +2,13 @@ from django.urls import path
 from . import views
 
 urlpatterns = [
+    path("llm-stats/", views.llm_stats, name="llm_stats"),
+    path("pdf-stats/", views.pdf_stats, name="pdf_stats"),
+    path("tasks/<int:task_id>/", views.resume_build_task, name="resume_build_task"),
+    path("batch/build/", views.batch_build_resumes, name="batch_build_resumes"),
     path("<str:app_id>/resume/", views.application_resume, name="application_resume"),
     path("<str:app_id>/resume/build/", views.build_application_resume, name="build_application_resume"),
+    path("<str:app_id>/resume/build/stream/", views.stream_application_resume, name="stream_application_resume"),
     path("<str:app_id>/resume/ats-scan/", views.resume_ats_scan, name="resume_ats_scan"),
     path("<str:app_id>/resume/latex/", views.resume_download_latex, name="resume_download_latex"),
     path("<str:app_id>/resume/pdf/", views.resume_download_pdf, name="resume_download_pdf"),
@@ -1,13 +1,21 @@
+from django.conf import settings
 from django.views.decorators.csrf import csrf_exempt
-from django.http import JsonResponse, HttpResponse
+from django.http import FileResponse, JsonResponse, HttpResponse, StreamingHttpResponse
 from resumes.resume_generator import ResumeGeneratorService
 from profiles.models import Profile, User
 from applications.models import Application
 from JobApplication.models import JobApplication
-from resumes.models import Resume
+from resumes.models import Resume, ResumeBuildTask
 from resumes.latex import render_resume_to_latex
+from resumes.streaming import ResumeStreamParser, sse_event
+from resumes import ats, batch, compaction, llm_cache, llm_client, pdf_cache, tasks
+from JobApplication.filters import parse_flag
+from config.http import not_modified
 import json
 import os
+import time
+
+import requests
 
 
 def get_default_user():
@@ -38,7 +46,7 @@ def parse_app_id(app_id):
 
 @csrf_exempt
 def build_application_resume(request, app_id):
-    """Build a tailored resume for a job"""
+    """Build a tailored resume for a job (?async=1 queues the build instead)"""
     print("\n" + "="*80)
     print("BUILD RESUME REQUEST RECEIVED")
     print("="*80)
@@ -46,6 +54,9 @@ def build_application_resume(request, app_id):
     
     if request.method != "POST":
         return JsonResponse({"error": "POST required"}, status=405)
+    
+    if parse_flag(request.GET, 'async'):
+        return queue_application_resume(request, app_id)
 
     try:
         # Parse the ID - this is actually a JOB ID
@@ -100,7 +111,8 @@ def build_application_resume(request, app_id):
         generator = ResumeGeneratorService()
         generated = generator.generate_resume(
             profile_data=profile_data,
-            job_description=job_description
+            job_description=job_description,
+            refresh=parse_flag(request.GET, 'refresh'),  # ?refresh=1 skips the response cache
         )
         print("--- AI SERVICE RETURNED ---\n")
 
@@ -173,6 +185,168 @@ def build_application_resume(request, app_id):
         }, status=500)
 
 
+@csrf_exempt
+def stream_application_resume(request, app_id):
+    """
+    Build a tailored resume, relaying the model's output as server-sent events
+    while it is written: `token` for every chunk of text, `section` for each
+    top-level field and `item` for each experience/education/project entry as
+    soon as it is complete, then `done` with the saved resume (or `error`).
+    """
+    if request.method != "POST":
+        return JsonResponse({"error": "POST required"}, status=405)
+    
+    print(f"\n[BUILD STREAM] Request for app_id: {app_id}")
+    try:
+        job = JobApplication.objects.get(id=parse_app_id(app_id))
+        profile = Profile.objects.get(user=get_default_user())
+        generator = ResumeGeneratorService()
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+    except JobApplication.DoesNotExist:
+        return JsonResponse({"error": f"Job {app_id} not found"}, status=404)
+    except Profile.DoesNotExist:
+        return JsonResponse({
+            "error": "Profile not found",
+            "details": "Please complete your profile setup before building resumes"
+        }, status=404)
+    except Exception as e:
+        return JsonResponse({"error": "Failed to build resume", "details": str(e)}, status=500)
+    
+    if not job.description:
+        return JsonResponse({"error": "Job has no description"}, status=400)
+    
+    from profiles.serializers import ProfileSerializer
+    profile_data = ProfileSerializer(profile).data
+    refresh = parse_flag(request.GET, 'refresh')
+    
+    def events():
+        parser = ResumeStreamParser()
+        started = time.perf_counter()
+        first_chunk = None
+        chunks = generator.stream_resume(profile_data, job.description, refresh=refresh)
+        try:
+            for chunk in chunks:
+                if first_chunk is None:
+                    first_chunk = time.perf_counter() - started
+                    print(f"[BUILD STREAM] First chunk after {first_chunk:.2f}s")
+                yield sse_event("token", {"text": chunk})
+                for event in parser.feed(chunk):
+                    if event[0] == "section":
+                        yield sse_event("section", {"key": event[1], "value": event[2]})
+                    else:
+                        yield sse_event("item", {"section": event[1], "index": event[2], "value": event[3]})
+            
+            resume_json = json.loads(llm_client.strip_code_fences(parser.text))
+            resume, _ = Resume.objects.update_or_create(job_application=job, defaults={'data': resume_json})
+            print(f"[BUILD STREAM] Saved resume {resume.id} after {time.perf_counter() - started:.2f}s")
+            yield sse_event("done", {"id": str(resume.id), "applicationId": str(job.id), **resume.data})
+        except Exception as e:
+            print(f"[BUILD STREAM ERROR] {e}")
+            yield sse_event("error", {"error": "Failed to build resume", "details": str(e)})
+        finally:
+            # Runs when the client disconnects too: frees the model slot right away
+            chunks.close()
+    
+    response = StreamingHttpResponse(events(), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # keep nginx from buffering the events
+    return response
+
+
+def queue_application_resume(request, app_id):
+    """Queue a resume build for `run_resume_workers` and answer 202 right away"""
+    try:
+        job = JobApplication.objects.get(id=parse_app_id(app_id))
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+    except JobApplication.DoesNotExist:
+        return JsonResponse({"error": f"Job {app_id} not found"}, status=404)
+    
+    task, created = tasks.submit(job, refresh=parse_flag(request.GET, 'refresh'))
+    print(f"[BUILD TASK] {'Queued' if created else 'Already queued'} task {task.id} for job {job.id}")
+    
+    response = JsonResponse(tasks.task_payload(task), status=202)
+    response["Location"] = f"/api/resumes/tasks/{task.id}/"
+    return response
+
+
+@csrf_exempt
+def batch_build_resumes(request):
+    """Build resumes for several jobs at once; body {"jobIds": [...]}, results reported per job"""
+    if request.method != "POST":
+        return JsonResponse({"error": "POST required"}, status=405)
+    
+    try:
+        body = json.loads(request.body or b"{}")
+        raw_ids = body.get("jobIds") if isinstance(body, dict) else None
+        if not isinstance(raw_ids, list) or not raw_ids:
+            raise ValueError("jobIds must be a non-empty list")
+        job_ids = [parse_app_id(str(raw_id)) for raw_id in raw_ids]
+    except (json.JSONDecodeError, ValueError) as e:
+        return JsonResponse({"error": str(e)}, status=400)
+    if len(set(job_ids)) > batch.MAX_JOBS:
+        return JsonResponse({"error": f"At most {batch.MAX_JOBS} jobs per batch"}, status=400)
+    
+    try:
+        profile = Profile.objects.get(user=get_default_user())
+        ResumeGeneratorService()  # fails fast without an API key
+    except ValueError as e:
+        return JsonResponse({"error": str(e)}, status=400)
+    except Profile.DoesNotExist:
+        return JsonResponse({
+            "error": "Profile not found",
+            "details": "Please complete your profile setup before building resumes"
+        }, status=404)
+    except Exception as e:
+        return JsonResponse({"error": "Failed to build resumes", "details": str(e)}, status=500)
+    
+    # Serialized once for the whole batch
+    from profiles.serializers import ProfileSerializer
+    profile_data = ProfileSerializer(profile).data
+    
+    started = time.perf_counter()
+    try:
+        results = batch.build_resumes(job_ids, profile_data, refresh=parse_flag(request.GET, 'refresh'))
+    except Exception as e:
+        print(f"[BATCH ERROR] {e}")
+        import traceback
+        traceback.print_exc()
+        return JsonResponse({"error": "Failed to build resumes", "details": str(e)}, status=500)
+    elapsed = time.perf_counter() - started
+    succeeded = sum(1 for result in results if result["status"] == "ok")
+    print(f"[BATCH] Built {succeeded}/{len(results)} resumes in {elapsed:.1f}s")
+    
+    return JsonResponse({
+        "results": results,
+        "succeeded": succeeded,
+        "failed": len(results) - succeeded,
+        "seconds": round(elapsed, 2),
+    })
+
+
+def llm_stats(request):
+    """Call counts, retries and timings of this process's shared model client, and prompt tokens saved"""
+    return JsonResponse({**llm_client.client.stats(), "prompts": compaction.stats()})
+
+
+def pdf_stats(request):
+    """Queue depth and compile times of this process's PDF compile pool"""
+    return JsonResponse(pdf_cache.pool.stats())
+
+
+def resume_build_task(request, task_id):
+    """Status of a queued resume build, with the resume once it succeeded"""
+    if request.method != "GET":
+        return JsonResponse({"error": "GET required"}, status=405)
+    
+    try:
+        task = ResumeBuildTask.objects.select_related('resume').get(id=task_id)
+    except ResumeBuildTask.DoesNotExist:
+        return JsonResponse({"error": f"Task {task_id} not found"}, status=404)
+    return JsonResponse(tasks.task_payload(task))
+
+
 @csrf_exempt
 def application_resume(request, app_id):
     """Get or update resume for a job"""
@@ -242,9 +416,72 @@ def application_resume(request, app_id):
         }, status=500)
 
 
+ATS_MODES = ("local", "llm", "hybrid")
+
+
+ATS_TEMPERATURE = 0.3
+
+
+def call_ats_model(prompt, max_tokens=2000, refresh=False):
+    """
+    Send an ATS prompt to OpenRouter and parse the JSON object it answers with.
+    Identical prompts are answered from the response cache unless `refresh`.
+    Returns (result, cached).
+    """
+    response, cached = llm_cache.get_or_call(
+        settings.MODEL_NAME, prompt, ATS_TEMPERATURE, max_tokens,
+        lambda: request_ats_model(prompt, max_tokens),
+        refresh=refresh,
+    )
+    if cached:
+        print("[ATS SCAN] Reusing the response to an identical earlier prompt")
+    return json.loads(response), cached
+
+
+def request_ats_model(prompt, max_tokens):
+    """The model's cleaned-up JSON answer to an ATS prompt, as text"""
+    ats_response = llm_client.client.complete(
+        prompt, max_tokens, ATS_TEMPERATURE, title="Job Application Organizer - ATS Scan"
+    )
+    print(f"[ATS SCAN] Response preview: {ats_response[:200]}...")
+    json.loads(ats_response)  # Only valid JSON gets cached
+    return ats_response
+
+
+def ats_feedback_prompt(resume_text, job_description, local_result):
+    """Prompt asking the model only for prose feedback on an already scored resume"""
+    return f"""You are an Applicant Tracking System (ATS) analyzer.
+
+A keyword scan already scored this resume {local_result['score']}/100 against the job description.
+Matched keywords: {', '.join(local_result['matched_keywords']) or 'none'}
+Missing keywords: {', '.join(local_result['missing_keywords']) or 'none'}
+
+Write short, specific feedback for the candidate. Do not rescore the resume.
+
+Return ONLY valid JSON with this exact structure (no markdown, no backticks):
+{{
+  "strengths": ["strength1", "strength2"],
+  "improvements": ["improvement1", "improvement2"]
+}}
+
+RESUME:
+{resume_text}
+
+JOB DESCRIPTION:
+{job_description}
+"""
+
+
 @csrf_exempt
 def resume_ats_scan(request, app_id):
-    """Perform ATS scan using OpenRouter API"""
+    """
+    ATS scan of a job's resume.
+    
+    ?mode=local scores keywords locally in milliseconds, ?mode=llm asks the
+    model for everything (the original scan), and ?mode=hybrid (default)
+    scores locally and only asks the model for strengths/improvements.
+    ?refresh=1 asks the model again instead of reusing a cached answer.
+    """
     # Handle CORS preflight
     if request.method == "OPTIONS":
         response = JsonResponse({})
@@ -256,7 +493,14 @@ def resume_ats_scan(request, app_id):
     if request.method != "POST":
         return JsonResponse({"error": "POST required"}, status=405)
     
-    print(f"\n[ATS SCAN] Starting scan for app_id: {app_id}")
+    mode = request.GET.get("mode", "hybrid")
+    if mode not in ATS_MODES:
+        return JsonResponse({
+            "error": f"mode must be one of: {', '.join(ATS_MODES)}"
+        }, status=400)
+    
+    refresh = parse_flag(request.GET, "refresh")
+    print(f"\n[ATS SCAN] Starting {mode} scan for app_id: {app_id}")
     
     try:
         # Parse the ID - this is a JOB ID
@@ -281,6 +525,30 @@ def resume_ats_scan(request, app_id):
         
         print(f"[ATS SCAN] Job description length: {len(job_description)}")
         print(f"[ATS SCAN] Resume text length: {len(resume_text)}")
+        
+        if mode != "llm":
+            # Deterministic keyword score, no API call
+            started = time.perf_counter()
+            ats_result = ats.score_resume(resume.data, job_description, job.tech_stack)
+            print(f"[ATS SCAN] Local score {ats_result['score']} in {(time.perf_counter() - started) * 1000:.1f}ms")
+            
+            if mode == "hybrid":
+                # The model only writes the prose; a failure keeps the local feedback
+                try:
+                    feedback, ats_result["cached"] = call_ats_model(
+                        ats_feedback_prompt(resume_text, job_description, ats_result),
+                        max_tokens=800,
+                        refresh=refresh,
+                    )
+                    for key in ("strengths", "improvements"):
+                        if isinstance(feedback.get(key), list):
+                            ats_result[key] = feedback[key]
+                except (requests.exceptions.RequestException, ValueError, AttributeError) as e:
+                    print(f"[ATS SCAN] Feedback request failed, keeping local feedback: {e}")
+            
+            ats_result.setdefault("cached", False)
+            ats_result["mode"] = mode
+            return JsonResponse(ats_result)
 
         prompt = f"""You are an Applicant Tracking System (ATS) analyzer.
 
@@ -305,61 +573,12 @@ JOB DESCRIPTION:
         print("[ATS SCAN] Calling OpenRouter API...")
         
         # Use OpenRouter API (same as resume generation)
-        from django.conf import settings
-        import requests
-        
-        headers = {
-            "Authorization": f"Bearer {settings.OPENROUTER_API_KEY}",
-            "Content-Type": "application/json",
-            "HTTP-Referer": "http://localhost:8000",
-            "X-Title": "Job Application Organizer - ATS Scan"
-        }
+        ats_result, cached = call_ats_model(prompt, refresh=refresh)
+        ats_result["cached"] = cached
+        print(f"[ATS SCAN] ATS Score: {ats_result.get('score')}")
         
-        payload = {
-            "model": settings.MODEL_NAME,
-            "messages": [
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ],
-            "max_tokens": 2000,
-            "temperature": 0.3,
-        }
-        
-        response = requests.post(
-            f"{settings.API_BASE_URL}/chat/completions",
-            headers=headers,
-            json=payload,
-            timeout=60
-        )
-        response.raise_for_status()
-        
-        data = response.json()
-        print(f"[ATS SCAN] OpenRouter response status: {response.status_code}")
-        
-        if "choices" in data and len(data["choices"]) > 0:
-            ats_response = data["choices"][0]["message"]["content"].strip()
-            
-            # Clean up response - remove markdown code blocks if present
-            if ats_response.startswith("```json"):
-                ats_response = ats_response[7:]
-            if ats_response.startswith("```"):
-                ats_response = ats_response[3:]
-            if ats_response.endswith("```"):
-                ats_response = ats_response[:-3]
-            
-            ats_response = ats_response.strip()
-            
-            print(f"[ATS SCAN] Response preview: {ats_response[:200]}...")
-            
-            # Parse JSON
-            ats_result = json.loads(ats_response)
-            print(f"[ATS SCAN] ATS Score: {ats_result.get('score')}")
-            
-            return JsonResponse(ats_result)
-        else:
-            raise ValueError("No response from API")
+        ats_result["mode"] = mode
+        return JsonResponse(ats_result)
     
     except ValueError as e:
         print(f"[ATS SCAN ERROR] ValueError: {e}")
@@ -436,10 +655,8 @@ def resume_download_latex(request, app_id):
 
 @csrf_exempt
 def resume_download_pdf(request, app_id):
-    """Compile LaTeX to PDF and download"""
+    """Compile LaTeX to PDF and download (compiled PDFs are cached by content, see pdf_cache.py)"""
     import subprocess
-    import tempfile
-    from pathlib import Path
     
     try:
         # Parse the ID - this is a JOB ID
@@ -457,41 +674,20 @@ def resume_download_pdf(request, app_id):
         # Generate LaTeX
         latex_content = render_resume_to_latex(resume.data)
         
-        # Create temporary directory for compilation
-        with tempfile.TemporaryDirectory() as tmpdir:
-            tex_file = Path(tmpdir) / "resume.tex"
-            pdf_file = Path(tmpdir) / "resume.pdf"
-            
-            # Write LaTeX file
-            tex_file.write_text(latex_content)
-            
-            # Compile with pdflatex (run twice for references)
-            for _ in range(2):
-                result = subprocess.run(
-                    ["pdflatex", "-interaction=nonstopmode", "resume.tex"],
-                    cwd=tmpdir,
-                    capture_output=True,
-                    timeout=30
-                )
-                
-                if result.returncode != 0:
-                    return JsonResponse({
-                        "error": "LaTeX compilation failed",
-                        "details": result.stderr.decode()
-                    }, status=500)
-            
-            # Read PDF and return
-            if pdf_file.exists():
-                with open(pdf_file, 'rb') as f:
-                    pdf_content = f.read()
-                
-                response = HttpResponse(pdf_content, content_type="application/pdf")
-                response["Content-Disposition"] = f'attachment; filename="resume_{app_id}.pdf"'
-                return response
-            else:
-                return JsonResponse({
-                    "error": "PDF file not generated"
-                }, status=500)
+        # The client's copy is current: no file read, no compile
+        etag = f'"{pdf_cache.cache_key(latex_content)}"'
+        response = not_modified(request, etag)
+        if response is not None:
+            return response
+        
+        # Cached PDF, or compile with pdflatex on a miss
+        started = time.perf_counter()
+        pdf, key, cached = pdf_cache.open_pdf(latex_content)
+        print(f"[PDF] Job {job_id}: {'cache hit' if cached else 'compiled'} in {time.perf_counter() - started:.2f}s")
+        
+        response = FileResponse(pdf, as_attachment=True, filename=f"resume_{app_id}.pdf", content_type="application/pdf")
+        response["ETag"] = etag
+        return response
     
     except ValueError as e:
         return JsonResponse({
@@ -505,6 +701,17 @@ def resume_download_pdf(request, app_id):
         return JsonResponse({
             "error": "Resume not found"
         }, status=404)
+    except pdf_cache.Saturated as e:
+        response = JsonResponse({
+            "error": "PDF compiler busy, try again shortly"
+        }, status=503)
+        response["Retry-After"] = str(e.retry_after)
+        return response
+    except pdf_cache.CompileError as e:
+        return JsonResponse({
+            "error": str(e),
+            "details": e.details
+        }, status=500)
     except subprocess.TimeoutExpired:
         return JsonResponse({
             "error": "LaTeX compilation timed out"
@@ -513,4 +720,4 @@ def resume_download_pdf(request, app_id):
         return JsonResponse({
             "error": "Failed to generate PDF",
             "details": str(e)
-        }, status=500)
\ No newline at end of file
+        }, status=500)
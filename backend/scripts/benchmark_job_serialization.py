@@ -0,0 +1,130 @@
+"""
+Micro-benchmark for job payload serialization.
+
+Creates a throwaway test database with N jobs (default 100,000) and times the
+old paths (hand loop over model instances, nested ModelSerializer with three
+SerializerMethodFields) against the shared values()-based serializer.
+
+    python scripts/benchmark_job_serialization.py [N]
+"""
+import os
+import sys
+import time
+
+import django
+
+# Ensure the backend package is on sys.path so 'config' can be imported
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if BASE_DIR not in sys.path:
+    sys.path.insert(0, BASE_DIR)
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+django.setup()
+
+from django.test.utils import get_runner
+from django.conf import settings
+from rest_framework import serializers
+
+from JobApplication.models import JobApplication
+from JobApplication.serializers import serialize_jobs
+
+N = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+
+class LegacyJobSerializer(serializers.ModelSerializer):
+    """The previous JobApplicationSerializer, kept here for comparison"""
+    salary = serializers.SerializerMethodField()
+    tags = serializers.SerializerMethodField()
+    postedDate = serializers.SerializerMethodField()
+
+    class Meta:
+        model = JobApplication
+        fields = ["id", "company", "title", "location", "description", "date", "tech_stack",
+                  "salary_min", "salary_max", "salary", "tags", "postedDate"]
+
+    def get_salary(self, obj):
+        if obj.salary_min and obj.salary_max:
+            return f"${obj.salary_min:,} - ${obj.salary_max:,}"
+        elif obj.salary_min:
+            return f"${obj.salary_min:,}+"
+        elif obj.salary_max:
+            return f"Up to ${obj.salary_max:,}"
+        return None
+
+    def get_tags(self, obj):
+        return obj.tech_stack if obj.tech_stack else []
+
+    def get_postedDate(self, obj):
+        return obj.date.strftime('%Y-%m-%d') if obj.date else None
+
+
+def legacy_loop(queryset):
+    """The previous hand-written loop from JobApplicationAPIView.get"""
+    jobs_data = []
+    for job in queryset:
+        salary = ''
+        if job.salary_min and job.salary_max:
+            salary = f"${job.salary_min:,} - ${job.salary_max:,}"
+        elif job.salary_min:
+            salary = f"${job.salary_min:,}+"
+        elif job.salary_max:
+            salary = f"Up to ${job.salary_max:,}"
+        jobs_data.append({
+            'id': str(job.id),
+            'title': job.title,
+            'company': job.company,
+            'location': job.location or '',
+            'description': job.description or '',
+            'tags': job.tech_stack if job.tech_stack else [],
+            'salary': salary,
+            'postedDate': job.date.strftime('%Y-%m-%d') if job.date else '',
+        })
+    return jobs_data
+
+
+def seed(n):
+    import datetime
+    jobs = [
+        JobApplication(
+            company=f"Company {i % 5000}",
+            title=f"Software Engineer {i % 50}",
+            description="Build and operate Python / Django services. " * 5,
+            location="Edmonton, AB",
+            date=datetime.date(2026, 1, 1) + datetime.timedelta(days=i % 365),
+            tech_stack=["Python", "Django", "PostgreSQL"],
+            salary_min=60_000 + (i % 20) * 5_000,
+            salary_max=90_000 + (i % 20) * 5_000,
+            fingerprint=str(i),
+        )
+        for i in range(n)
+    ]
+    JobApplication.objects.bulk_create(jobs, batch_size=5000)
+
+
+def bench(label, fn):
+    started = time.perf_counter()
+    rows = fn()
+    elapsed = time.perf_counter() - started
+    print(f"{label:<40} {elapsed:7.2f}s  {len(rows) / elapsed:>10,.0f} jobs/s")
+    return elapsed
+
+
+def main():
+    runner = get_runner(settings)(verbosity=0)
+    old_config = runner.setup_databases()
+    try:
+        print(f"Seeding {N:,} jobs...")
+        seed(N)
+        queryset = JobApplication.objects.order_by("id")
+
+        print()
+        legacy = bench("hand loop over model instances", lambda: legacy_loop(queryset.all()))
+        bench("ModelSerializer(many=True)", lambda: LegacyJobSerializer(queryset.all(), many=True).data)
+        fast = bench("values() serialize_jobs", lambda: serialize_jobs(queryset.all()))
+        print(f"\nserialize_jobs speedup over the hand loop: {legacy / fast:.1f}x")
+    finally:
+        runner.teardown_databases(old_config)
+
+
+if __name__ == '__main__':
+    main()
@@ -5,7 +5,7 @@ function getAuthToken(): string | null {
 }
 
 type ApiFetchOptions = RequestInit & {
-  responseType?: 'json' | 'text' | 'blob';
+  responseType?: 'json' | 'text' | 'blob' | 'response'; // 'response': unread, e.g. to stream the body
 };
 
 export async function apiFetch<T>(
@@ -74,6 +74,7 @@ export async function apiFetch<T>(
   }
 
   const rt = options.responseType ?? 'json';
+  if (rt === 'response') return response as T;
   if (rt === 'blob') return (await response.blob()) as T;
   if (rt === 'text') return (await response.text()) as T;
   return (await response.json()) as T;
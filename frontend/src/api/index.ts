@@ -10,10 +10,15 @@ import {
 } from './mockData';
 import type {
   Job,
+  JobSuggestion,
+  RecommendedJob,
+  SimilarJob,
   Application,
   Profile,
   Communication,
   Resume,
+  ResumeBuildTask,
+  ResumeBatch,
   ATSResult,
   ApplicationStatus,
   ApplicationResponse,
@@ -121,8 +126,10 @@ export const profile = {
 export const jobs = {
   search: async (query: string): Promise<Job[]> => {
     try {
-      const response = await apiFetch(`/jobs/?q=${encodeURIComponent(query)}`);
-      return Array.isArray(response) ? response : [];
+      const response = await apiFetch<{ results: Job[]; next_cursor: string | null }>(
+        `/jobs/?q=${encodeURIComponent(query)}`
+      );
+      return Array.isArray(response?.results) ? response.results : [];
     } catch (error) {
       console.error('Failed to fetch jobs from backend:', error);
       const lowerQuery = query.toLowerCase();
@@ -146,6 +153,40 @@ export const jobs = {
       return job;
     }
   },
+
+  recommendations: async (limit = 20): Promise<RecommendedJob[]> => {
+    try {
+      const response = await apiFetch<{ results: RecommendedJob[] }>(
+        `/jobs/recommendations/?limit=${limit}`
+      );
+      return Array.isArray(response?.results) ? response.results : [];
+    } catch (error) {
+      console.error('Failed to fetch job recommendations from backend:', error);
+      return [];
+    }
+  },
+
+  similar: async (id: string, limit = 10): Promise<SimilarJob[]> => {
+    try {
+      const response = await apiFetch<{ results: SimilarJob[] }>(`/jobs/${id}/similar/?limit=${limit}`);
+      return Array.isArray(response?.results) ? response.results : [];
+    } catch (error) {
+      console.error('Failed to fetch similar jobs from backend:', error);
+      return [];
+    }
+  },
+
+  suggest: async (prefix: string): Promise<JobSuggestion[]> => {
+    try {
+      const response = await apiFetch<{ suggestions: JobSuggestion[] }>(
+        `/jobs/suggest/?prefix=${encodeURIComponent(prefix)}`
+      );
+      return Array.isArray(response?.suggestions) ? response.suggestions : [];
+    } catch (error) {
+      console.error('Failed to fetch job suggestions from backend:', error);
+      return [];
+    }
+  },
 };
 
 // Applications API
@@ -208,6 +249,19 @@ export const applications = {
   },
 };
 
+export type ResumeStreamEvent =
+  | { event: 'token'; data: { text: string } }
+  | { event: 'section'; data: { key: string; value: unknown } }
+  | { event: 'item'; data: { section: string; index: number; value: unknown } }
+  | { event: 'done'; data: Resume }
+  | { event: 'error'; data: { error: string; details?: string } };
+
+// Queued builds need `manage.py run_resume_workers`; opt in with VITE_QUEUE_RESUME_BUILDS=true
+const QUEUE_RESUME_BUILDS = import.meta.env.VITE_QUEUE_RESUME_BUILDS === 'true';
+const BUILD_POLL_INTERVAL_MS = 2000;
+const BUILD_TIMEOUT_MS = 5 * 60 * 1000;
+const WORKER_PICKUP_TIMEOUT_MS = 30 * 1000;
+
 // Resume API
 export const resume = {
   get: async (applicationId: string): Promise<Resume> => {
@@ -219,17 +273,88 @@ export const resume = {
     }
   },
 
-  build: async (applicationId: string): Promise<Resume> => {
+  // Builds in the request by default; `queued` hands the build to a resume worker and polls the task
+  build: async (
+    applicationId: string,
+    { queued = QUEUE_RESUME_BUILDS }: { queued?: boolean } = {}
+  ): Promise<Resume> => {
     try {
-      return await apiFetch(`/resumes/${applicationId}/resume/build/`, {
+      if (!queued) {
+        return await apiFetch<Resume>(`/resumes/${applicationId}/resume/build/`, {
+          method: 'POST',
+        });
+      }
+      let task = await apiFetch<ResumeBuildTask>(`/resumes/${applicationId}/resume/build/?async=1`, {
         method: 'POST',
       });
+      const queuedAt = Date.now();
+      const deadline = queuedAt + BUILD_TIMEOUT_MS;
+      while (task.status === 'queued' || task.status === 'running') {
+        if (Date.now() > deadline) throw new Error('Resume build timed out');
+        if (task.status === 'queued' && task.attempts === 0 && Date.now() - queuedAt > WORKER_PICKUP_TIMEOUT_MS) {
+          throw new Error(
+            'No resume worker picked up the build. Start one with `python manage.py run_resume_workers`.'
+          );
+        }
+        await new Promise((resolve) => setTimeout(resolve, BUILD_POLL_INTERVAL_MS));
+        task = await apiFetch<ResumeBuildTask>(`/resumes/tasks/${task.id}/`);
+      }
+      if (task.status === 'failed' || !task.resume) {
+        throw new Error(task.error || 'Resume build failed');
+      }
+      return task.resume;
     } catch (error) {
       console.error('Failed to build resume:', error);
       throw error;
     }
   },
 
+  // Builds resumes for several jobs concurrently; each job succeeds or fails on its own
+  buildBatch: async (jobIds: string[]): Promise<ResumeBatch> => {
+    try {
+      return await apiFetch('/resumes/batch/build/', {
+        method: 'POST',
+        body: JSON.stringify({ jobIds }),
+      });
+    } catch (error) {
+      console.error('Failed to build resumes:', error);
+      throw error;
+    }
+  },
+
+  // Builds synchronously but reports sections as the model writes them (server-sent events)
+  buildStream: async (
+    applicationId: string,
+    onEvent: (event: ResumeStreamEvent) => void
+  ): Promise<Resume> => {
+    const response = await apiFetch<Response>(`/resumes/${applicationId}/resume/build/stream/`, {
+      method: 'POST',
+      responseType: 'response',
+    });
+    const reader = response.body!.pipeThrough(new TextDecoderStream()).getReader();
+    let buffer = '';
+    let built: Resume | null = null;
+    for (;;) {
+      const { value, done } = await reader.read();
+      if (done) break;
+      buffer += value;
+      let end;
+      while ((end = buffer.indexOf('\n\n')) >= 0) {
+        const block = buffer.slice(0, end);
+        buffer = buffer.slice(end + 2);
+        const name = block.match(/^event: (.*)$/m)?.[1];
+        const data = block.match(/^data: (.*)$/m)?.[1];
+        if (!name || data === undefined) continue;
+        const event = { event: name, data: JSON.parse(data) } as ResumeStreamEvent;
+        onEvent(event);
+        if (event.event === 'done') built = event.data;
+        if (event.event === 'error') throw new Error(event.data.details || event.data.error);
+      }
+    }
+    if (!built) throw new Error('Resume stream ended early');
+    return built;
+  },
+
   update: async (applicationId: string, data: Partial<Resume>): Promise<Resume> => {
     try {
       return await apiFetch(`/resumes/${applicationId}/resume/`, {
@@ -242,9 +367,12 @@ export const resume = {
     }
   },
 
-  atsScan: async (applicationId: string): Promise<ATSResult> => {
+  atsScan: async (
+    applicationId: string,
+    mode: 'local' | 'llm' | 'hybrid' = 'hybrid'
+  ): Promise<ATSResult> => {
     try {
-      return await apiFetch(`/resumes/${applicationId}/resume/ats-scan/`, {
+      return await apiFetch(`/resumes/${applicationId}/resume/ats-scan/?mode=${mode}`, {
         method: 'POST',
       });
     } catch (error) {
@@ -11,7 +11,7 @@ export function FYPPage() {
 
   const { data: recommendations = [] } = useQuery({
     queryKey: ['jobs', 'recommendations'],
-    queryFn: () => jobs.search('React'),
+    queryFn: () => jobs.recommendations(6),
   });
 
   const handleSearch = () => {
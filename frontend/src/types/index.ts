@@ -16,6 +16,21 @@ export interface Job {
   postedDate?: string; // Changed from date
 }
 
+export interface RecommendedJob extends Job {
+  score: number; // 0-1 match between the job's tags and the user's skills
+  matchedSkills: string[];
+}
+
+export interface SimilarJob extends Job {
+  similarity: number; // 0-1 estimated overlap between the two descriptions
+}
+
+export interface JobSuggestion {
+  value: string;
+  type: 'title' | 'company' | 'location';
+  count: number; // number of postings using this value
+}
+
 export interface Application {
   id: string;
   job_id: string; // Changed from jobId (matches Django naming)
@@ -117,6 +132,33 @@ summary?: string;
   lastUpdated: string;
 }
 
+export interface ResumeBuildTask {
+  id: string;
+  applicationId: string;
+  status: 'queued' | 'running' | 'succeeded' | 'failed';
+  attempts: number;
+  error: string;
+  createdAt: string;
+  startedAt: string | null;
+  finishedAt: string | null;
+  resume?: Resume; // once succeeded
+}
+
+export interface ResumeBatchResult {
+  jobId: string;
+  status: 'ok' | 'error';
+  seconds?: number;
+  resume?: Resume; // when ok
+  error?: string; // when error
+}
+
+export interface ResumeBatch {
+  results: ResumeBatchResult[];
+  succeeded: number;
+  failed: number;
+  seconds: number;
+}
+
 export interface ATSResult {
   score: number;
   missingKeywords: string[];